@@ -1,6 +1,7 @@
 from crewai import Agent, Task
 from typing import Dict, Any, Optional
 from prompts.prompt import MANAGER_AGENT
+from schemas.mesh_data import MeshData
 from config import DEFAULT_LLM
 
 class ManagerAgent:
@@ -19,7 +20,7 @@ class ManagerAgent:
             max_rpm=10
         )
     
-    def determine_workflow(self, question: str, mesh_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def determine_workflow(self, question: str, mesh_data: Optional[MeshData] = None) -> Dict[str, Any]:
         """
         Determine which workflow to use based on input
         """
@@ -1,8 +1,9 @@
 from crewai import Agent, Task
 from typing import Dict, Any
-import numpy as np
 from prompts.prompt import METRICS_AGENT, METRICS_TASK_TEMPLATE
 from config import METRICS_LLM
+from schemas.mesh_data import MeshData
+from services.statistics_service import StatisticsService
 from services.vtk_service import VTKService
 
 class MetricsAgent:
@@ -21,7 +22,7 @@ class MetricsAgent:
             max_rpm=10  # Rate limiting for API stability
         )
     
-    def analyze_vtk_metrics(self, mesh_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_vtk_metrics(self, mesh_data: MeshData) -> Dict[str, Any]:
         """
         Extract key metrics from VTK data with enhanced temperature analysis
         """
@@ -30,9 +31,9 @@ class MetricsAgent:
         
         # Basic mesh statistics
         metrics["mesh_stats"] = {
-            "num_points": mesh_data["num_points"],
-            "num_cells": mesh_data["num_cells"],
-            "dimension": len(mesh_data["coordinates"][0]) if mesh_data["coordinates"] else 0
+            "num_points": mesh_data.num_points,
+            "num_cells": mesh_data.num_cells,
+            "dimension": mesh_data.coordinates.shape[1] if mesh_data.num_points else 0
         }
         
         # Enhanced temperature analysis
@@ -41,19 +42,20 @@ class MetricsAgent:
             metrics["temperature_analysis"] = temp_metrics
         except ValueError as e:
             # If temperature analysis fails, fall back to basic point data analysis
-            if "point_data" in mesh_data:
-                for field_name, field_data in mesh_data["point_data"].items():
-                    data = np.array(field_data) if isinstance(field_data, list) else field_data
-                    metrics[field_name] = {
-                        "min": float(np.min(data)),
-                        "max": float(np.max(data)),
-                        "mean": float(np.mean(data)),
-                        "std": float(np.std(data))
-                    }
+            statistics = StatisticsService()
+            for field_name, data in mesh_data.point_data.items():
+                summary = statistics.summarize(data)
+                metrics[field_name] = {
+                    "min": summary["min"],
+                    "max": summary["max"],
+                    "mean": summary["mean"],
+                    "std": summary["std_dev"],
+                    "quantiles": summary["quantiles"]
+                }
         
         return metrics
     
-    def create_metrics_task(self, mesh_data: Dict[str, Any], question: str) -> Task:
+    def create_metrics_task(self, mesh_data: MeshData, question: str) -> Task:
         """
         Create task for analyzing VTK metrics with enhanced temperature focus
         """
@@ -90,13 +92,13 @@ class MetricsAgent:
                 metrics_summary.append("\n  Gradient Information:")
                 metrics_summary.append(f"    - Maximum Gradient: {temp_analysis['gradient_info']['max_gradient']}")
         
-        dimensions_str = "x".join(map(str, mesh_data["dimensions"])) if mesh_data.get("dimensions") else "N/A"
+        dimensions_str = "x".join(map(str, mesh_data.dimensions)) if mesh_data.dimensions else "N/A"
         
         return Task(
             description=(
                 f"Analyze the temperature distribution in this mesh:\n"
                 f"Mesh dimensions: {dimensions_str}\n"
-                f"Points: {mesh_data['num_points']}, Cells: {mesh_data['num_cells']}\n"
+                f"Points: {mesh_data.num_points}, Cells: {mesh_data.num_cells}\n"
                 f"Question: {question}\n"
                 f"Available metrics:\n" + "\n".join(metrics_summary)
             ),
@@ -2,6 +2,7 @@ from crewai import Agent, Task
 from typing import Dict, Any, Optional
 from tools.planning_tool import PlanningTool
 from prompts.prompt import PLANNER_AGENT
+from schemas.mesh_data import MeshData
 from config import DEFAULT_LLM
 
 class PlannerAgent:
@@ -23,14 +24,14 @@ class PlannerAgent:
             max_rpm=10
         )
     
-    def create_planning_task(self, mesh_data: Dict[str, Any], question: Optional[str] = None) -> Task:
+    def create_planning_task(self, mesh_data: MeshData, question: Optional[str] = None) -> Task:
         """
         Create planning task for VTK-based problems
         """
         description = f"""Analyze the provided mesh data and develop a solution strategy.
         Mesh information:
-        - Number of points: {mesh_data['num_points']}
-        - Number of cells: {mesh_data['num_cells']}
+        - Number of points: {mesh_data.num_points}
+        - Number of cells: {mesh_data.num_cells}
         """
         
         if question:
@@ -20,7 +20,10 @@ class SolverAgent:
             backstory=SOLVER_AGENT["backstory"],
             tools=[
                 self.fenics_tool.get_tool(),
-                self.numerical_tool.get_tool()
+                self.numerical_tool.get_tool(),
+                self.numerical_tool.get_3d_tool(),
+                self.numerical_tool.get_transient_tool(),
+                self.numerical_tool.get_sweep_tool()
             ],
             llm=DEFAULT_LLM,
             verbose=True,
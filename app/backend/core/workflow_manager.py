@@ -7,6 +7,7 @@ from app.backend.agents.summarizer_agent import SummarizerAgent
 from app.backend.agents.manager_agent import ManagerAgent
 from app.backend.agents.planner_agent import PlannerAgent
 from app.backend.agents.solver_agent import SolverAgent
+from app.backend.schemas.mesh_data import MeshData
 from app.backend.prompts.prompt import (
     PLANNER_TASK_TEMPLATE,
     SOLVER_TASK_TEMPLATE
@@ -21,7 +22,7 @@ class WorkflowManager:
         self.planner_agent = PlannerAgent()
         self.solver_agent = SolverAgent()
     
-    def execute_vtk_workflow(self, mesh_data: Dict[str, Any], question: str) -> str:
+    def execute_vtk_workflow(self, mesh_data: MeshData, question: str) -> str:
         """
         Execute workflow for VTK file with question
         """
@@ -29,7 +30,7 @@ class WorkflowManager:
         metrics_task = Task(
             description=(
                 f"Analyze the temperature distribution in this mesh:\n"
-                f"Points: {mesh_data['num_points']}, Cells: {mesh_data['num_cells']}\n"
+                f"Points: {mesh_data.num_points}, Cells: {mesh_data.num_cells}\n"
                 f"Question: {question}\n"
                 "Provide detailed analysis of temperature patterns and gradients."
             ),
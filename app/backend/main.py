@@ -2,6 +2,9 @@ from fastapi import FastAPI, UploadFile, File, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 import uvicorn
 
 from core.workflow_manager import WorkflowManager
@@ -9,8 +12,33 @@ from schemas.request_models import TextualQuestion
 from services.vtk_service import VTKService
 from utils.file_handler import FileHandler
 from agents.manager_agent import ManagerAgent
+from tools.fenics_tool import FenicsTool, WARM_UP_REPORT
 
-app = FastAPI(title="Heat Equation Solver API")
+logger = logging.getLogger(__name__)
+
+async def warm_up_solvers():
+    """
+    Compile the FEniCS heat forms before the first request arrives
+    """
+    try:
+        report = await asyncio.get_running_loop().run_in_executor(None, FenicsTool().warm_up)
+        if "skipped" in report:
+            logger.info("FEniCS JIT warm-up skipped: %s", report["skipped"])
+        else:
+            logger.info("FEniCS JIT warm-up finished in %.2fs (cache: %s)", report["seconds"], report["cache_dir"])
+    except Exception:
+        # The server still starts; forms then compile on first use
+        logger.exception("FEniCS JIT warm-up failed")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up the solvers when the server starts
+    """
+    await warm_up_solvers()
+    yield
+
+app = FastAPI(title="Heat Equation Solver API", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -21,6 +49,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.get("/status/warm-up")
+async def warm_up_status():
+    """
+    Report how long this worker's FEniCS JIT warm-up took
+    """
+    return {"completed": bool(WARM_UP_REPORT), **WARM_UP_REPORT}
+
 @app.post("/solve")
 async def solve_heat_equation(
     question: str = Form(...),
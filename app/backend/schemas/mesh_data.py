@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# VTK cell type codes of a structured grid's cells by the number of axes with more than one point
+STRUCTURED_CELL_TYPES = {0: 1, 1: 3, 2: 9, 3: 12}  # vertex, line, quad, hexahedron
+
+class MeshData:
+    """
+    Parsed mesh held in contiguous NumPy arrays: (N, 3) coordinates, CSR-style cells (offsets
+    with num_cells + 1 entries into a flat connectivity array), VTK cell type codes and named
+    point fields of shape (N,) or (N, components). Python lists are built only by to_dict,
+    for JSON responses and tool inputs. statistics optionally maps field names to summaries
+    gathered while the file was parsed (RunningStatistics from a streaming read), so the
+    metrics need not read those fields again.
+    """
+    __slots__ = ("coordinates", "offsets", "connectivity", "cell_types", "point_data",
+                 "dimensions", "is_structured", "statistics")
+
+    def __init__(self, coordinates: np.ndarray, offsets: np.ndarray, connectivity: np.ndarray,
+                 cell_types: np.ndarray, point_data: Optional[Dict[str, np.ndarray]] = None,
+                 dimensions: Optional[List[int]] = None, is_structured: bool = False,
+                 statistics: Optional[Dict[str, Any]] = None):
+        self.coordinates = np.asarray(coordinates)
+        self.offsets = np.asarray(offsets)
+        self.connectivity = np.asarray(connectivity)
+        self.cell_types = np.asarray(cell_types)
+        self.point_data = {name: np.asarray(values) for name, values in (point_data or {}).items()}
+        self.dimensions = list(dimensions) if dimensions is not None else None
+        self.is_structured = is_structured
+        self.statistics = dict(statistics or {})
+
+    @property
+    def num_points(self) -> int:
+        return len(self.coordinates)
+
+    @property
+    def num_cells(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the arrays
+        """
+        arrays = [self.coordinates, self.offsets, self.connectivity, self.cell_types, *self.point_data.values()]
+        return sum(array.nbytes for array in arrays)
+
+    def cell(self, index: int) -> np.ndarray:
+        """
+        Point ids of one cell
+        """
+        return self.connectivity[self.offsets[index]:self.offsets[index + 1]]
+
+    def cell_lists(self) -> List[List[int]]:
+        """
+        Point ids per cell as nested lists
+        """
+        sizes = np.diff(self.offsets)
+        if len(sizes) and np.all(sizes == sizes[0]):
+            return self.connectivity[self.offsets[0]:self.offsets[-1]].reshape(len(sizes), -1).tolist()
+        return [cell.tolist() for cell in np.split(self.connectivity, self.offsets[1:-1])]
+
+    @staticmethod
+    def structured_cells(dimensions: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cells of an (nx, ny, nz) structured grid in VTK vertex order: hexahedra in 3D, quads
+        when one axis is flat, lines or a single vertex below that
+        """
+        dims = np.asarray(dimensions)
+        axes = np.flatnonzero(dims > 1)
+        strides = np.array([1, dims[0], dims[0] * dims[1]])[axes]
+
+        # First vertex of every cell, with i running fastest like the point order
+        ranges = [np.arange(dims[axis] - 1) * stride for axis, stride in zip(axes, strides)]
+        base = np.ravel(sum(np.meshgrid(*ranges, indexing="ij")), order="F")
+
+        # Corner offsets of the unit cell, counter-clockwise in each layer as VTK expects
+        corners = {0: [()], 1: [(0,), (1,)], 2: [(0, 0), (1, 0), (1, 1), (0, 1)],
+                   3: [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]}[len(axes)]
+        shifts = np.array([np.dot(corner, strides) for corner in corners], dtype=int)
+        connectivity = (base[:, None] + shifts).ravel()
+
+        offsets = np.arange(len(base) + 1) * len(shifts)
+        cell_types = np.full(len(base), STRUCTURED_CELL_TYPES[len(axes)], dtype=np.uint8)
+        return offsets, connectivity, cell_types
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-ready mesh dictionary (coordinates, per-cell connectivity lists, cell types,
+        point data, counts and structured-grid dimensions)
+        """
+        return {
+            "coordinates": self.coordinates.tolist(),
+            "connectivity": self.cell_lists(),
+            "cell_types": self.cell_types.tolist(),
+            "point_data": {name: values.tolist() for name, values in self.point_data.items()},
+            "num_points": self.num_points,
+            "num_cells": self.num_cells,
+            "dimensions": self.dimensions,
+            "is_structured": self.is_structured
+        }
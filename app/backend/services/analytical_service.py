@@ -0,0 +1,282 @@
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from services.finite_difference_service import BOUNDARY_FACES, FiniteDifferenceService
+
+BOUNDARY_TYPES = ("dirichlet", "neumann")
+
+# Mode cap per axis; face terms hold n**(d-1) modes per grid line of the face normal
+MAX_TERMS = {1: 4096, 2: 4096, 3: 128}
+
+class AnalyticalService:
+    """
+    Closed-form Fourier-series solutions of the heat equation on [0, Lx] x [0, Ly] x [0, Lz]
+    boxes (1 to 3 dimensions) with fixed-temperature (Dirichlet) or insulated (Neumann) faces,
+    a uniform source and a uniform initial temperature. Series are separable, so they are
+    evaluated as one einsum over per-axis mode tables on the whole grid, and the number of
+    terms doubles until the result stops changing within the tolerance.
+    Arrays follow the finite-difference layout: (ny, nx) in 2D and (nz, ny, nx) in 3D.
+    """
+
+    def __init__(self):
+        self.fd_service = FiniteDifferenceService()
+
+    def steady(self, coordinates: Sequence[np.ndarray], lengths: Optional[Sequence[float]] = None,
+               source: float = 1.0, boundary_values: Optional[Dict[str, float]] = None,
+               boundary_types: Optional[Dict[str, str]] = None, tolerance: float = 1e-6,
+               max_terms: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve -laplacian(T) = source with the given face temperatures on Dirichlet faces and
+        zero heat flux on Neumann faces. coordinates holds the x (, y, z) grid lines.
+        """
+        axes, lengths, values, types = self._setup(coordinates, lengths, boundary_values, boundary_types)
+        if all(t == "neumann" for pair in types for t in pair):
+            raise ValueError("A fully insulated box has no unique steady state; fix at least one face temperature")
+
+        def evaluate(n: int) -> np.ndarray:
+            modes = [self._axis_modes(L, pair, n) for L, pair in zip(lengths, types)]
+            u = np.zeros([len(x) for x in reversed(axes)])
+            if source != 0:
+                u += source * self._source_term(axes, lengths, types, modes)
+            for axis, pair in enumerate(types):
+                for side in (0, 1):
+                    g = values[axis][side]
+                    if pair[side] == "dirichlet" and g != 0:
+                        u += g * self._face_term(axis, side, axes, lengths, types, modes)
+            return u
+
+        u, info = self._truncate(evaluate, self._interior_mask(axes, lengths, types), tolerance,
+                                 max_terms or MAX_TERMS[len(axes)])
+        return self._apply_faces(u, axes, lengths, values, types), info
+
+    def transient(self, coordinates: Sequence[np.ndarray], times: Sequence[float],
+                  lengths: Optional[Sequence[float]] = None, alpha: float = 1.0,
+                  initial_temperature: float = 0.0, source: float = 0.0,
+                  boundary_values: Optional[Dict[str, float]] = None,
+                  boundary_types: Optional[Dict[str, str]] = None, tolerance: float = 1e-6,
+                  max_terms: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve dT/dt = alpha * (laplacian(T) + source) from a uniform initial temperature,
+        returning one grid per entry of times (leading axis). Every Dirichlet face must hold
+        the same temperature, so the solution is a pure decaying sine/cosine series.
+        """
+        axes, lengths, values, types = self._setup(coordinates, lengths, boundary_values, boundary_types)
+        fixed_values = {values[a][s] for a, pair in enumerate(types) for s in (0, 1) if pair[s] == "dirichlet"}
+        if len(fixed_values) > 1:
+            raise ValueError("Transient analytical solutions need the same temperature on every Dirichlet face")
+        g = min(fixed_values, default=0.0)
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+
+        shape = (len(times),) + tuple(len(x) for x in reversed(axes))
+        if not fixed_values:
+            # Fully insulated: the uniform state just heats up at the source rate
+            u = np.broadcast_to(initial_temperature + alpha * source * times.reshape((-1,) + (1,) * len(axes)), shape)
+            return u.copy(), {"solver": "analytical", "terms": 1, "truncation_error": 0.0, "converged": True}
+
+        def evaluate(n: int) -> np.ndarray:
+            # Steady state plus the decaying modes of the initial offset from it
+            modes = [self._axis_modes(L, pair, n) for L, pair in zip(lengths, types)]
+            lam, coeff = self._mode_tensors(modes)
+            steady = g + source * self._source_term(axes, lengths, types, modes)
+            weights = coeff * ((initial_temperature - g) - source / lam)
+            decaying = weights * np.exp(-alpha * np.multiply.outer(times, lam))
+            return steady + self._expand(decaying, modes, axes, batch=True)
+
+        # The initial state is a step at the boundary, so t = 0 is filled in exactly and left out of the check
+        mask = self._interior_mask(axes, lengths, types) & (times > 0).reshape((-1,) + (1,) * len(axes))
+        u, info = self._truncate(evaluate, mask, tolerance, max_terms or MAX_TERMS[len(axes)])
+        u[times == 0] = initial_temperature
+        return np.stack([self._apply_faces(frame, axes, lengths, values, types) for frame in u]), info
+
+    def _setup(self, coordinates: Sequence[np.ndarray], lengths: Optional[Sequence[float]],
+               boundary_values: Optional[Dict[str, float]],
+               boundary_types: Optional[Dict[str, str]]) -> Tuple[List[np.ndarray], List[float], List, List]:
+        """
+        Validate the inputs and split face values and types into (low, high) pairs per axis
+        """
+        axes = [np.asarray(x, dtype=float).ravel() for x in coordinates]
+        if not 1 <= len(axes) <= 3:
+            raise ValueError(f"Analytical solutions cover 1 to 3 dimensions, got {len(axes)}")
+        lengths = [float(x.max()) for x in axes] if lengths is None else [float(L) for L in lengths]
+        if len(lengths) != len(axes) or min(lengths) <= 0:
+            raise ValueError("Give one positive length per coordinate axis")
+
+        faces = BOUNDARY_FACES[:2 * len(axes)]
+        values = self.fd_service.normalize_boundary_values(boundary_values, faces)
+        boundary_types = boundary_types or {}
+        unknown = set(boundary_types) - set(faces)
+        if unknown:
+            raise ValueError(f"Unknown boundary faces {sorted(unknown)}, expected {faces}")
+        types = {face: boundary_types.get(face, "dirichlet") for face in faces}
+        for face, kind in types.items():
+            if kind not in BOUNDARY_TYPES:
+                raise ValueError(f"Unknown boundary type '{kind}', expected one of {BOUNDARY_TYPES}")
+            if kind == "neumann" and values[face] != 0:
+                raise ValueError(f"Neumann face '{face}' is insulated; only zero flux is supported")
+
+        pairs = [faces[2 * a:2 * a + 2] for a in range(len(axes))]
+        return (axes, lengths, [(values[lo], values[hi]) for lo, hi in pairs],
+                [(types[lo], types[hi]) for lo, hi in pairs])
+
+    def _axis_modes(self, L: float, pair: Tuple[str, str], n: int) -> Dict[str, Any]:
+        """
+        First n eigenfunctions of -d2/dx2 on [0, L] for the given end conditions: wavenumbers,
+        expansion coefficients of the constant 1 and a callable tabulating them on x
+        """
+        k = np.arange(1, n + 1, dtype=float)
+        if pair == ("dirichlet", "dirichlet"):
+            kappa = k * np.pi / L
+            coeff = 2.0 * (1.0 - (-1.0) ** k) / (k * np.pi)
+            basis = np.sin
+        elif pair == ("dirichlet", "neumann"):
+            kappa = (k - 0.5) * np.pi / L
+            coeff = 2.0 / ((k - 0.5) * np.pi)
+            basis = np.sin
+        elif pair == ("neumann", "dirichlet"):
+            kappa = (k - 0.5) * np.pi / L
+            coeff = 2.0 * (-1.0) ** (k + 1) / ((k - 0.5) * np.pi)
+            basis = np.cos
+        else:
+            kappa = (k - 1.0) * np.pi / L
+            coeff = np.zeros(n)
+            coeff[0] = 1.0
+            basis = np.cos
+        return {"kappa": kappa, "coeff": coeff, "table": lambda x: basis(np.multiply.outer(kappa, x))}
+
+    def _mode_tensors(self, modes: List[Dict[str, Any]],
+                      coefficients: Optional[List[np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eigenvalues of the tensor-product modes and the coefficients of a separable function,
+        by default the constant 1
+        """
+        coefficients = coefficients or [m["coeff"] for m in modes]
+        lam = np.zeros([len(m["kappa"]) for m in modes])
+        coeff = np.ones_like(lam)
+        for axis, (m, c) in enumerate(zip(modes, coefficients)):
+            expand = [1] * len(modes)
+            expand[axis] = len(m["kappa"])
+            lam = lam + (m["kappa"] ** 2).reshape(expand)
+            coeff = coeff * c.reshape(expand)
+        return lam, coeff
+
+    def _expand(self, weights: np.ndarray, modes: List[Dict[str, Any]], axes: List[np.ndarray],
+                batch: bool = False) -> np.ndarray:
+        """
+        Sum weights[k, l, ...] * phi_k(x) * phi_l(y) * ... onto the grid in (z, y, x) order
+        """
+        d = len(axes)
+        mode_idx, grid_idx = "abc"[:d], "xyz"[:d]
+        lead = "t" if batch else ""
+        subscripts = ",".join([lead + mode_idx] + [m + x for m, x in zip(mode_idx, grid_idx)])
+        tables = [m["table"](x) for m, x in zip(modes, axes)]
+        return np.einsum(f"{subscripts}->{lead}{grid_idx[::-1]}", weights, *tables, optimize=True)
+
+    def _source_term(self, axes: List[np.ndarray], lengths: List[float], types: List,
+                     modes: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Response to a unit source with homogeneous boundary conditions: the exact 1D parabola
+        along the first axis with a fixed face, corrected on the Dirichlet faces of the other
+        axes by face terms. Every series then decays exponentially away from the faces,
+        instead of the slow algebraic decay of a direct eigenfunction expansion.
+        """
+        axis = next(a for a, pair in enumerate(types) if pair != ("neumann", "neumann"))
+        x, L = axes[axis], lengths[axis]
+        parabola = {
+            ("dirichlet", "dirichlet"): x * (L - x) / 2,
+            ("dirichlet", "neumann"): x * (2 * L - x) / 2,
+            ("neumann", "dirichlet"): (L**2 - x**2) / 2
+        }[types[axis]]
+        expand = [1] * len(axes)
+        expand[len(axes) - 1 - axis] = len(x)
+        u = np.broadcast_to(parabola.reshape(expand), [len(c) for c in reversed(axes)]).copy()
+
+        # The parabola solves -u'' = 1 with the end conditions, so its coefficients are c_k / kappa_k**2
+        coefficients = [m["coeff"] for m in modes]
+        coefficients[axis] = modes[axis]["coeff"] / modes[axis]["kappa"] ** 2
+        for other, pair in enumerate(types):
+            for side in (0, 1):
+                if other != axis and pair[side] == "dirichlet":
+                    u -= self._face_term(other, side, axes, lengths, types, modes, coefficients)
+        return u
+
+    def _face_term(self, axis: int, side: int, axes: List[np.ndarray], lengths: List[float],
+                   types: List, modes: List[Dict[str, Any]],
+                   coefficients: Optional[List[np.ndarray]] = None) -> np.ndarray:
+        """
+        Harmonic function equal to 1 (or the separable function with the given per-axis mode
+        coefficients) on one Dirichlet face and satisfying the homogeneous conditions on every
+        other face. Along the face normal each transverse mode decays as sinh or cosh, written
+        with exponentials so large wavenumbers cannot overflow.
+        """
+        others = [a for a in range(len(axes)) if a != axis]
+        lam, coeff = self._mode_tensors([modes[a] for a in others],
+                                        coefficients and [coefficients[a] for a in others])
+        kappa = np.sqrt(lam)[..., None]
+
+        L = lengths[axis]
+        d = axes[axis] if side == 0 else L - axes[axis]  # distance from the face
+        far = np.exp(-2.0 * kappa * (L - d))
+        if types[axis][1 - side] == "dirichlet":
+            profile = np.where(kappa > 0, np.exp(-kappa * d) * (1.0 - far) / (1.0 - np.exp(-2.0 * kappa * L) + (kappa == 0)),
+                               1.0 - d / L)
+        else:
+            profile = np.where(kappa > 0, np.exp(-kappa * d) * (1.0 + far) / (1.0 + np.exp(-2.0 * kappa * L)), 1.0)
+
+        mode_idx, grid_idx = "abc"[:len(axes)], "xyz"[:len(axes)]
+        transverse = "".join(mode_idx[a] for a in others)
+        subscripts = [transverse, transverse + grid_idx[axis]]
+        subscripts += [mode_idx[a] + grid_idx[a] for a in others]
+        tables = [modes[a]["table"](axes[a]) for a in others]
+        return np.einsum(f"{','.join(subscripts)}->{grid_idx[::-1]}", coeff, profile, *tables, optimize=True)
+
+    def _truncate(self, evaluate: Callable[[int], np.ndarray], mask: np.ndarray, tolerance: float,
+                  max_terms: int) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Double the number of modes per axis until the change on the checked points is below
+        tolerance (relative to the solution scale) or max_terms is reached
+        """
+        n = min(16, max_terms)
+        u = evaluate(n)
+        while True:
+            n_next = min(2 * n, max_terms)
+            if n_next == n:
+                return u, {"solver": "analytical", "terms": n, "truncation_error": float("nan"), "converged": False}
+            u_next = evaluate(n_next)
+            change = float(np.max(np.abs(u_next - u)[np.broadcast_to(mask, u.shape)], initial=0.0))
+            scale = max(1.0, float(np.max(np.abs(u_next))))
+            if change <= tolerance * scale or n_next == max_terms:
+                return u_next, {
+                    "solver": "analytical",
+                    "terms": n_next,
+                    "truncation_error": change,
+                    "converged": change <= tolerance * scale
+                }
+            u, n = u_next, n_next
+
+    def _interior_mask(self, axes: List[np.ndarray], lengths: List[float], types: List) -> np.ndarray:
+        """
+        Grid points off the Dirichlet faces, where the series converges pointwise
+        """
+        mask = np.ones([len(x) for x in reversed(axes)], dtype=bool)
+        for axis, (x, L, pair) in enumerate(zip(axes, lengths, types)):
+            on_face = np.zeros(len(x), dtype=bool)
+            for side, at in ((0, 0.0), (1, L)):
+                if pair[side] == "dirichlet":
+                    on_face |= np.isclose(x, at, rtol=0.0, atol=1e-12 * L)
+            expand = [1] * len(axes)
+            expand[len(axes) - 1 - axis] = len(x)
+            mask &= ~on_face.reshape(expand)
+        return mask
+
+    def _apply_faces(self, u: np.ndarray, axes: List[np.ndarray], lengths: List[float],
+                     values: List, types: List) -> np.ndarray:
+        """
+        Set grid points on Dirichlet faces to the face temperature, with the same edge
+        precedence as the finite-difference embedding (x faces last)
+        """
+        for axis in reversed(range(len(axes))):
+            x, L = axes[axis], lengths[axis]
+            view = np.moveaxis(u, len(axes) - 1 - axis, 0)
+            for side, at in ((0, 0.0), (1, L)):
+                if types[axis][side] == "dirichlet":
+                    view[np.isclose(x, at, rtol=0.0, atol=1e-12 * L)] = values[axis][side]
+        return u
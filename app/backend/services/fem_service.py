@@ -0,0 +1,361 @@
+import hashlib
+import time
+from itertools import combinations
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+from typing import Any, Dict, List, Optional, Tuple, Union
+from schemas.mesh_data import MeshData
+from services.domain_decomposition_service import DomainDecompositionService
+from services.linear_solver_service import LinearSolverService
+from services.operator_cache_service import OPERATOR_CACHE
+
+# VTK cell type codes we can solve on; pixels and voxels use tensor-product vertex order
+VTK_CELL_TYPES = {5: "triangle", 8: "quadrilateral", 9: "quadrilateral",
+                  10: "tetrahedron", 11: "hexahedron", 12: "hexahedron"}
+TENSOR_ORDER_CELL_TYPES = (8, 11)
+CELL_DIMENSIONS = {"triangle": 2, "quadrilateral": 2, "tetrahedron": 3, "hexahedron": 3}
+
+# Vertex permutation between VTK order (counter-clockwise faces) and tensor-product order.
+# Both permutations are their own inverse.
+VTK_TO_TENSOR = {"quadrilateral": [0, 1, 3, 2], "hexahedron": [0, 1, 3, 2, 4, 5, 7, 6]}
+
+# Splitting of VTK-ordered quads into 2 triangles and hexes into 6 tetrahedra around the 0-6 diagonal
+SIMPLEX_SPLITS = {
+    "quadrilateral": [[0, 1, 2], [0, 2, 3]],
+    "hexahedron": [[0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6], [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]]
+}
+
+# Refinement passes of an adaptive solve before it gives up on the target error
+MAX_REFINEMENT_LEVELS = 30
+
+class FEMService:
+    """
+    Vectorized linear (P1) finite elements for -laplacian(T) = source on triangle and
+    tetrahedron meshes, with fixed temperature on the boundary. Element matrices are
+    computed for all cells at once and scattered into CSR in one step; quadrilateral and
+    hexahedral meshes are split into simplices first.
+    """
+
+    def __init__(self):
+        self.linear_solver_service = LinearSolverService()
+        self.domain_decomposition_service = DomainDecompositionService()
+
+    def solve(self, mesh_data: Union[MeshData, Dict[str, Any]], source: Union[float, List[float]] = 1.0,
+              boundary_value: Union[float, List[float]] = 0.0, solver: str = "direct_sparse",
+              method: str = "cg", preconditioner: str = "amg", tolerance: float = 1e-10,
+              max_iterations: int = 1000, subdomains: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve on the mesh in mesh_data (coordinates and connectivity as produced by
+        VTKService.parse_vtk_file) and return one column of vertex temperatures per case.
+        Lists of sources and/or boundary values are solved as a batch; the assembled system
+        and its factorization are cached per mesh. solver="domain_decomposition" splits the
+        mesh into `subdomains` slabs along its longest extent and solves them in parallel.
+        """
+        points, cells, cell_type = self.mesh_arrays(mesh_data)
+        cells = self.simplices(cells, cell_type)
+        digest = hashlib.sha1(points.tobytes() + cells.tobytes()).hexdigest()
+        return self.solve_arrays(points, cells, source, boundary_value, solver, method, preconditioner,
+                                 tolerance, max_iterations, cache_key=("p1", digest), subdomains=subdomains)
+
+    def solve_arrays(self, points: np.ndarray, cells: np.ndarray, source: Union[float, List[float]] = 1.0,
+                     boundary_value: Union[float, List[float]] = 0.0, solver: str = "direct_sparse",
+                     method: str = "cg", preconditioner: str = "amg", tolerance: float = 1e-10,
+                     max_iterations: int = 1000, cache_key: Optional[Tuple] = None,
+                     subdomains: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve on (N, 3) points and simplex connectivity. With a cache_key the assembled
+        system and its factorization are kept in the operator cache.
+        """
+        if cache_key is not None:
+            K, load, fixed = OPERATOR_CACHE.get_or_create(cache_key + ("system",), lambda: self.assemble(points, cells))
+        else:
+            K, load, fixed = self.assemble(points, cells)
+
+        sources = np.atleast_1d(np.asarray(source, dtype=float))
+        boundary_values = np.atleast_1d(np.asarray(boundary_value, dtype=float))
+        sources, boundary_values = np.broadcast_arrays(sources, boundary_values)
+
+        # Eliminate the boundary nodes: K_ff u_f = f - K_fb g
+        free = ~fixed
+        if cache_key is not None:
+            A = OPERATOR_CACHE.get_or_create(cache_key + ("free_block",), lambda: K[free][:, free].tocsr())
+        else:
+            A = K[free][:, free].tocsr()
+        coupling = K[free][:, fixed]
+        B = np.outer(load[free], sources) - coupling @ np.ones((int(fixed.sum()), 1)) * boundary_values
+
+        if solver == "direct_sparse":
+            U_free, info = self.linear_solver_service.solve_direct(
+                A, B, cache_key=None if cache_key is None else cache_key + ("free_block",)
+            )
+        elif solver == "sparse_iterative":
+            runs = [
+                self.linear_solver_service.solve_iterative(
+                    A, B[:, j], method=method, preconditioner=preconditioner,
+                    tolerance=tolerance, max_iterations=max_iterations
+                )
+                for j in range(B.shape[1])
+            ]
+            U_free = np.column_stack([u for u, _ in runs])
+            info = runs[0][1] if len(runs) == 1 else {"solver": solver, "batch_size": len(runs), "runs": [i for _, i in runs]}
+        elif solver == "domain_decomposition":
+            # Subdomains follow the free nodes' positions; one set of workers serves every case
+            U_free, runs = self.domain_decomposition_service.solve_batch(
+                A, B, n_subdomains=subdomains, coordinates=points[free],
+                tolerance=tolerance, max_iterations=max_iterations
+            )
+            info = runs[0] if len(runs) == 1 else {"solver": solver, "batch_size": len(runs), "runs": runs}
+        else:
+            raise ValueError(f"Unknown solver '{solver}', expected 'direct_sparse', 'sparse_iterative' or 'domain_decomposition'")
+
+        U = np.empty((len(points), B.shape[1]))
+        U[free] = U_free.reshape(int(free.sum()), -1)
+        U[fixed] = boundary_values
+        info.update({"engine": "scipy_p1", "num_elements": len(cells), "num_free_nodes": int(free.sum())})
+        return U, info
+
+    def assemble(self, points: np.ndarray, cells: np.ndarray) -> Tuple[csr_matrix, np.ndarray, np.ndarray]:
+        """
+        Assemble the P1 stiffness matrix and the load vector of a unit source, and flag the
+        nodes to hold fixed: boundary nodes plus any node not used by a cell.
+        """
+        d = cells.shape[1] - 1
+        X = points[cells][:, :, :d]
+        J = X[:, 1:, :] - X[:, :1, :]  # edge vectors from vertex 0, one row each
+        det = np.linalg.det(J)
+        if np.any(np.abs(det) <= 1e-14 * np.abs(J).max() ** d):
+            raise ValueError("The mesh has degenerate (zero-volume) cells")
+
+        # Barycentric gradients: grad(lambda_i) for i >= 1 are the columns of inv(J), lambda_0 closes the sum
+        G = np.linalg.inv(J).transpose(0, 2, 1)
+        G = np.concatenate([-G.sum(axis=1, keepdims=True), G], axis=1)
+        volume = np.abs(det) / np.prod(np.arange(1, d + 1))
+        Ke = volume[:, None, None] * np.einsum("eik,ejk->eij", G, G)
+
+        n = len(points)
+        rows = np.repeat(cells, d + 1, axis=1).ravel()
+        cols = np.tile(cells, (1, d + 1)).ravel()
+        K = coo_matrix((Ke.ravel(), (rows, cols)), shape=(n, n)).tocsr()
+        load = np.bincount(cells.ravel(), weights=np.repeat(volume / (d + 1), d + 1), minlength=n)
+
+        fixed = np.ones(n, dtype=bool)
+        fixed[cells.ravel()] = False
+        fixed[self.boundary_nodes(cells)] = True
+        return K, load, fixed
+
+    def boundary_nodes(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Nodes on facets (edges of triangles, faces of tetrahedra) that belong to a single cell
+        """
+        d = cells.shape[1] - 1
+        facets = np.sort(cells[:, list(combinations(range(d + 1), d))].reshape(-1, d), axis=1)
+        # Group equal facets with a lexicographic sort (much faster than np.unique(axis=0))
+        facets = facets[np.lexsort(facets.T[::-1])]
+        starts = np.flatnonzero(np.r_[True, np.any(facets[1:] != facets[:-1], axis=1)])
+        counts = np.diff(np.r_[starts, len(facets)])
+        return np.unique(facets[starts[counts == 1]])
+
+    def adapt(self, mesh_data: Union[MeshData, Dict[str, Any]], source: float = 1.0, boundary_value: float = 0.0,
+              target_error: float = 0.05, max_cells: int = 200000, max_levels: int = MAX_REFINEMENT_LEVELS,
+              fraction: float = 0.5) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Adaptive P1 solve on a triangle mesh: solve, estimate the error per cell from the
+        source residual and the jumps of the normal flux across edges, refine the cells
+        carrying the largest `fraction` of the estimated error by conforming longest-edge
+        bisection, and repeat until the relative energy-norm estimate drops below
+        target_error or the next mesh would exceed max_cells.
+        Returns the final points, cells, vertex temperatures and one report per level.
+        """
+        points, cells, cell_type = self.mesh_arrays(mesh_data)
+        cells = self.simplices(cells, cell_type)
+        if cells.shape[1] != 3:
+            raise ValueError("Adaptive refinement with the SciPy engine supports 2D (triangle or quadrilateral) meshes")
+
+        levels = []
+        for level in range(max_levels + 1):
+            start = time.perf_counter()
+            U, _ = self.solve_arrays(points, cells, source, boundary_value)
+            u = U[:, 0]
+            eta = self.error_indicators(points, cells, u, source)
+            grad, area = self._gradients(points, cells, u)
+            energy = np.sqrt(float(np.einsum("e,ek,ek->", area, grad, grad))) or 1.0
+            estimate = float(np.sqrt(eta.sum()) / energy)
+            levels.append({
+                "level": level,
+                "cells": len(cells),
+                "dofs": len(points),
+                "estimated_error": estimate,
+                "seconds": time.perf_counter() - start
+            })
+            if estimate <= target_error or level == max_levels:
+                break
+
+            refined_points, refined_cells = self.refine(points, cells, self.mark(eta, fraction))
+            if len(refined_cells) > max_cells:
+                break
+            points, cells = refined_points, refined_cells
+        return points, cells, u, levels
+
+    def mark(self, eta: np.ndarray, fraction: float = 0.5) -> np.ndarray:
+        """
+        Doerfler marking: flag the fewest cells whose indicators carry `fraction` of the total
+        """
+        order = np.argsort(eta)[::-1]
+        count = int(np.searchsorted(np.cumsum(eta[order]), fraction * eta.sum())) + 1
+        marked = np.zeros(len(eta), dtype=bool)
+        marked[order[:count]] = True
+        return marked
+
+    def error_indicators(self, points: np.ndarray, cells: np.ndarray, u: np.ndarray, source: float) -> np.ndarray:
+        """
+        Squared residual error indicator per triangle for a P1 solution:
+        h_T**2 * ||f||_T**2 plus half the squared normal-gradient jumps h_e**2 * [du/dn]**2
+        over the cell's interior edges
+        """
+        X = points[cells][:, :, :2]
+        grad, area = self._gradients(points, cells, u)
+        h = np.max(np.linalg.norm(X - np.roll(X, 1, axis=1), axis=2), axis=1)
+        eta = h**2 * source**2 * area
+
+        # Pair up the two cells on each interior edge
+        edges, cell_of_edge = self._cell_edges(cells, len(points))
+        order = np.argsort(edges, kind="stable")
+        edges, cell_of_edge = edges[order], cell_of_edge[order]
+        pair = np.flatnonzero(edges[1:] == edges[:-1])
+        left, right = cell_of_edge[pair], cell_of_edge[pair + 1]
+
+        n = len(points)
+        a, b = edges[pair] // n, edges[pair] % n
+        tangent = points[b, :2] - points[a, :2]
+        length = np.linalg.norm(tangent, axis=1)
+        normal = np.c_[tangent[:, 1], -tangent[:, 0]] / length[:, None]
+        jump = np.einsum("ek,ek->e", grad[left] - grad[right], normal)
+        contribution = 0.5 * length**2 * jump**2
+        return eta + np.bincount(left, contribution, len(cells)) + np.bincount(right, contribution, len(cells))
+
+    def refine(self, points: np.ndarray, cells: np.ndarray, marked: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Conforming longest-edge bisection of the marked triangles. Every cell with a split
+        edge also splits its own longest edge (repeated until nothing changes), so each cell
+        is cut into 2, 3 or 4 triangles and no hanging nodes remain.
+        """
+        # Rotate each triangle so that local edge 0 = (v0, v1) is its longest edge
+        X = points[cells][:, :, :2]
+        lengths = np.linalg.norm(X[:, [1, 2, 0]] - X, axis=2)  # edge j runs from v_j to v_j+1
+        shift = np.argmax(lengths, axis=1)
+        cells = cells[np.arange(len(cells))[:, None], (shift[:, None] + np.arange(3)) % 3]
+
+        edges, _ = self._cell_edges(cells, len(points))
+        unique_edges, edge_ids = np.unique(edges, return_inverse=True)
+        edge_ids = edge_ids.reshape(-1, 3)
+
+        split = np.zeros(len(unique_edges), dtype=bool)
+        split[edge_ids[marked, 0]] = True
+        while True:
+            needs = split[edge_ids].any(axis=1) & ~split[edge_ids[:, 0]]
+            if not needs.any():
+                break
+            split[edge_ids[needs, 0]] = True
+
+        # One new vertex at the midpoint of every split edge
+        n = len(points)
+        a, b = unique_edges[split] // n, unique_edges[split] % n
+        midpoint = np.full(len(unique_edges), -1)
+        midpoint[split] = n + np.arange(int(split.sum()))
+        points = np.vstack([points, (points[a] + points[b]) / 2])
+
+        v0, v1, v2 = cells.T
+        m0, m1, m2 = midpoint[edge_ids].T
+        cut = split[edge_ids]
+        keep = ~cut[:, 0]
+        s1, s2 = cut[:, 0] & ~cut[:, 1], cut[:, 0] & ~cut[:, 2]
+        d1, d2 = cut[:, 0] & cut[:, 1], cut[:, 0] & cut[:, 2]
+        children = [
+            cells[keep],
+            # Half (v0, m0, v2), split again at m2 when edge (v2, v0) is cut
+            np.c_[v0, m0, v2][s2], np.c_[v0, m0, m2][d2], np.c_[m0, v2, m2][d2],
+            # Half (m0, v1, v2), split again at m1 when edge (v1, v2) is cut
+            np.c_[m0, v1, v2][s1], np.c_[m0, v1, m1][d1], np.c_[m0, m1, v2][d1]
+        ]
+        return points, np.vstack(children)
+
+    def _gradients(self, points: np.ndarray, cells: np.ndarray, u: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Constant gradient of a P1 field and the area of every triangle
+        """
+        X = points[cells][:, :, :2]
+        J = X[:, 1:, :] - X[:, :1, :]
+        G = np.linalg.inv(J).transpose(0, 2, 1)
+        G = np.concatenate([-G.sum(axis=1, keepdims=True), G], axis=1)
+        return np.einsum("ei,eik->ek", u[cells], G), np.abs(np.linalg.det(J)) / 2
+
+    def _cell_edges(self, cells: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Integer keys a * n + b (a < b) of the three edges of every triangle, edge j running
+        from local vertex j to j + 1, and the cell each key belongs to
+        """
+        a, b = cells, np.roll(cells, -1, axis=1)
+        keys = np.minimum(a, b) * n + np.maximum(a, b)
+        return keys.ravel(), np.repeat(np.arange(len(cells)), 3)
+
+    def simplices(self, cells: np.ndarray, cell_type: str) -> np.ndarray:
+        """
+        Split VTK-ordered quadrilaterals and hexahedra into triangles and tetrahedra
+        """
+        if cell_type in SIMPLEX_SPLITS:
+            return cells[:, SIMPLEX_SPLITS[cell_type]].reshape(-1, len(SIMPLEX_SPLITS[cell_type][0]))
+        return cells
+
+    def mesh_arrays(self, mesh_data: Union[MeshData, Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, str]:
+        """
+        Return (N, 3) coordinates, an (M, k) connectivity array in VTK vertex order and the
+        cell type. Mixed meshes keep only their highest-dimensional cells (e.g. drop boundary
+        lines). Cell types come from VTK codes in mesh_data["cell_types"] when present, and are
+        otherwise inferred from the nodes per cell: 3 is a triangle, 8 a hexahedron and 4 a
+        quadrilateral in a plane or a tetrahedron in 3D. MeshData cells are gathered straight
+        from its offsets and connectivity arrays.
+        """
+        if isinstance(mesh_data, MeshData):
+            points, codes, connectivity = mesh_data.coordinates, mesh_data.cell_types, None
+        else:
+            points, codes, connectivity = mesh_data['coordinates'], mesh_data.get('cell_types'), mesh_data['connectivity']
+        points = np.asarray(points, dtype=float)
+        points = np.pad(points, ((0, 0), (0, 3 - points.shape[1])))
+
+        if codes is not None:
+            codes = np.asarray(codes)
+            supported = [code for code in np.unique(codes) if code in VTK_CELL_TYPES]
+            if not supported:
+                raise ValueError(f"No supported cells in the mesh (VTK cell types {np.unique(codes).tolist()})")
+            cell_type = max((VTK_CELL_TYPES[code] for code in supported), key=CELL_DIMENSIONS.get)
+            keep = np.isin(codes, [code for code in supported if VTK_CELL_TYPES[code] == cell_type])
+        else:
+            if connectivity is None:
+                sizes = np.diff(mesh_data.offsets)
+            elif isinstance(connectivity, np.ndarray) and connectivity.ndim == 2:
+                sizes = np.full(len(connectivity), connectivity.shape[1])
+            else:
+                sizes = np.array([len(cell) for cell in connectivity])
+            flat = np.ptp(points[:, 2]) == 0
+            by_size = {3: "triangle", 4: "quadrilateral" if flat else "tetrahedron", 8: "hexahedron"}
+            supported = [size for size in np.unique(sizes) if size in by_size]
+            if not supported:
+                raise ValueError(f"No supported cells in the mesh (nodes per cell {np.unique(sizes).tolist()})")
+            cell_type = max((by_size[size] for size in supported), key=CELL_DIMENSIONS.get)
+            keep = sizes == next(size for size in supported if by_size[size] == cell_type)
+
+        if connectivity is None:
+            starts = mesh_data.offsets[:-1][keep]
+            nodes = int(mesh_data.offsets[np.argmax(keep) + 1] - mesh_data.offsets[np.argmax(keep)])
+            cells = mesh_data.connectivity[starts[:, None] + np.arange(nodes)]
+        elif isinstance(connectivity, np.ndarray) and connectivity.ndim == 2:
+            cells = connectivity[keep]
+        else:
+            cells = np.array([cell for cell, kept in zip(connectivity, keep) if kept])
+        cells = cells.astype(np.int64).reshape(int(keep.sum()), -1)
+
+        # Pixels and voxels are stored in tensor-product order; bring them to VTK order
+        if codes is not None and cell_type in VTK_TO_TENSOR:
+            tensor = np.isin(codes[keep], TENSOR_ORDER_CELL_TYPES)
+            cells[tensor] = cells[tensor][:, VTK_TO_TENSOR[cell_type]]
+        return points, cells, cell_type
@@ -0,0 +1,223 @@
+import numpy as np
+from scipy.sparse import csr_matrix, diags, identity, kron
+from scipy.sparse.linalg import LinearOperator
+from typing import Dict, List, Optional, Tuple, Union
+
+BOUNDARY_EDGES = ("left", "right", "bottom", "top")
+BOUNDARY_FACES = BOUNDARY_EDGES + ("front", "back")
+
+class FiniteDifferenceService:
+    def create_grid(self, nx: int, ny: int, lx: float = 1.0, ly: float = 1.0) -> Tuple[np.ndarray, np.ndarray, float, float]:
+        """
+        Create a uniform grid over [0, lx] x [0, ly] and return its coordinates and spacing
+        """
+        if nx < 3 or ny < 3:
+            raise ValueError("Grid needs at least 3 points per direction to have interior nodes")
+
+        x = np.linspace(0, lx, nx)
+        y = np.linspace(0, ly, ny)
+        return x, y, float(x[1] - x[0]), float(y[1] - y[0])
+
+    def assemble_laplacian(self, nx: int, ny: int, dx: float, dy: float) -> csr_matrix:
+        """
+        Assemble the negative 5-point Laplacian on the interior nodes of an nx x ny grid.
+        Unknowns are ordered with x varying fastest; the matrix is symmetric positive definite.
+        """
+        tx = self._second_difference(nx - 2, dx)
+        ty = self._second_difference(ny - 2, dy)
+
+        # Kronecker sum of the 1D operators gives the 5-point stencil without any per-node loop
+        A = kron(identity(ny - 2, format="csr"), tx) + kron(ty, identity(nx - 2, format="csr"))
+        return A.tocsr()
+
+    def operator_key(self, nx: int, ny: int, dx: float, dy: float) -> Tuple:
+        """
+        Cache key identifying the assembled operator: grid shape, spacing, boundary layout
+        and coefficients (boundary values only enter the right-hand side)
+        """
+        return ("laplacian_2d", (ny, nx), (dy, dx), "dirichlet", (1.0,))
+
+    def assemble_rhs(self, nx: int, ny: int, dx: float, dy: float,
+                     source: Union[float, np.ndarray] = 1.0,
+                     boundary_values: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Assemble the right-hand side for the interior nodes.
+        The source may be a scalar or an (ny, nx) array; fixed edge temperatures
+        (Dirichlet) are moved to the right-hand side of the neighbouring interior nodes.
+        """
+        source = np.asarray(source, dtype=float)
+        if source.ndim == 0:
+            b = np.full((ny - 2, nx - 2), float(source))
+        elif source.shape == (ny, nx):
+            b = source[1:-1, 1:-1].copy()
+        else:
+            raise ValueError(f"Source must be a scalar or an array of shape {(ny, nx)}, got {source.shape}")
+
+        edges = self.normalize_boundary_values(boundary_values)
+        b[:, 0] += edges["left"] / dx**2
+        b[:, -1] += edges["right"] / dx**2
+        b[0, :] += edges["bottom"] / dy**2
+        b[-1, :] += edges["top"] / dy**2
+        return b.ravel()
+
+    def batch_cases(self, source: Union[float, np.ndarray, List] = 1.0,
+                    boundary_values: Optional[Union[Dict[str, float], List[Dict[str, float]]]] = None
+                    ) -> Tuple[List, List[Optional[Dict[str, float]]]]:
+        """
+        Split a source and boundary specification into per-case lists.
+        A list of sources (scalars or (ny, nx) arrays) and/or a list of boundary_values
+        dicts describes a batch; a single value is shared by every case in the batch.
+        """
+        source_array = np.asarray(source, dtype=float)
+        sources = list(source_array) if source_array.ndim in (1, 3) else [source]
+        cases = list(boundary_values) if isinstance(boundary_values, (list, tuple)) else [boundary_values]
+
+        size = max(len(sources), len(cases))
+        if len(sources) not in (1, size) or len(cases) not in (1, size):
+            raise ValueError(f"Batch sizes do not match: {len(sources)} sources, {len(cases)} boundary sets")
+        return sources * (size // len(sources)), cases * (size // len(cases))
+
+    def assemble_rhs_batch(self, nx: int, ny: int, dx: float, dy: float, sources: List,
+                           boundary_values: List[Optional[Dict[str, float]]]) -> np.ndarray:
+        """
+        Assemble one right-hand side per case as the columns of an (n_interior, n_cases) array
+        """
+        return np.column_stack([
+            self.assemble_rhs(nx, ny, dx, dy, source=source, boundary_values=edges)
+            for source, edges in zip(sources, boundary_values)
+        ])
+
+    def embed_interior(self, u_interior: np.ndarray, nx: int, ny: int,
+                       boundary_values: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Place an interior solution vector into a full (ny, nx) grid with the boundary values applied
+        """
+        edges = self.normalize_boundary_values(boundary_values)
+        u = np.empty((ny, nx))
+        u[0, :] = edges["bottom"]
+        u[-1, :] = edges["top"]
+        u[:, 0] = edges["left"]
+        u[:, -1] = edges["right"]
+        u[1:-1, 1:-1] = u_interior.reshape(ny - 2, nx - 2)
+        return u
+
+    def interior_coordinates(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        (x, y) of every interior node in the order of the unknowns, e.g. for partitioning the grid
+        """
+        X, Y = np.meshgrid(x[1:-1], y[1:-1])
+        return np.column_stack([X.ravel(), Y.ravel()])
+
+    def normalize_boundary_values(self, boundary_values: Optional[Dict[str, float]] = None,
+                                  edges: Tuple[str, ...] = BOUNDARY_EDGES) -> Dict[str, float]:
+        """
+        Fill in missing edges (or faces in 3D) with zero and reject unknown names
+        """
+        boundary_values = boundary_values or {}
+        unknown = set(boundary_values) - set(edges)
+        if unknown:
+            raise ValueError(f"Unknown boundary edges {sorted(unknown)}, expected {edges}")
+        return {edge: float(boundary_values.get(edge, 0.0)) for edge in edges}
+
+    def create_grid_3d(self, nx: int, ny: int, nz: int, lx: float = 1.0, ly: float = 1.0,
+                       lz: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float, float]:
+        """
+        Create a uniform grid over [0, lx] x [0, ly] x [0, lz] and return its coordinates and spacing
+        """
+        x, y, dx, dy = self.create_grid(nx, ny, lx, ly)
+        if nz < 3:
+            raise ValueError("Grid needs at least 3 points per direction to have interior nodes")
+        z = np.linspace(0, lz, nz)
+        return x, y, z, dx, dy, float(z[1] - z[0])
+
+    def laplacian_operator_3d(self, nx: int, ny: int, nz: int, dx: float, dy: float, dz: float) -> LinearOperator:
+        """
+        Matrix-free negative 7-point Laplacian on the interior nodes of an nx x ny x nz grid.
+        Unknowns are ordered as a C-contiguous (nz, ny, nx) array; the stencil is applied with
+        array slicing, so no matrix is stored and memory stays proportional to the grid.
+        """
+        shape = (nz - 2, ny - 2, nx - 2)
+        cx, cy, cz = 1.0 / dx**2, 1.0 / dy**2, 1.0 / dz**2
+        center = 2.0 * (cx + cy + cz)
+
+        def matvec(v):
+            u = v.reshape(shape)
+            out = center * u
+            out[:, :, 1:] -= cx * u[:, :, :-1]
+            out[:, :, :-1] -= cx * u[:, :, 1:]
+            out[:, 1:, :] -= cy * u[:, :-1, :]
+            out[:, :-1, :] -= cy * u[:, 1:, :]
+            out[1:, :, :] -= cz * u[:-1, :, :]
+            out[:-1, :, :] -= cz * u[1:, :, :]
+            return out.ravel()
+
+        n = int(np.prod(shape))
+        return LinearOperator((n, n), matvec=matvec, rmatvec=matvec, dtype=float)
+
+    def assemble_laplacian_3d(self, nx: int, ny: int, nz: int, dx: float, dy: float, dz: float) -> csr_matrix:
+        """
+        Assemble the negative 7-point Laplacian on the interior nodes of an nx x ny x nz grid,
+        in the (nz, ny, nx) order of laplacian_operator_3d, for solvers that need the matrix
+        itself (multigrid builds its coarse levels from it)
+        """
+        tx = self._second_difference(nx - 2, dx)
+        ty = self._second_difference(ny - 2, dy)
+        tz = self._second_difference(nz - 2, dz)
+        ix, iy, iz = (identity(n - 2, format="csr") for n in (nx, ny, nz))
+        A = kron(iz, kron(iy, tx)) + kron(iz, kron(ty, ix)) + kron(tz, kron(iy, ix))
+        return A.tocsr()
+
+    def operator_key_3d(self, nx: int, ny: int, nz: int, dx: float, dy: float, dz: float) -> Tuple:
+        """
+        Cache key of the assembled 3D operator, like operator_key
+        """
+        return ("laplacian_3d", (nz, ny, nx), (dz, dy, dx), "dirichlet", (1.0,))
+
+    def assemble_rhs_3d(self, nx: int, ny: int, nz: int, dx: float, dy: float, dz: float,
+                        source: Union[float, np.ndarray] = 1.0,
+                        boundary_values: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Assemble the right-hand side for the interior nodes of a 3D grid. The source may be a
+        scalar or an (nz, ny, nx) array; fixed face temperatures (left/right in x, bottom/top
+        in y, front/back in z) are moved to the neighbouring interior nodes.
+        """
+        source = np.asarray(source, dtype=float)
+        if source.ndim == 0:
+            b = np.full((nz - 2, ny - 2, nx - 2), float(source))
+        elif source.shape == (nz, ny, nx):
+            b = source[1:-1, 1:-1, 1:-1].copy()
+        else:
+            raise ValueError(f"Source must be a scalar or an array of shape {(nz, ny, nx)}, got {source.shape}")
+
+        faces = self.normalize_boundary_values(boundary_values, BOUNDARY_FACES)
+        b[:, :, 0] += faces["left"] / dx**2
+        b[:, :, -1] += faces["right"] / dx**2
+        b[:, 0, :] += faces["bottom"] / dy**2
+        b[:, -1, :] += faces["top"] / dy**2
+        b[0, :, :] += faces["front"] / dz**2
+        b[-1, :, :] += faces["back"] / dz**2
+        return b.ravel()
+
+    def embed_interior_3d(self, u_interior: np.ndarray, nx: int, ny: int, nz: int,
+                          boundary_values: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Place an interior solution vector into a full (nz, ny, nx) grid with the face values applied
+        """
+        faces = self.normalize_boundary_values(boundary_values, BOUNDARY_FACES)
+        u = np.empty((nz, ny, nx))
+        u[0, :, :] = faces["front"]
+        u[-1, :, :] = faces["back"]
+        u[:, 0, :] = faces["bottom"]
+        u[:, -1, :] = faces["top"]
+        u[:, :, 0] = faces["left"]
+        u[:, :, -1] = faces["right"]
+        u[1:-1, 1:-1, 1:-1] = u_interior.reshape(nz - 2, ny - 2, nx - 2)
+        return u
+
+    def _second_difference(self, n: int, h: float) -> csr_matrix:
+        """
+        1D negative second-difference matrix on n interior nodes with spacing h
+        """
+        main = np.full(n, 2.0 / h**2)
+        off = np.full(n - 1, -1.0 / h**2)
+        return diags([off, main, off], [-1, 0, 1], format="csr")
@@ -0,0 +1,184 @@
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix, diags, issparse
+from scipy.sparse.linalg import LinearOperator, gmres, spilu
+from typing import Any, Dict, List, Optional, Tuple
+from services.operator_cache_service import OPERATOR_CACHE
+
+try:
+    import pyamg
+except ImportError:  # algebraic multigrid preconditioning is optional
+    pyamg = None
+
+KRYLOV_METHODS = ("cg", "gmres")
+PRECONDITIONERS = ("none", "jacobi", "ilu", "amg")
+
+class LinearSolverService:
+    def solve_direct(self, A: csr_matrix, b: np.ndarray,
+                     cache_key: Optional[Tuple] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve A x = b with a sparse direct factorization.
+        With a cache_key the factorization is kept in the process-wide operator cache,
+        so repeated solves with the same operator only do the triangular solves.
+        """
+        if cache_key is not None:
+            x = OPERATOR_CACHE.get_factorization(cache_key, A).solve(b)
+        else:
+            x = OPERATOR_CACHE.factorize(A).solve(b)
+        return x, {
+            "solver": "direct_sparse",
+            "final_residual": self._relative_residual(A, x, b)
+        }
+
+    def solve_iterative(self, A: csr_matrix, b: np.ndarray, method: str = "cg",
+                        preconditioner: str = "jacobi", tolerance: float = 1e-6,
+                        max_iterations: int = 1000) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve A x = b with a preconditioned Krylov method and record the relative
+        residual after every iteration. A may also be a matrix-free LinearOperator,
+        which supports preconditioner="none" only.
+        """
+        if method not in KRYLOV_METHODS:
+            raise ValueError(f"Unknown Krylov method '{method}', expected one of {KRYLOV_METHODS}")
+
+        if not isinstance(A, LinearOperator):
+            A = csr_matrix(A)
+        M = self.build_preconditioner(A, preconditioner)
+        history: List[float] = []
+
+        if method == "cg":
+            x, info = self.preconditioned_cg(A, b, M, tolerance, max_iterations, history)
+        else:
+            def record(pr_norm):
+                history.append(float(pr_norm))
+
+            x, info = gmres(A, b, rtol=tolerance, maxiter=max_iterations, M=M,
+                            callback=record, callback_type="pr_norm")
+
+        return x, {
+            "solver": "sparse_iterative",
+            "method": method,
+            "preconditioner": preconditioner,
+            "iterations": len(history),
+            "converged": info == 0,
+            "residual_history": history,
+            "final_residual": self._relative_residual(A, x, b)
+        }
+
+    def solve_mixed_precision(self, A: csr_matrix, b: np.ndarray, inner: str = "direct_sparse",
+                              method: str = "cg", preconditioner: str = "jacobi",
+                              tolerance: float = 1e-10, max_refinements: int = 20,
+                              inner_tolerance: float = 1e-4, max_iterations: int = 1000,
+                              cache_key: Optional[Tuple] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve A x = b by factorizing (inner="direct_sparse") or iterating (inner="sparse_iterative")
+        in single precision, then recovering double-precision accuracy with iterative refinement:
+        residuals are formed in double precision and each correction is solved in single precision.
+        The single-precision factors take about half the memory and bandwidth of double ones.
+        """
+        A = csr_matrix(A)
+        A32 = A.astype(np.float32)
+
+        if inner == "direct_sparse":
+            if cache_key is not None:
+                lu32 = OPERATOR_CACHE.get_factorization(tuple(cache_key) + ("float32",), A32)
+            else:
+                lu32 = OPERATOR_CACHE.factorize(A32)
+            correct = lu32.solve
+        elif inner == "sparse_iterative":
+            if method not in KRYLOV_METHODS:
+                raise ValueError(f"Unknown Krylov method '{method}', expected one of {KRYLOV_METHODS}")
+            M32 = self.build_preconditioner(A32, preconditioner)
+
+            def correct(r32):
+                if method == "cg":
+                    d, _ = self.preconditioned_cg(A32, r32, M32, inner_tolerance, max_iterations, [])
+                else:
+                    d, _ = gmres(A32, r32, rtol=inner_tolerance, maxiter=max_iterations, M=M32)
+                return d
+        else:
+            raise ValueError(f"Unknown inner solver '{inner}', expected 'direct_sparse' or 'sparse_iterative'")
+
+        b_norm = np.linalg.norm(b) or 1.0
+        x = correct(np.asarray(b, dtype=np.float32)).astype(np.float64)
+        r = b - A @ x
+        history = [float(np.linalg.norm(r) / b_norm)]
+        while history[-1] > tolerance and len(history) <= max_refinements:
+            # Scale the residual before rounding it to single precision so it does not underflow
+            scale = np.abs(r).max() or 1.0
+            x += scale * correct((r / scale).astype(np.float32)).astype(np.float64)
+            r = b - A @ x
+            history.append(float(np.linalg.norm(r) / b_norm))
+
+        return x, {
+            "solver": inner,
+            "precision": "mixed",
+            "refinement_steps": len(history) - 1,
+            "converged": history[-1] <= tolerance,
+            "residual_history": history,
+            "final_residual": history[-1]
+        }
+
+    def build_preconditioner(self, A: csr_matrix, kind: str = "jacobi") -> LinearOperator:
+        """
+        Build a preconditioner for A as a LinearOperator (None for no preconditioning)
+        """
+        if kind not in PRECONDITIONERS:
+            raise ValueError(f"Unknown preconditioner '{kind}', expected one of {PRECONDITIONERS}")
+
+        if kind == "none":
+            return None
+        if not issparse(A):
+            raise ValueError(f"Preconditioner '{kind}' needs an assembled matrix, use 'none' for matrix-free operators")
+        if kind == "jacobi":
+            inv_diag = diags(1.0 / A.diagonal())
+            return LinearOperator(A.shape, matvec=lambda r: inv_diag @ r, dtype=A.dtype)
+        if kind == "ilu":
+            ilu = spilu(csc_matrix(A), drop_tol=1e-4, fill_factor=10, permc_spec="MMD_AT_PLUS_A",
+                        diag_pivot_thresh=0.0, options={"SymmetricMode": True})
+            return LinearOperator(A.shape, matvec=ilu.solve, dtype=A.dtype)
+
+        if pyamg is None:
+            raise ValueError("The 'amg' preconditioner requires the pyamg package")
+        return pyamg.smoothed_aggregation_solver(A).aspreconditioner(cycle="V")
+
+    def preconditioned_cg(self, A, b: np.ndarray, M: Optional[LinearOperator], tolerance: float,
+                          max_iterations: int, history: List[float],
+                          x0: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+        """
+        Preconditioned conjugate gradients, optionally warm-started from x0. The recurrence
+        already carries the residual, so the history costs no extra operator applications
+        (one matvec per iteration). Returns the iterate and 0 on convergence, like scipy's solvers.
+        """
+        b_norm = np.linalg.norm(b) or 1.0
+        if x0 is None:
+            x = np.zeros_like(b)
+            r = b.copy()
+        else:
+            x = np.array(x0, dtype=b.dtype)
+            r = b - A @ x
+        z = r if M is None else M @ r
+        p = z.copy()
+        rz = r.dot(z)
+
+        for _ in range(max_iterations):
+            if np.linalg.norm(r) / b_norm <= tolerance:
+                return x, 0
+            Ap = A @ p
+            step = rz / p.dot(Ap)
+            x += step * p
+            r -= step * Ap
+            history.append(float(np.linalg.norm(r) / b_norm))
+
+            z = r if M is None else M @ r
+            rz_next = r.dot(z)
+            p *= rz_next / rz
+            p += z
+            rz = rz_next
+
+        return x, 0 if np.linalg.norm(r) / b_norm <= tolerance else max_iterations
+
+    def _relative_residual(self, A: csr_matrix, x: np.ndarray, b: np.ndarray) -> float:
+        """
+        Relative residual ||b - A x|| / ||b||
+        """
+        return float(np.linalg.norm(b - A @ x) / (np.linalg.norm(b) or 1.0))
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from schemas.mesh_data import MeshData
+from services.statistics_service import RunningStatistics
+
+DEFAULT_CACHE_DIR = os.environ.get("MESH_CACHE_DIR", str(Path.home() / ".cache" / "agentic_physics" / "meshes"))
+DEFAULT_MAX_BYTES = int(os.environ.get("MESH_CACHE_MAX_MB", "2048")) * 1024**2
+
+# MeshData arrays stored one .npy file each; point fields go to field_<i>.npy
+MESH_ARRAYS = ("coordinates", "offsets", "connectivity", "cell_types")
+HASH_CHUNK_BYTES = 8 * 1024**2
+
+class MeshCacheService:
+    """
+    Content-addressed on-disk cache of parsed meshes. Each entry is a directory named by the
+    SHA-256 of the uploaded file holding the MeshData arrays as .npy files, which later
+    requests open memory-mapped instead of parsing the file again. Entries are written to a
+    temporary directory and renamed into place, so concurrent workers never see partial
+    entries; the least recently used ones are deleted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def digest(self, file_path: str) -> str:
+        """
+        SHA-256 of the file contents, read in chunks
+        """
+        sha = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_BYTES), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def get(self, key: str) -> Optional[MeshData]:
+        """
+        Memory-mapped MeshData for key, or None on a miss
+        """
+        entry = self.cache_dir / key
+        try:
+            meta = json.loads((entry / "meta.json").read_text())
+            arrays = {name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in MESH_ARRAYS}
+            fields = {name: np.load(entry / f"field_{i}.npy", mmap_mode="r") for i, name in enumerate(meta["fields"])}
+            statistics = {name: RunningStatistics.from_dict(data) for name, data in meta.get("statistics", {}).items()}
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+        os.utime(entry)  # mark as recently used
+        return MeshData(point_data=fields, dimensions=meta["dimensions"], is_structured=meta["is_structured"],
+                        statistics=statistics, **arrays)
+
+    def put(self, key: str, mesh_data: MeshData):
+        """
+        Store mesh_data under key and evict the least recently used entries beyond max_bytes
+        """
+        self.store(key, lambda directory: mesh_data)
+
+    def store(self, key: str, build: Callable[[Path], MeshData]):
+        """
+        Store the mesh returned by build(directory) under key. build may write some arrays
+        into the entry directory itself (e.g. as memory maps filled by a streaming parser)
+        using the cache file names; everything else is saved from the returned MeshData,
+        including the field statistics gathered while parsing.
+        """
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir))
+        try:
+            mesh_data = build(tmp)
+            arrays = {f"{name}.npy": getattr(mesh_data, name) for name in MESH_ARRAYS}
+            arrays.update({f"field_{i}.npy": values for i, values in enumerate(mesh_data.point_data.values())})
+            for filename, values in arrays.items():
+                if not (tmp / filename).exists():
+                    np.save(tmp / filename, values)
+            (tmp / "meta.json").write_text(json.dumps({
+                "fields": list(mesh_data.point_data),
+                "dimensions": mesh_data.dimensions,
+                "is_structured": mesh_data.is_structured,
+                "statistics": {name: stats.to_dict() for name, stats in mesh_data.statistics.items()}
+            }))
+            os.rename(tmp, entry)
+        except OSError:
+            # Another worker stored the same upload first, or the disk is full; the cache is best effort
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None):
+        """
+        Delete least recently used entries until the cache fits in max_bytes. The entry
+        named keep (the one just stored) always stays, even if it alone exceeds the limit.
+        """
+        with self._lock:
+            entries = []
+            for entry in self.cache_dir.iterdir():
+                if entry.is_dir() and not entry.name.startswith(".tmp-") and entry.name != keep:
+                    size = sum(path.stat().st_size for path in entry.iterdir())
+                    entries.append((entry.stat().st_mtime, size, entry))
+
+            total = sum(size for _, size, _ in entries)
+            if keep is not None and (self.cache_dir / keep).is_dir():
+                total += sum(path.stat().st_size for path in (self.cache_dir / keep).iterdir())
+            for _, size, entry in sorted(entries, key=lambda item: item[0]):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of entries and bytes on disk
+        """
+        if not self.cache_dir.exists():
+            return {"entries": 0, "bytes": 0, "max_bytes": self.max_bytes}
+        entries = [entry for entry in self.cache_dir.iterdir() if entry.is_dir() and not entry.name.startswith(".tmp-")]
+        return {
+            "entries": len(entries),
+            "bytes": sum(path.stat().st_size for entry in entries for path in entry.iterdir()),
+            "max_bytes": self.max_bytes
+        }
+
+# Process-wide cache shared by every VTKService instance
+MESH_CACHE = MeshCacheService()
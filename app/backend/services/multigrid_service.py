@@ -0,0 +1,147 @@
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix, identity, kron
+from scipy.sparse.linalg import splu
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from services.operator_cache_service import OPERATOR_CACHE
+
+MULTIGRID_CYCLES = {"V": 1, "W": 2}
+
+class MultigridService:
+    def __init__(self, coarsest_size: int = 64):
+        self.coarsest_size = coarsest_size
+
+    def solve(self, A: csr_matrix, b: np.ndarray, shape: Sequence[int], cycle: str = "V",
+              tolerance: float = 1e-8, max_cycles: int = 50,
+              pre_smooth: int = 2, post_smooth: int = 2,
+              cache_key: Optional[Tuple] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Solve A x = b with geometric multigrid V- or W-cycles.
+        shape is the interior grid shape in array order (x varying fastest, as assembled by
+        FiniteDifferenceService), in 2D or 3D. The residual reduction of every cycle is
+        reported as its convergence factor. With a cache_key the level hierarchy is kept
+        in the process-wide operator cache.
+        """
+        if cycle not in MULTIGRID_CYCLES:
+            raise ValueError(f"Unknown multigrid cycle '{cycle}', expected one of {tuple(MULTIGRID_CYCLES)}")
+
+        if cache_key is not None:
+            levels = OPERATOR_CACHE.get_or_create(
+                ("multigrid", self.coarsest_size) + tuple(cache_key), lambda: self.build_hierarchy(A, shape)
+            )
+        else:
+            levels = self.build_hierarchy(A, shape)
+        gamma = MULTIGRID_CYCLES[cycle]
+        b_norm = np.linalg.norm(b) or 1.0
+
+        x = np.zeros_like(b, dtype=float)
+        history = [float(np.linalg.norm(b - levels[0]["A"] @ x) / b_norm)]
+        factors: List[float] = []
+        while history[-1] > tolerance and len(factors) < max_cycles:
+            x = self._cycle(levels, 0, x, b, gamma, pre_smooth, post_smooth)
+            history.append(float(np.linalg.norm(b - levels[0]["A"] @ x) / b_norm))
+            factors.append(history[-1] / history[-2] if history[-2] > 0 else 0.0)
+
+        return x, {
+            "solver": "multigrid",
+            "cycle": cycle,
+            "levels": len(levels),
+            "level_sizes": [level["A"].shape[0] for level in levels],
+            "iterations": len(factors),
+            "converged": history[-1] <= tolerance,
+            "residual_history": history,
+            "convergence_factors": factors,
+            "average_convergence_factor": float(np.exp(np.mean(np.log(np.maximum(factors, 1e-300)))))
+            if factors else 0.0,
+            "final_residual": history[-1]
+        }
+
+    def build_hierarchy(self, A: csr_matrix, shape: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Build the grid hierarchy by halving every coarsenable axis, with linear-interpolation
+        prolongation and Galerkin coarse operators P^T A P
+        """
+        shape = tuple(int(n) for n in shape)
+        if int(np.prod(shape)) != A.shape[0]:
+            raise ValueError(f"Grid shape {shape} does not match a system of size {A.shape[0]}")
+
+        A = csr_matrix(A)
+        levels = []
+        while True:
+            level = {"A": A, "shape": shape, "smoother": self._jacobi_weights(A, len(shape))}
+            levels.append(level)
+
+            coarse_shape = tuple(n // 2 if n > 2 else n for n in shape)
+            if A.shape[0] <= self.coarsest_size or coarse_shape == shape:
+                level["lu"] = splu(csc_matrix(A), permc_spec="MMD_AT_PLUS_A")
+                return levels
+
+            P = self._prolongation(shape, coarse_shape)
+            level["P"] = P
+            A = (P.T @ A @ P).tocsr()
+            shape = coarse_shape
+
+    def _cycle(self, levels: List[Dict[str, Any]], l: int, x: np.ndarray, b: np.ndarray,
+               gamma: int, pre_smooth: int, post_smooth: int) -> np.ndarray:
+        """
+        One multigrid cycle on level l; gamma=1 gives a V-cycle, gamma=2 a W-cycle
+        """
+        level = levels[l]
+        if "lu" in level:
+            return level["lu"].solve(b)
+
+        A, P, weights = level["A"], level["P"], level["smoother"]
+        for _ in range(pre_smooth):
+            x = x + weights * (b - A @ x)
+
+        coarse_b = P.T @ (b - A @ x)
+        coarse_x = np.zeros_like(coarse_b)
+        for _ in range(gamma):
+            coarse_x = self._cycle(levels, l + 1, coarse_x, coarse_b, gamma, pre_smooth, post_smooth)
+        x = x + P @ coarse_x
+
+        for _ in range(post_smooth):
+            x = x + weights * (b - A @ x)
+        return x
+
+    def _jacobi_weights(self, A: csr_matrix, ndim: int) -> np.ndarray:
+        """
+        Damped Jacobi smoother weights omega / diag(A), with the damping that best smooths
+        high frequencies of the 2D and 3D Laplacian
+        """
+        omega = 4.0 / 5.0 if ndim == 2 else 6.0 / 7.0
+        return omega / A.diagonal()
+
+    def _prolongation(self, fine_shape: Tuple[int, ...], coarse_shape: Tuple[int, ...]) -> csr_matrix:
+        """
+        Tensor-product linear interpolation from the coarse to the fine interior grid
+        """
+        P = None
+        for n_fine, n_coarse in zip(fine_shape, coarse_shape):
+            P_axis = self._prolongation_1d(n_fine) if n_coarse < n_fine else identity(n_fine, format="csr")
+            P = P_axis if P is None else kron(P, P_axis, format="csr")
+        return P
+
+    def _prolongation_1d(self, n_fine: int) -> csr_matrix:
+        """
+        1D linear interpolation onto n_fine interior nodes from the n_fine // 2 coarse nodes
+        sitting at the odd fine indices; boundary neighbours contribute zero
+        """
+        n_coarse = n_fine // 2
+        i = np.arange(n_fine)
+        odd = i % 2 == 1
+
+        # Odd fine nodes coincide with a coarse node, even ones average their two neighbours
+        rows = [i[odd]]
+        cols = [(i[odd] - 1) // 2]
+        vals = [np.ones(odd.sum())]
+        even = i[~odd]
+        left, right = even // 2 - 1, even // 2
+        keep_left, keep_right = left >= 0, right < n_coarse
+        rows += [even[keep_left], even[keep_right]]
+        cols += [left[keep_left], right[keep_right]]
+        vals += [np.full(keep_left.sum(), 0.5), np.full(keep_right.sum(), 0.5)]
+
+        return csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n_fine, n_coarse)
+        )
@@ -0,0 +1,134 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from scipy.sparse import csc_matrix, issparse
+from scipy.sparse.linalg import splu
+from typing import Any, Callable, Dict, Hashable
+
+try:
+    from sksparse.cholmod import cholesky
+except ImportError:  # CHOLMOD is optional, SuperLU is always available
+    cholesky = None
+
+DEFAULT_MAX_BYTES = int(os.environ.get("OPERATOR_CACHE_MAX_MB", "512")) * 1024**2
+
+class CholeskyFactor:
+    """
+    CHOLMOD factor exposed through the same solve() interface as SuperLU
+    """
+    __slots__ = ("factor", "nbytes")
+
+    def __init__(self, A: csc_matrix):
+        self.factor = cholesky(A)
+        L = self.factor.L()
+        self.nbytes = L.data.nbytes + L.indices.nbytes + L.indptr.nbytes
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        return self.factor(b)
+
+class OperatorCacheService:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, building it with factory on a miss.
+        Least recently used entries are evicted once the cache exceeds max_bytes.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+
+        # Build outside the lock so a long factorization does not block other lookups
+        value = factory()
+        size = self._nbytes(value)
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = value
+                self._sizes[key] = size
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    old_key, _ = self._entries.popitem(last=False)
+                    self._bytes -= self._sizes.pop(old_key)
+                    self.evictions += 1
+        return value
+
+    def get_factorization(self, key: Hashable, A: csc_matrix, symmetric: bool = True) -> Any:
+        """
+        Return a cached sparse factorization of A with a solve() method.
+        Symmetric positive definite double-precision matrices use CHOLMOD when installed,
+        everything else (including single precision) uses SuperLU.
+        """
+        return self.get_or_create(("factorization",) + tuple(key), lambda: self.factorize(A, symmetric))
+
+    def factorize(self, A: csc_matrix, symmetric: bool = True) -> Any:
+        """
+        Factorize A without caching
+        """
+        A = csc_matrix(A)
+        if symmetric and cholesky is not None and A.dtype == np.float64:
+            return CholeskyFactor(A)
+        if symmetric:
+            # Symmetric mode pivots on the diagonal, keeping the fill-reducing ordering intact
+            return splu(A, permc_spec="MMD_AT_PLUS_A", options={"SymmetricMode": True})
+        return splu(A, permc_spec="COLAMD")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Hit/miss counters and current memory use
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def clear(self):
+        """
+        Drop all cached operators and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _nbytes(self, value: Any) -> int:
+        """
+        Approximate memory held by a cached matrix, factorization or array
+        """
+        if issparse(value):
+            value = value.tocsr()
+            return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(getattr(value, "nbytes", None), int):
+            # Cholesky factors and cached solver systems report their own size
+            return value.nbytes
+        if hasattr(value, "L") and hasattr(value, "U"):
+            # SuperLU: values plus row indices of both factors, plus the permutations
+            return (value.L.nnz + value.U.nnz) * 12 + 2 * value.shape[0] * 4
+        if isinstance(value, dict):
+            return sum(self._nbytes(item) for item in value.values())
+        if isinstance(value, (tuple, list)):
+            return sum(self._nbytes(item) for item in value)
+        return 0
+
+# Process-wide cache shared by every solver instance
+OPERATOR_CACHE = OperatorCacheService()
@@ -0,0 +1,235 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+# Elements per reduction task: small enough for a chunk to stay in cache while all its
+# statistics are taken, so the data streams from memory once
+CHUNK_ITEMS = 1 << 18
+
+# Points kept by the quantile sketch, whatever the field size (fields no longer than this are exact)
+SKETCH_SIZE = 8192
+
+# Histogram bins per refinement pass of the bounded-memory exact selection
+QUANTILE_BINS = 4096
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+class RunningStatistics:
+    """
+    Count, mean, variance, extremes with their indices, and a quantile sketch of a field,
+    built chunk by chunk. Chunk summaries merge in any grouping (means and squared deviations
+    with Chan's pairwise formula), so chunks can be reduced in parallel or as they are parsed.
+    The sketch is a sorted sample with the number of values each point stands for; merging
+    two sketches resamples the union back to SKETCH_SIZE points at evenly spaced ranks, so
+    its size stays fixed however many chunks are folded in.
+    """
+    __slots__ = ("count", "mean", "m2", "min", "max", "argmin", "argmax", "samples", "weights")
+
+    def __init__(self):
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max, self.argmin, self.argmax = np.inf, -np.inf, -1, -1
+        self.samples, self.weights = np.zeros(0), np.zeros(0)
+
+    @classmethod
+    def of(cls, values: np.ndarray, start: int = 0) -> "RunningStatistics":
+        """
+        Summary of one chunk whose first element has index start in the field
+        """
+        stats = cls()
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return stats
+        i, j = int(np.argmin(values)), int(np.argmax(values))
+        stats.min, stats.argmin = float(values[i]), start + i
+        stats.max, stats.argmax = float(values[j]), start + j
+
+        # Shifted sums give mean and squared deviations without a second pass over the chunk
+        shifted = values - values[0]
+        total = float(shifted.sum())
+        stats.count = len(values)
+        stats.mean = float(values[0]) + total / stats.count
+        stats.m2 = max(float(np.dot(shifted, shifted)) - total * total / stats.count, 0.0)
+
+        stride = -(-len(values) // SKETCH_SIZE)
+        stats.samples = np.sort(values[stride // 2::stride])
+        stats.weights = np.full(len(stats.samples), len(values) / len(stats.samples))
+        return stats
+
+    def update(self, values: np.ndarray, start: int):
+        """
+        Merge values, whose first element has index start in the field
+        """
+        self.merge(RunningStatistics.of(values, start))
+
+    def merge(self, other: "RunningStatistics"):
+        """
+        Fold another summary into this one; on ties the earlier index wins when other
+        covers later elements
+        """
+        if not other.count:
+            return
+        if other.min < self.min:
+            self.min, self.argmin = other.min, other.argmin
+        if other.max > self.max:
+            self.max, self.argmax = other.max, other.argmax
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+        samples = np.concatenate([self.samples, other.samples])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(samples, kind="stable")
+        self.samples, self.weights = samples[order], weights[order]
+        if len(self.samples) > SKETCH_SIZE:
+            # Resample at SKETCH_SIZE evenly spaced ranks, each point standing for count / SKETCH_SIZE values
+            weight = total / SKETCH_SIZE
+            targets = (np.arange(SKETCH_SIZE) + 0.5) * weight - 0.5
+            self.samples = np.interp(targets, self._ranks(), self.samples)
+            self.weights = np.full(SKETCH_SIZE, weight)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-ready summary, e.g. for the mesh cache metadata
+        """
+        return {
+            "count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max,
+            "argmin": self.argmin, "argmax": self.argmax,
+            "samples": self.samples.tolist(), "weights": self.weights.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStatistics":
+        stats = cls()
+        for name in ("count", "mean", "m2", "min", "max", "argmin", "argmax"):
+            setattr(stats, name, data[name])
+        stats.samples, stats.weights = np.asarray(data["samples"], dtype=np.float64), np.asarray(data["weights"], dtype=np.float64)
+        return stats
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.count)) if self.count else float("nan")
+
+    def _ranks(self) -> np.ndarray:
+        """
+        0-based rank of the middle value each sketch point stands for
+        """
+        return np.cumsum(self.weights) - self.weights + (self.weights - 1) / 2
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s) from the sketch, interpolated like np.quantile's default
+        linear method (exact while the sketch holds every value)
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        result = np.interp(np.asarray(q) * (self.count - 1), self._ranks(), self.samples)
+        return result if np.ndim(q) else float(result)
+
+class StatisticsService:
+    """
+    Fused summary statistics of large fields: one pass over chunks reduced on a thread pool
+    (NumPy releases the GIL inside its reductions) yields min, max, their indices, mean,
+    standard deviation and approximate quantiles. An exact median costs extra passes and
+    is computed only on request, with memory bounded by the chunk size.
+    """
+
+    def __init__(self, chunk_items: int = CHUNK_ITEMS, max_workers: Optional[int] = None):
+        self.chunk_items = chunk_items
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def reduce(self, values: np.ndarray) -> RunningStatistics:
+        """
+        RunningStatistics of the flattened values, chunked across the thread pool when the
+        array spans more than one chunk
+        """
+        values = np.asarray(values).reshape(-1)
+        starts = range(0, len(values), self.chunk_items)
+        summarize = lambda start: RunningStatistics.of(values[start:start + self.chunk_items], start)
+        stats = RunningStatistics()
+        if len(starts) <= 1 or self.max_workers <= 1:
+            for start in starts:
+                stats.merge(summarize(start))
+            return stats
+
+        # Chunks are handed out a few rounds of workers at a time so at most that many
+        # chunk summaries wait to be merged, in index order so ties resolve to the first
+        # occurrence like np.argmax
+        workers = min(self.max_workers, len(starts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for first in range(0, len(starts), 4 * workers):
+                for part in executor.map(summarize, starts[first:first + 4 * workers]):
+                    stats.merge(part)
+        return stats
+
+    def summarize(self, values: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                  exact_median: bool = False, stats: Optional[RunningStatistics] = None) -> Dict[str, Any]:
+        """
+        Summary statistics of a field as plain floats. The median is the sketch's estimate
+        unless exact_median is set; stats may carry a summary already gathered (e.g. while
+        the field was parsed) so only the exact median reads the values again.
+        """
+        stats = stats or self.reduce(values)
+        estimates = stats.quantile(list(quantiles) + [0.5])
+        return {
+            "count": stats.count,
+            "min": stats.min,
+            "max": stats.max,
+            "argmin": stats.argmin,
+            "argmax": stats.argmax,
+            "mean": stats.mean,
+            "median": self.median(values) if exact_median else float(estimates[-1]),
+            "std_dev": stats.std,
+            "quantiles": {str(q): float(value) for q, value in zip(quantiles, estimates)}
+        }
+
+    def median(self, values: np.ndarray) -> float:
+        """
+        Exact median with memory bounded by chunk_items
+        """
+        values = np.asarray(values).reshape(-1)
+        n = len(values)
+        if n == 0:
+            return float("nan")
+        if n <= self.chunk_items:
+            return float(np.median(values))
+        low, high = np.inf, -np.inf
+        for start in range(0, n, self.chunk_items):
+            chunk = np.asarray(values[start:start + self.chunk_items], dtype=np.float64)
+            low, high = min(low, float(chunk.min())), max(high, float(chunk.max()))
+        ranks = sorted({(n - 1) // 2, n // 2})
+        return float(np.mean([self.select(values, rank, low, high) for rank in ranks]))
+
+    def select(self, values: np.ndarray, rank: int, low: float, high: float) -> float:
+        """
+        Value of the given rank (0-based, in sorted order) among values within [low, high].
+        Each pass histograms the current range and narrows it to the bin holding the rank;
+        once that bin fits in one chunk its values are gathered and partitioned.
+        """
+        below, inclusive = 0, True  # values under low, and whether high itself is in range
+        for _ in range(64):
+            if low == high:
+                return low
+            edges = np.linspace(low, high, QUANTILE_BINS + 1)
+            counts = np.zeros(QUANTILE_BINS, dtype=np.int64)
+            for start in range(0, len(values), self.chunk_items):
+                chunk = np.asarray(values[start:start + self.chunk_items], dtype=np.float64)
+                inside = chunk[(chunk >= low) & ((chunk <= high) if inclusive else (chunk < high))]
+                bins = np.clip(np.searchsorted(edges, inside, side="right") - 1, 0, QUANTILE_BINS - 1)
+                counts += np.bincount(bins, minlength=QUANTILE_BINS)
+
+            cumulative = below + np.cumsum(counts)
+            b = int(np.searchsorted(cumulative, rank, side="right"))
+            below = int(cumulative[b] - counts[b])
+            low, high, inclusive = float(edges[b]), float(edges[b + 1]), inclusive and b == QUANTILE_BINS - 1
+            if counts[b] <= self.chunk_items:
+                candidates = np.concatenate([
+                    chunk[(chunk >= low) & ((chunk <= high) if inclusive else (chunk < high))]
+                    for chunk in (np.asarray(values[start:start + self.chunk_items], dtype=np.float64)
+                                  for start in range(0, len(values), self.chunk_items))
+                ])
+                return float(np.partition(candidates, rank - below)[rank - below])
+        return low
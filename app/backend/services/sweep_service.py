@@ -0,0 +1,125 @@
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from services.fast_poisson_service import FastPoissonService
+from services.finite_difference_service import BOUNDARY_EDGES, FiniteDifferenceService
+
+SWEEP_ENGINES = ("finite_difference", "fenics")
+
+# One row per solver run: the swept parameters followed by the solution summary
+SWEEP_DTYPE = np.dtype([
+    ("nx", np.int32), ("ny", np.int32), ("diffusivity", np.float64), ("source", np.float64),
+    ("left", np.float64), ("right", np.float64), ("bottom", np.float64), ("top", np.float64),
+    ("max_temperature", np.float64), ("max_x", np.float64), ("max_y", np.float64),
+    ("min_temperature", np.float64), ("mean_temperature", np.float64), ("runtime", np.float64)
+])
+
+class SweepService:
+    def run(self, grid_sizes: Sequence[Union[int, Tuple[int, int]]] = (50,),
+            diffusivities: Sequence[float] = (1.0,), sources: Sequence[float] = (1.0,),
+            boundary_values: Sequence[Optional[Dict[str, float]]] = (None,),
+            engine: str = "finite_difference", max_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Solve the steady heat equation -k laplacian(T) = source on the unit square for every
+        combination of the given parameter ranges, fanning the runs out over a process pool
+        sized to the machine's cores. Returns a structured array with one row per run.
+        """
+        if engine not in SWEEP_ENGINES:
+            raise ValueError(f"Unknown sweep engine '{engine}', expected one of {SWEEP_ENGINES}")
+
+        cases = [
+            (engine, self._grid_shape(size), float(k), float(f), edges)
+            for size, k, f, edges in itertools.product(grid_sizes, diffusivities, sources, boundary_values)
+        ]
+        if any(k <= 0 for _, _, k, _, _ in cases):
+            raise ValueError("Diffusivity must be positive")
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(cases))
+        if max_workers <= 1:
+            rows = [run_sweep_case(case) for case in cases]
+        else:
+            # Several cases per task keeps the inter-process overhead small for cheap solves
+            chunksize = max(1, len(cases) // (max_workers * 4))
+            # Spawned workers avoid forking a process that may be running server threads
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                rows = list(executor.map(run_sweep_case, cases, chunksize=chunksize))
+
+        return np.array(rows, dtype=SWEEP_DTYPE)
+
+    def to_json(self, table: np.ndarray) -> Dict[str, List]:
+        """
+        Convert a sweep table into column names plus row lists for the API
+        """
+        return {"columns": list(table.dtype.names), "rows": [list(row) for row in table.tolist()]}
+
+    def _grid_shape(self, size: Union[int, Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Accept either n (for an n x n grid) or an (nx, ny) pair
+        """
+        if np.ndim(size) == 0:
+            return int(size), int(size)
+        nx, ny = size
+        return int(nx), int(ny)
+
+def run_sweep_case(case: Tuple[str, Tuple[int, int], float, float, Optional[Dict[str, float]]]) -> Tuple:
+    """
+    Solve one sweep case and return its table row. Module level so worker processes can unpickle it.
+    """
+    engine, (nx, ny), k, f, edges = case
+    edges = FiniteDifferenceService().normalize_boundary_values(edges)
+
+    start = time.perf_counter()
+    if engine == "fenics":
+        x, y, u = _solve_fenics_case(nx, ny, k, f, edges)
+    else:
+        x, y, u = _solve_finite_difference_case(nx, ny, k, f, edges)
+    runtime = time.perf_counter() - start
+
+    i_max = int(np.argmax(u))
+    return (
+        nx, ny, k, f, *(edges[edge] for edge in BOUNDARY_EDGES),
+        float(u[i_max]), float(x[i_max]), float(y[i_max]),
+        float(u.min()), float(u.mean()), runtime
+    )
+
+def _solve_finite_difference_case(nx: int, ny: int, k: float, f: float,
+                                  edges: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finite-difference solve with the fast sine-transform solver; returns flat x, y and T
+    """
+    fd_service = FiniteDifferenceService()
+    x, y, dx, dy = fd_service.create_grid(nx, ny)
+    b = fd_service.assemble_rhs(nx, ny, dx, dy, source=f / k, boundary_values=edges)
+    u = FastPoissonService().solve(b.reshape(ny - 2, nx - 2), (dy, dx))
+    X, Y = np.meshgrid(x, y)
+    return X.ravel(), Y.ravel(), fd_service.embed_interior(u, nx, ny, edges).ravel()
+
+def _solve_fenics_case(nx: int, ny: int, k: float, f: float,
+                       edges: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    P1 finite-element solve on a unit-square mesh with nx x ny vertices; returns flat x, y and T
+    """
+    import dolfin as df  # imported in the worker so the finite-difference path does not need FEniCS
+
+    mesh = df.UnitSquareMesh(nx - 1, ny - 1)
+    V = df.FunctionSpace(mesh, "P", 1)
+    sides = {
+        "left": "near(x[0], 0.0)", "right": "near(x[0], 1.0)",
+        "bottom": "near(x[1], 0.0)", "top": "near(x[1], 1.0)"
+    }
+    bcs = [df.DirichletBC(V, df.Constant(edges[edge]), sides[edge]) for edge in ("bottom", "top", "left", "right")]
+
+    u = df.TrialFunction(V)
+    v = df.TestFunction(V)
+    a = df.Constant(k)*df.dot(df.grad(u), df.grad(v))*df.dx
+    L = df.Constant(f)*v*df.dx
+    T = df.Function(V)
+    df.solve(a == L, T, bcs)
+
+    coordinates = V.tabulate_dof_coordinates()
+    return coordinates[:, 0], coordinates[:, 1], T.vector().get_local()
@@ -0,0 +1,175 @@
+from contextlib import ExitStack
+import numpy as np
+from scipy.sparse import csc_matrix, identity
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from services.domain_decomposition_service import DomainDecompositionService, SchwarzPreconditioner
+from services.linear_solver_service import LinearSolverService
+from services.operator_cache_service import OPERATOR_CACHE
+
+TIME_SCHEMES = ("explicit", "implicit_euler", "crank_nicolson")
+STEP_SOLVERS = ("direct", "domain_decomposition")
+
+class TransientHeatService:
+    def integrate(self, A: csc_matrix, u0: np.ndarray, dt: float, n_steps: Optional[int] = None,
+                  scheme: str = "crank_nicolson", alpha: float = 1.0,
+                  forcing: Optional[np.ndarray] = None,
+                  snapshot_every: int = 10,
+                  cache_key: Optional[Tuple] = None, step_solver: str = "direct",
+                  subdomains: Optional[int] = None,
+                  t_end: Optional[float] = None, coordinates: Optional[np.ndarray] = None,
+                  solver_tolerance: float = 1e-10, max_iterations: int = 1000) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """
+        Integrate du/dt = alpha * (forcing - A u) from u0 and yield (step, time, u)
+        every snapshot_every steps, always including the initial and final state.
+        Either n_steps steps of dt are taken, or steps of dt up to t_end with the last one
+        shortened to end exactly at t_end when dt does not divide it.
+        Implicit schemes factorize their system matrix once and reuse it for every step,
+        and only the current state is kept in memory. With a cache_key identifying A the
+        factorization is also reused across runs through the operator cache.
+        step_solver="domain_decomposition" instead solves each implicit step with Schwarz-
+        preconditioned CG to solver_tolerance within max_iterations, warm-started from the
+        current state and keeping the subdomain workers alive for the whole run; coordinates
+        of the unknowns, when given, split the domain into slabs along its longest extent.
+        """
+        if scheme not in TIME_SCHEMES:
+            raise ValueError(f"Unknown time scheme '{scheme}', expected one of {TIME_SCHEMES}")
+        if step_solver not in STEP_SOLVERS:
+            raise ValueError(f"Unknown step solver '{step_solver}', expected one of {STEP_SOLVERS}")
+        if (n_steps is None) == (t_end is None):
+            raise ValueError("Pass exactly one of n_steps and t_end")
+        if dt <= 0 or (n_steps is not None and n_steps < 0) or (t_end is not None and t_end < 0) or snapshot_every < 1:
+            raise ValueError("dt must be positive, n_steps and t_end non-negative and snapshot_every at least 1")
+        last_dt = None
+        if t_end is not None:
+            # Full steps that fit (allowing for round-off in t_end / dt), then a short remainder
+            n_steps = int(np.floor(t_end / dt + 1e-9))
+            if t_end - n_steps * dt > 1e-9 * dt:
+                last_dt = t_end - n_steps * dt
+                n_steps += 1
+
+        A = csc_matrix(A)
+        u = np.array(u0, dtype=float)
+        f = np.zeros_like(u) if forcing is None else np.asarray(forcing, dtype=float)
+        with ExitStack() as resources:
+            solver_options = {"subdomains": subdomains, "coordinates": coordinates,
+                              "tolerance": solver_tolerance, "max_iterations": max_iterations}
+            step = self._make_stepper(A, dt, scheme, alpha, f, cache_key, step_solver, resources, **solver_options)
+
+            yield 0, 0.0, u.copy()
+            for n in range(1, n_steps + 1):
+                if n == n_steps and last_dt is not None:
+                    step = self._make_stepper(A, last_dt, scheme, alpha, f, None, step_solver, resources, **solver_options)
+                u = step(u)
+                if n % snapshot_every == 0 or n == n_steps:
+                    yield n, t_end if n == n_steps and t_end is not None else n * dt, u.copy()
+
+    def integrate_adaptive(self, A: csc_matrix, u0: np.ndarray, t_end: float, dt: float,
+                           alpha: float = 1.0, forcing: Optional[np.ndarray] = None,
+                           tolerance: float = 1e-3, steady_tolerance: Optional[float] = 1e-6,
+                           snapshot_every: int = 10, cache_key: Optional[Tuple] = None,
+                           history: Optional[List[Dict[str, Any]]] = None) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """
+        Integrate du/dt = alpha * (forcing - A u) from u0 up to t_end with error-controlled
+        time steps, yielding (step, time, u) every snapshot_every accepted steps plus the
+        initial and final state. Each step takes Crank-Nicolson and implicit Euler from the
+        same state; their difference estimates the local error, the Crank-Nicolson result is
+        kept, and dt grows or shrinks to hold the error near tolerance (relative to 1 + |u|).
+        Step sizes stay on dt * 2**k so the per-size factorizations are reused from the cache.
+        Integration stops early once the relative rate of change falls below steady_tolerance.
+        Every attempted step is appended to history as {"t", "dt", "error", "accepted"}.
+        """
+        if dt <= 0 or t_end < 0 or tolerance <= 0 or snapshot_every < 1:
+            raise ValueError("dt and tolerance must be positive, t_end non-negative and snapshot_every at least 1")
+
+        A = csc_matrix(A)
+        u = np.array(u0, dtype=float)
+        f = np.zeros_like(u) if forcing is None else np.asarray(forcing, dtype=float)
+        steppers: Dict[Tuple[str, float], Any] = {}
+
+        def stepper(scheme: str, h: float):
+            if (scheme, h) not in steppers:
+                steppers[scheme, h] = self._make_stepper(A, h, scheme, alpha, f, cache_key)
+            return steppers[scheme, h]
+
+        t, step, level = 0.0, 0, 0
+        yield 0, 0.0, u.copy()
+        while t < t_end:
+            # Take the last step short rather than overshooting t_end
+            h = min(dt * 2.0**level, t_end - t)
+            if h <= dt * 2.0**-30:
+                raise ValueError(f"Adaptive time step fell below {h:g} at t = {t:g}; loosen the tolerance")
+            u_cn = stepper("crank_nicolson", h)(u)
+            u_be = stepper("implicit_euler", h)(u)
+            error = float(np.max(np.abs(u_cn - u_be) / (tolerance * (1.0 + np.abs(u_cn)))))
+            accepted = error <= 1.0
+            if history is not None:
+                history.append({"t": t, "dt": h, "error": error, "accepted": accepted})
+
+            # The implicit Euler error is second order per step, hence the square root
+            factor = 0.9 / np.sqrt(error) if error > 0 else 4.0
+            if not accepted:
+                level -= max(1, int(np.ceil(-np.log2(factor))))
+                continue
+
+            change = float(np.max(np.abs(u_cn - u))) / (h * (1.0 + float(np.max(np.abs(u_cn)))))
+            t, step, u = t + h, step + 1, u_cn
+            steady = steady_tolerance is not None and change <= steady_tolerance
+            if step % snapshot_every == 0 or t >= t_end or steady:
+                yield step, t, u.copy()
+            if steady:
+                break
+            level += int(np.clip(np.floor(np.log2(factor)), -2, 2))
+
+    def stable_explicit_dt(self, A: csc_matrix, alpha: float = 1.0) -> float:
+        """
+        Largest stable forward Euler step, using the Gershgorin bound on the spectrum of A
+        """
+        A = csc_matrix(A)
+        row_sums = np.asarray(abs(A).sum(axis=1)).ravel()
+        return 2.0 / (alpha * float(row_sums.max()))
+
+    def _make_stepper(self, A: csc_matrix, dt: float, scheme: str, alpha: float, f: np.ndarray,
+                      cache_key: Optional[Tuple] = None, step_solver: str = "direct",
+                      resources: Optional[ExitStack] = None, subdomains: Optional[int] = None,
+                      coordinates: Optional[np.ndarray] = None, tolerance: float = 1e-10,
+                      max_iterations: int = 1000):
+        """
+        Build the single-step update for the requested scheme. Long-lived solver resources
+        (domain-decomposition workers) are registered on `resources` and released with it.
+        """
+        if scheme == "explicit":
+            dt_max = self.stable_explicit_dt(A, alpha)
+            if dt > dt_max:
+                raise ValueError(f"Explicit time step {dt:g} exceeds the stability limit {dt_max:g}")
+            return lambda u: u + dt * alpha * (f - A @ u)
+
+        I = identity(A.shape[0], format="csc")
+        theta = 1.0 if scheme == "implicit_euler" else 0.5
+        M = csc_matrix(I + theta * dt * alpha * A)
+        if step_solver == "domain_decomposition":
+            # Schwarz-preconditioned CG started from the previous state; the workers factorize
+            # their subdomains once
+            M = M.tocsr()
+            parts = DomainDecompositionService().partition(M, subdomains, coordinates=coordinates)
+            preconditioner = resources.enter_context(SchwarzPreconditioner(M, parts)).as_linear_operator()
+            cg = LinearSolverService().preconditioned_cg
+
+            def solve(b: np.ndarray, u: np.ndarray) -> np.ndarray:
+                x, info = cg(M, b, preconditioner, tolerance=tolerance, max_iterations=max_iterations,
+                             history=[], x0=u)
+                if info != 0:
+                    raise ValueError(f"Time step solve did not reach tolerance {tolerance:g} in {max_iterations} iterations")
+                return x
+        else:
+            if cache_key is not None:
+                lu = OPERATOR_CACHE.get_factorization(tuple(cache_key) + (scheme, dt, alpha), M)
+            else:
+                lu = OPERATOR_CACHE.factorize(M)
+            solve = lambda b, u: lu.solve(b)
+        load = dt * alpha * f
+
+        if theta == 1.0:
+            return lambda u: solve(u + load, u)
+
+        rhs = csc_matrix(I - (1.0 - theta) * dt * alpha * A)
+        return lambda u: solve(rhs @ u + load, u)
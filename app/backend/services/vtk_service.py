@@ -1,126 +1,217 @@
+import os
+import re
+import tempfile
 import vtk
 import numpy as np
-from typing import Dict, Any
+from vtk.util import numpy_support
+from typing import Dict, Any, Optional, Tuple
+from schemas.mesh_data import MeshData
+from services.mesh_cache_service import MESH_CACHE, MeshCacheService
+from services.vtk_stream_service import VTKStreamService
+
+# Reader for each dataset type named in a legacy "DATASET ..." line or an XML VTKFile type attribute.
+# Legacy readers handle ASCII and binary files; XML readers handle inline, appended and compressed data.
+LEGACY_READERS = {
+    "STRUCTURED_GRID": "vtkStructuredGridReader",
+    "UNSTRUCTURED_GRID": "vtkUnstructuredGridReader",
+    "POLYDATA": "vtkPolyDataReader",
+    "STRUCTURED_POINTS": "vtkStructuredPointsReader",
+    "RECTILINEAR_GRID": "vtkRectilinearGridReader"
+}
+XML_READERS = {
+    "StructuredGrid": "vtkXMLStructuredGridReader",
+    "UnstructuredGrid": "vtkXMLUnstructuredGridReader",
+    "PolyData": "vtkXMLPolyDataReader",
+    "ImageData": "vtkXMLImageDataReader",
+    "RectilinearGrid": "vtkXMLRectilinearGridReader"
+}
+
+# Bytes read to identify a file; legacy headers put the DATASET line within the first four lines
+SNIFF_BYTES = 4096
+
+# Cell arrays of polygonal data, in cell id order
+POLY_CELL_ARRAYS = ("Verts", "Lines", "Polys", "Strips")
+
+# ASCII legacy files from this size on are streamed into memory-mapped arrays instead of loaded by VTK
+STREAM_MIN_BYTES = int(os.environ.get("VTK_STREAM_MIN_MB", "256")) * 1024**2
 
 class VTKService:
-    def parse_vtk_file(self, file_path: str) -> Dict[str, Any]:
+    def __init__(self, cache: Optional[MeshCacheService] = MESH_CACHE):
+        self.cache = cache
+        self.stream_service = VTKStreamService()
+    
+    def parse_vtk_file(self, file_path: str) -> MeshData:
         """
-        Parse VTK file and extract mesh data, supporting both structured and unstructured grids
+        Parse a VTK file and extract mesh data. The file header picks the reader, so the file
+        is parsed once: legacy ASCII or binary files and XML .vtu/.vts/.vti/.vtp/.vtr files
+        holding unstructured, structured, rectilinear, image or polygonal data are supported.
+        The MeshData arrays are views of the reader's buffers; call to_dict() for JSON.
+        Parsed meshes are cached on disk by content hash, so a repeated upload is opened
+        memory-mapped from the cache instead of being parsed again. ASCII legacy files of
+        STREAM_MIN_BYTES or more are parsed in bounded chunks by VTKStreamService straight
+        into memory-mapped arrays, so memory use does not grow with the file size.
         """
-        # First try reading as structured grid
-        reader = vtk.vtkStructuredGridReader()
+        stream = os.path.getsize(file_path) >= STREAM_MIN_BYTES and self.stream_service.can_stream(file_path)
+        mesh_data = None
+        if self.cache is not None:
+            key = self.cache.digest(file_path)
+            mesh_data = self.cache.get(key)
+            if mesh_data is None and stream:
+                self.cache.store(key, lambda directory: self.stream_service.read(file_path, directory)[0])
+                mesh_data = self.cache.get(key)
+            elif mesh_data is None:
+                mesh_data = self._read(file_path)
+                self.cache.put(key, mesh_data)
+        
+        if mesh_data is None and stream:
+            # No cache (or it could not store the entry): stream into scratch files, which stay
+            # mapped after the directory is removed
+            with tempfile.TemporaryDirectory() as directory:
+                mesh_data = self.stream_service.read(file_path, directory)[0]
+        elif mesh_data is None:
+            mesh_data = self._read(file_path)
+        return mesh_data
+    
+    def _read(self, file_path: str) -> MeshData:
+        """
+        Parse the file with the reader matching its header
+        """
+        reader = self._reader_for(file_path)
         reader.SetFileName(file_path)
         reader.Update()
         
         grid = reader.GetOutput()
         if not grid or grid.GetNumberOfPoints() == 0:
-            # If not structured, try unstructured
-            reader = vtk.vtkUnstructuredGridReader()
-            reader.SetFileName(file_path)
-            reader.Update()
-            grid = reader.GetOutput()
+            raise ValueError(f"No points found in VTK file ({reader.GetClassName()})")
+        structured = isinstance(grid, (vtk.vtkStructuredGrid, vtk.vtkImageData, vtk.vtkRectilinearGrid))
         
-        if not grid or grid.GetNumberOfPoints() == 0:
-            raise ValueError("Could not read VTK file as either structured or unstructured grid")
+        # Point coordinates, connectivity and point data as NumPy views of the VTK buffers
+        coordinates = self._point_coordinates(grid)
+        offsets, cell_connectivity, cell_types = self._cell_arrays(grid)
         
-        # Extract point coordinates
-        points = grid.GetPoints()
-        num_points = points.GetNumberOfPoints()
-        coordinates = np.zeros((num_points, 3))
-        for i in range(num_points):
-            coordinates[i] = points.GetPoint(i)
-        
-        # Extract cells/connectivity
-        num_cells = grid.GetNumberOfCells()
-        connectivity = []
-        for i in range(num_cells):
-            cell = grid.GetCell(i)
-            cell_points = [cell.GetPointId(j) for j in range(cell.GetNumberOfPoints())]
-            connectivity.append(cell_points)
-        
-        # Extract any point data (temperature, etc.)
+        # Extract any point data (temperature, etc.); vector and tensor arrays are (n, components)
         point_data = {}
         pd = grid.GetPointData()
         for i in range(pd.GetNumberOfArrays()):
             array = pd.GetArray(i)
-            name = array.GetName()
-            data = np.array([array.GetValue(j) for j in range(array.GetNumberOfTuples())])
-            point_data[name] = data
+            if array is None:  # string and other non-numeric arrays
+                continue
+            name = array.GetName() or f"array_{i}"
+            point_data[name] = numpy_support.vtk_to_numpy(array)
         
         # Get grid dimensions if structured
-        dimensions = None
-        if isinstance(grid, vtk.vtkStructuredGrid):
-            dimensions = grid.GetDimensions()
-            dimensions = list(dimensions)  # Convert to list for JSON serialization
+        dimensions = list(grid.GetDimensions()) if structured else None
+        
+        return MeshData(coordinates, offsets, cell_connectivity, cell_types, point_data, dimensions, structured)
+
+    def _reader_for(self, file_path: str):
+        """
+        Pick the reader from the file header: the DATASET line of a legacy file or the
+        type attribute of an XML VTKFile element
+        """
+        with open(file_path, "rb") as file:
+            header = file.read(SNIFF_BYTES)
+        
+        if header.startswith(b"# vtk DataFile"):
+            match = re.search(rb"^DATASET\s+(\w+)", header, re.MULTILINE | re.IGNORECASE)
+            readers, kind = LEGACY_READERS, match.group(1).decode().upper() if match else None
+        elif b"<VTKFile" in header:
+            match = re.search(rb'<VTKFile[^>]*\btype="(\w+)"', header)
+            readers, kind = XML_READERS, match.group(1).decode() if match else None
+        else:
+            raise ValueError("Not a VTK file: expected a legacy '# vtk DataFile' header or an XML VTKFile")
         
-        # Create the mesh data dictionary with proper types
-        mesh_data = {
-            "coordinates": coordinates.tolist(),  # Convert numpy array to list
-            "connectivity": connectivity,
-            "point_data": {k: v.tolist() for k, v in point_data.items()},  # Convert numpy arrays to lists
-            "num_points": int(num_points),  # Ensure integer type
-            "num_cells": int(num_cells),  # Ensure integer type
-            "dimensions": dimensions,
-            "is_structured": isinstance(grid, vtk.vtkStructuredGrid)
-        }
+        if kind not in readers:
+            raise ValueError(f"Unsupported VTK dataset type '{kind}', expected one of {list(readers)}")
+        return getattr(vtk, readers[kind])()
+
+    def _point_coordinates(self, grid) -> np.ndarray:
+        """
+        (N, 3) point coordinates: a view of the point buffer for point sets, generated from
+        origin, spacing and extent for image data and from the axis coordinates for rectilinear grids
+        """
+        if isinstance(grid, vtk.vtkImageData):
+            # Point (i, j, k) lies at origin + spacing * index, with indices running over the
+            # extent, which need not start at zero
+            extent = grid.GetExtent()
+            axes = [origin + spacing * np.arange(extent[2 * axis], extent[2 * axis + 1] + 1)
+                    for axis, (origin, spacing) in enumerate(zip(grid.GetOrigin(), grid.GetSpacing()))]
+        elif isinstance(grid, vtk.vtkRectilinearGrid):
+            axes = [numpy_support.vtk_to_numpy(array).astype(float)
+                    for array in (grid.GetXCoordinates(), grid.GetYCoordinates(), grid.GetZCoordinates())]
+        else:
+            return numpy_support.vtk_to_numpy(grid.GetPoints().GetData())
         
-        return mesh_data 
+        # Points run with x fastest, then y, then z
+        Z, Y, X = np.meshgrid(axes[2], axes[1], axes[0], indexing="ij")
+        return np.column_stack([X.ravel(), Y.ravel(), Z.ravel()])
 
-    def compute_temperature_metrics(self, mesh_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _cell_arrays(self, grid) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        CSR-style cell arrays (offsets with num_cells + 1 entries, flat connectivity, VTK cell
+        types). Unstructured grids expose them directly as views of their cell array buffers;
+        structured, rectilinear and image data cells are generated from the dimensions.
+        """
+        if isinstance(grid, (vtk.vtkStructuredGrid, vtk.vtkImageData, vtk.vtkRectilinearGrid)):
+            return MeshData.structured_cells(grid.GetDimensions())
+        if isinstance(grid, vtk.vtkPolyData):
+            return self._poly_cells(grid)
+        
+        cells = grid.GetCells()
+        offsets = numpy_support.vtk_to_numpy(cells.GetOffsetsArray())
+        connectivity = numpy_support.vtk_to_numpy(cells.GetConnectivityArray())
+        cell_types = numpy_support.vtk_to_numpy(grid.GetCellTypesArray())
+        return offsets, connectivity, cell_types
+    
+    def _poly_cells(self, grid) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cells of polygonal data in VTK cell id order (vertices, lines, polygons, strips), joined
+        into one CSR layout. Cell types follow from the cell array and the nodes per cell.
+        """
+        offsets, connectivity, cell_types = [np.zeros(1, dtype=np.int64)], [], []
+        for name in POLY_CELL_ARRAYS:
+            cells = getattr(grid, f"Get{name}")()
+            if cells.GetNumberOfCells() == 0:
+                continue
+            local_offsets = numpy_support.vtk_to_numpy(cells.GetOffsetsArray())
+            sizes = np.diff(local_offsets)
+            if name == "Verts":
+                types = np.where(sizes == 1, 1, 2)  # vertex, poly-vertex
+            elif name == "Lines":
+                types = np.where(sizes == 2, 3, 4)  # line, polyline
+            elif name == "Polys":
+                types = np.select([sizes == 3, sizes == 4], [5, 9], 7)  # triangle, quad, polygon
+            else:
+                types = np.full(len(sizes), 6)  # triangle strip
+            offsets.append(local_offsets[1:] + offsets[-1][-1])
+            connectivity.append(numpy_support.vtk_to_numpy(cells.GetConnectivityArray()))
+            cell_types.append(types.astype(np.uint8))
+        
+        if not connectivity:
+            return offsets[0], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+        return np.concatenate(offsets), np.concatenate(connectivity), np.concatenate(cell_types)
+
+    def compute_temperature_metrics(self, mesh_data: MeshData, exact_median: bool = False) -> Dict[str, Any]:
         """
         Compute detailed temperature metrics from mesh data
-        Returns coordinates of maximum temperature and other relevant metrics
+        Returns coordinates of maximum temperature and other relevant metrics. The summary
+        statistics come from one fused, chunked pass (StatisticsService) with an approximate
+        median and quartiles; set exact_median for the exact median at the cost of extra passes.
         """
         try:
             # Get temperature data and coordinates
-            temperature_data = None
-            for key, data in mesh_data['point_data'].items():
+            temperature_key = None
+            for key in mesh_data.point_data:
                 if 'temp' in key.lower():  # Match any temperature-related field
-                    temperature_data = np.array(data)
+                    temperature_key = key
                     break
             
-            if temperature_data is None:
+            if temperature_key is None:
                 raise ValueError("No temperature data found in the mesh")
-                
-            coordinates = np.array(mesh_data['coordinates'])
-            
-            # Find maximum temperature location
-            max_temp_idx = np.argmax(temperature_data)
-            max_temp = float(temperature_data[max_temp_idx])
-            max_temp_coords = coordinates[max_temp_idx].tolist()
-            
-            # Compute basic statistical metrics
-            temp_stats = {
-                'min': float(np.min(temperature_data)),
-                'max': float(np.max(temperature_data)),
-                'mean': float(np.mean(temperature_data)),
-                'median': float(np.median(temperature_data)),
-                'std_dev': float(np.std(temperature_data))
-            }
-            
-            # Identify regions with high temperature gradients
-            if mesh_data['is_structured'] and mesh_data['dimensions']:
-                dims = mesh_data['dimensions']
-                shaped_temp = temperature_data.reshape(dims[2], dims[1], dims[0])
-                gradients = np.gradient(shaped_temp)
-                gradient_magnitude = np.sqrt(sum(g*g for g in gradients))
-                max_gradient_idx = np.unravel_index(np.argmax(gradient_magnitude), gradient_magnitude.shape)
-                max_gradient_value = float(gradient_magnitude[max_gradient_idx])
-            else:
-                max_gradient_value = None
-                max_gradient_idx = None
             
-            return {
-                'maximum_temperature': {
-                    'value': max_temp,
-                    'coordinates': max_temp_coords,
-                },
-                'temperature_statistics': temp_stats,
-                'gradient_info': {
-                    'max_gradient': max_gradient_value,
-                    'max_gradient_location': max_gradient_idx if max_gradient_idx is not None else None
-                }
-            }
+            # Statistics gathered while streaming the file are reused; otherwise one fused, chunked pass.
+            # The max gradient is taken over the axes with more than one point, in bounded slabs.
+            return self.stream_service.field_metrics(mesh_data, temperature_key, exact_median=exact_median)
             
         except Exception as e:
             raise ValueError(f"Error computing temperature metrics: {str(e)}") 
\ No newline at end of file
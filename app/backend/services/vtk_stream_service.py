@@ -0,0 +1,402 @@
+import os
+import re
+import numpy as np
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from schemas.mesh_data import MeshData
+from services.statistics_service import RunningStatistics, StatisticsService
+
+# Text read per step and array elements per gradient slab
+STREAM_CHUNK_BYTES = int(os.environ.get("VTK_STREAM_CHUNK_KB", "4096")) * 1024
+CHUNK_ITEMS = 1 << 20
+
+# Legacy datasets the streaming parser understands (polydata goes through the VTK readers)
+STREAMABLE_DATASETS = ("STRUCTURED_POINTS", "STRUCTURED_GRID", "RECTILINEAR_GRID", "UNSTRUCTURED_GRID")
+LEGACY_DTYPES = {
+    "bit": np.uint8, "char": np.int8, "unsigned_char": np.uint8, "short": np.int16,
+    "unsigned_short": np.uint16, "int": np.int32, "unsigned_int": np.uint32, "long": np.int64,
+    "unsigned_long": np.uint64, "vtktypeint32": np.int32, "vtktypeint64": np.int64,
+    "float": np.float32, "double": np.float64
+}
+ATTRIBUTE_COMPONENTS = {"VECTORS": 3, "NORMALS": 3, "TENSORS": 9}
+
+class _LineStream:
+    """
+    Buffered reader over an ASCII legacy VTK file handing out keyword lines and blocks of
+    numbers, holding about two chunks of text in memory at a time
+    """
+
+    def __init__(self, file, chunk_bytes: int):
+        self.file = file
+        self.chunk_bytes = chunk_bytes
+        self.buffer = b""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.file.read(self.chunk_bytes)
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        self.eof = not data
+
+    def line(self) -> Optional[str]:
+        """
+        Next raw line, or None at the end of the file
+        """
+        end = self.buffer.find(b"\n", self.pos)
+        while end < 0 and not self.eof:
+            self._fill()
+            end = self.buffer.find(b"\n", self.pos)
+        if end < 0:
+            if self.pos >= len(self.buffer):
+                return None
+            end = len(self.buffer)
+        line = self.buffer[self.pos:end]
+        self.pos = end + 1
+        return line.decode("latin-1").rstrip("\r")
+
+    def keyword(self) -> Optional[List[str]]:
+        """
+        Tokens of the next non-blank line, or None at the end of the file
+        """
+        while True:
+            line = self.line()
+            if line is None or line.strip():
+                return line.split() if line is not None else None
+
+    def numbers(self, count: int, out: Optional[np.ndarray] = None,
+                on_chunk: Optional[Callable[[np.ndarray, int], None]] = None):
+        """
+        Parse the next count numbers a chunk of whole lines at a time, writing them into the
+        flat array out and/or passing each chunk with its start index to on_chunk.
+        A data section has to end at a line break, as every VTK writer does.
+        """
+        integer = out is not None and out.dtype.kind in "iu"
+        filled = 0
+        while filled < count:
+            if len(self.buffer) - self.pos < self.chunk_bytes and not self.eof:
+                self._fill()
+            end = len(self.buffer) if self.eof else self.buffer.rfind(b"\n", self.pos)
+            if end < self.pos:
+                self._fill()  # a single line longer than the buffer
+                continue
+            chunk = self.buffer[self.pos:end]
+            tokens = chunk.split()
+            need = count - filled
+            if len(tokens) > need:
+                # The section ends inside this chunk: stop after the line holding its last number
+                lines = chunk.split(b"\n")
+                per_line = np.cumsum([len(line.split()) for line in lines])
+                k = int(np.searchsorted(per_line, need))
+                if per_line[k] != need:
+                    raise ValueError("Malformed legacy VTK file: a data section does not end at a line break")
+                end = self.pos + sum(len(line) + 1 for line in lines[:k + 1]) - 1
+                tokens = tokens[:need]
+            elif not tokens and self.eof:
+                raise ValueError(f"Unexpected end of file: expected {count} numbers, read {filled}")
+
+            if tokens:
+                values = np.array(tokens, dtype=np.int64 if integer else np.float64)
+                if out is not None:
+                    out[filled:filled + len(values)] = values
+                if on_chunk is not None:
+                    on_chunk(values, filled)
+                filled += len(values)
+            self.pos = min(end + 1, len(self.buffer))
+
+class VTKStreamService:
+    """
+    Streaming parser for ASCII legacy VTK files too large to load whole. Sections are parsed
+    in bounded chunks straight into memory-mapped .npy files (laid out like the mesh cache),
+    and running statistics of every scalar point field are updated as its values stream past.
+    """
+
+    def __init__(self, chunk_bytes: int = STREAM_CHUNK_BYTES, chunk_items: int = CHUNK_ITEMS):
+        self.chunk_bytes = chunk_bytes
+        self.chunk_items = chunk_items
+        self.statistics = StatisticsService()
+
+    def can_stream(self, file_path: str) -> bool:
+        """
+        Whether the file is an ASCII legacy VTK file of a dataset type this parser reads
+        """
+        with open(file_path, "rb") as file:
+            header = file.read(1024)
+        match = re.search(rb"^DATASET\s+(\w+)", header, re.MULTILINE | re.IGNORECASE)
+        return (header.startswith(b"# vtk DataFile") and re.search(rb"^ASCII\s*$", header, re.MULTILINE | re.IGNORECASE) is not None
+                and match is not None and match.group(1).decode().upper() in STREAMABLE_DATASETS)
+
+    def read(self, file_path: str, directory: str) -> Tuple[MeshData, Dict[str, RunningStatistics]]:
+        """
+        Parse file_path into memory-mapped arrays in directory and return the MeshData over
+        them together with the running statistics of each scalar point field (also kept on
+        MeshData.statistics, so they travel with the mesh into the cache)
+        """
+        directory = Path(directory)
+        arrays: Dict[str, np.ndarray] = {}
+        fields: Dict[str, np.ndarray] = {}
+        statistics: Dict[str, RunningStatistics] = {}
+        dims, origin, spacing, axes = None, (0.0, 0.0, 0.0), (1.0, 1.0, 1.0), {}
+        section, section_size = None, 0
+
+        def memmap(name: str, dtype, shape) -> np.ndarray:
+            return np.lib.format.open_memmap(directory / f"{name}.npy", mode="w+", dtype=dtype, shape=shape)
+
+        def read_field(name: str, dtype, components: int, tuples: int):
+            # Point fields go to field_<i>.npy; cell data is parsed and dropped
+            if section != "point" or tuples != section_size:
+                stream.numbers(components * tuples)
+                return
+            shape = (tuples,) if components == 1 else (tuples, components)
+            values = memmap(f"field_{len(fields)}", dtype, shape)
+            if components == 1:
+                statistics[name] = RunningStatistics()
+                stream.numbers(tuples, values, statistics[name].update)
+            else:
+                stream.numbers(components * tuples, values.reshape(-1))
+            fields[name] = values
+
+        with open(file_path, "rb") as file:
+            stream = _LineStream(file, self.chunk_bytes)
+            header = stream.line() or ""
+            if not header.startswith("# vtk DataFile"):
+                raise ValueError("Not a legacy VTK file")
+            version = float(re.search(r"Version\s+(\d+\.?\d*)", header).group(1))
+            stream.line()  # title
+            if (stream.keyword() or [""])[0].upper() != "ASCII":
+                raise ValueError("Only ASCII legacy VTK files can be streamed")
+            tokens = stream.keyword() or [""]
+            if tokens[0].upper() != "DATASET" or tokens[1].upper() not in STREAMABLE_DATASETS:
+                raise ValueError(f"Streaming supports the {STREAMABLE_DATASETS} datasets")
+            dataset = tokens[1].upper()
+
+            while True:
+                tokens = stream.keyword()
+                if tokens is None:
+                    break
+                keyword = tokens[0].upper()
+                if keyword == "DIMENSIONS":
+                    dims = [int(value) for value in tokens[1:4]]
+                elif keyword == "ORIGIN":
+                    origin = tuple(float(value) for value in tokens[1:4])
+                elif keyword in ("SPACING", "ASPECT_RATIO"):
+                    spacing = tuple(float(value) for value in tokens[1:4])
+                elif keyword == "POINTS":
+                    n = int(tokens[1])
+                    arrays["coordinates"] = memmap("coordinates", LEGACY_DTYPES[tokens[2].lower()], (n, 3))
+                    stream.numbers(3 * n, arrays["coordinates"].reshape(-1))
+                elif keyword in ("X_COORDINATES", "Y_COORDINATES", "Z_COORDINATES"):
+                    axes[keyword[0]] = np.empty(int(tokens[1]))
+                    stream.numbers(len(axes[keyword[0]]), axes[keyword[0]])
+                elif keyword == "CELLS":
+                    self._read_cells(stream, int(tokens[1]), int(tokens[2]), version, memmap, arrays)
+                elif keyword == "CELL_TYPES":
+                    arrays["cell_types"] = memmap("cell_types", np.uint8, (int(tokens[1]),))
+                    stream.numbers(int(tokens[1]), arrays["cell_types"])
+                elif keyword in ("POINT_DATA", "CELL_DATA"):
+                    section, section_size = keyword.split("_")[0].lower(), int(tokens[1])
+                elif keyword == "SCALARS":
+                    stream.keyword()  # LOOKUP_TABLE line
+                    components = int(tokens[3]) if len(tokens) > 3 else 1
+                    read_field(tokens[1], LEGACY_DTYPES[tokens[2].lower()], components, section_size)
+                elif keyword in ATTRIBUTE_COMPONENTS:
+                    read_field(tokens[1], LEGACY_DTYPES[tokens[2].lower()], ATTRIBUTE_COMPONENTS[keyword], section_size)
+                elif keyword == "TEXTURE_COORDINATES":
+                    read_field(tokens[1], LEGACY_DTYPES[tokens[3].lower()], int(tokens[2]), section_size)
+                elif keyword == "COLOR_SCALARS":
+                    read_field(tokens[1], np.float32, int(tokens[2]), section_size)
+                elif keyword == "LOOKUP_TABLE":
+                    stream.numbers(4 * int(tokens[2]))
+                elif keyword == "FIELD":
+                    for _ in range(int(tokens[2])):
+                        name, components, tuples, dtype = (stream.keyword() or [""])[:4]
+                        read_field(name, LEGACY_DTYPES[dtype.lower()], int(components), int(tuples))
+                elif keyword == "METADATA":
+                    while (stream.line() or "").strip():
+                        pass
+                else:
+                    raise ValueError(f"Unsupported legacy VTK keyword '{tokens[0]}'")
+
+        structured = dataset != "UNSTRUCTURED_GRID"
+        if structured:
+            if dims is None:
+                raise ValueError("Structured dataset without DIMENSIONS")
+            if "coordinates" not in arrays:
+                if dataset == "RECTILINEAR_GRID":
+                    grid_axes = [axes.get(axis, np.zeros(1)) for axis in "XYZ"]
+                else:
+                    grid_axes = [o + s * np.arange(n) for o, s, n in zip(origin, spacing, dims)]
+                arrays["coordinates"] = self._grid_points(grid_axes, memmap)
+            self._structured_cells(dims, memmap, arrays)
+        else:
+            arrays.setdefault("coordinates", np.zeros((0, 3)))
+            arrays.setdefault("offsets", np.zeros(1, dtype=np.int64))
+            arrays.setdefault("connectivity", np.zeros(0, dtype=np.int64))
+            arrays.setdefault("cell_types", np.zeros(0, dtype=np.uint8))
+
+        mesh_data = MeshData(arrays["coordinates"], arrays["offsets"], arrays["connectivity"], arrays["cell_types"],
+                             fields, dims if structured else None, structured, statistics)
+        return mesh_data, statistics
+
+    def temperature_metrics(self, file_path: str, directory: str, exact_median: bool = False) -> Dict[str, Any]:
+        """
+        Metrics of VTKService.compute_temperature_metrics for a file streamed into directory;
+        the summary statistics are gathered while parsing, so only the gradient (and an exact
+        median, if requested) reads the field again
+        """
+        mesh_data, _ = self.read(file_path, directory)
+        name = next((key for key in mesh_data.point_data if 'temp' in key.lower()), None)
+        if name is None:
+            raise ValueError("No temperature data found in the mesh")
+        return self.field_metrics(mesh_data, name, exact_median=exact_median)
+
+    def field_metrics(self, mesh_data: MeshData, name: str, stats: Optional[RunningStatistics] = None,
+                      exact_median: bool = False) -> Dict[str, Any]:
+        """
+        Temperature metrics of point field name and a slab-wise gradient, with memory bounded
+        by the chunk size for memory-mapped fields. The summary statistics come from stats,
+        else from those gathered while the mesh was streamed (MeshData.statistics), else
+        from one fused pass over the field.
+        """
+        values = mesh_data.point_data[name]
+        stats = stats or mesh_data.statistics.get(name)
+        summary = self.statistics.summarize(values, exact_median=exact_median, stats=stats)
+
+        if mesh_data.is_structured and mesh_data.dimensions:
+            max_gradient_value, max_gradient_idx = self.max_gradient(values, mesh_data.dimensions)
+        else:
+            max_gradient_value, max_gradient_idx = None, None
+
+        return {
+            'maximum_temperature': {
+                'value': summary['max'],
+                'coordinates': np.asarray(mesh_data.coordinates[summary['argmax']], dtype=float).tolist(),
+            },
+            'temperature_statistics': {
+                'min': summary['min'],
+                'max': summary['max'],
+                'mean': summary['mean'],
+                'median': summary['median'],
+                'std_dev': summary['std_dev'],
+                'quantiles': summary['quantiles']
+            },
+            'gradient_info': {
+                'max_gradient': max_gradient_value,
+                'max_gradient_location': max_gradient_idx
+            }
+        }
+
+    def max_gradient(self, values: np.ndarray, dimensions: List[int]) -> Tuple[Optional[float], Optional[Tuple[int, ...]]]:
+        """
+        Largest index-space gradient magnitude of a structured field and its (k, j, i) location,
+        computed in slabs along the outermost axis with one ghost layer on each side so every
+        slab matches np.gradient on the whole array. Axes with a single point are skipped.
+        """
+        shaped = np.asarray(values).reshape(dimensions[2], dimensions[1], dimensions[0])
+        live = [axis for axis in range(3) if shaped.shape[axis] > 1]
+        if not live:
+            return None, None
+        lead, length = live[0], shaped.shape[live[0]]
+        layer = shaped.size // length
+        step = max(1, self.chunk_items // layer)
+
+        best_value, best_index = -1.0, None
+        for a0 in range(0, length, step):
+            a1 = min(a0 + step, length)
+            lo, hi = max(a0 - 1, 0), min(a1 + 1, length)
+            index = [slice(None)] * 3
+            index[lead] = slice(lo, hi)
+            block = np.asarray(shaped[tuple(index)], dtype=np.float64).squeeze(
+                axis=tuple(axis for axis in range(3) if axis not in live))
+            gradients = np.gradient(block)
+            if block.ndim == 1:
+                gradients = [gradients]
+            magnitude = np.sqrt(sum(g * g for g in gradients))[a0 - lo:a0 - lo + (a1 - a0)]
+
+            local = np.unravel_index(int(np.argmax(magnitude)), magnitude.shape)
+            if magnitude[local] > best_value:
+                position = [0, 0, 0]
+                for axis, i in zip(live, local):
+                    position[axis] = int(i)
+                position[lead] += a0
+                best_value, best_index = float(magnitude[local]), tuple(position)
+        return best_value, best_index
+
+    def _read_cells(self, stream: _LineStream, n: int, size: int, version: float,
+                    memmap: Callable, arrays: Dict[str, np.ndarray]):
+        """
+        Read a CELLS section into CSR offsets and connectivity. Version 5 files store both
+        arrays directly; older files interleave each cell's point count with its point ids,
+        which are split apart in runs of equally sized cells.
+        """
+        if version >= 5.0:
+            stream.keyword()  # OFFSETS
+            arrays["offsets"] = memmap("offsets", np.int64, (n,))
+            stream.numbers(n, arrays["offsets"])
+            stream.keyword()  # CONNECTIVITY
+            arrays["connectivity"] = memmap("connectivity", np.int64, (size,))
+            stream.numbers(size, arrays["connectivity"])
+            return
+
+        # Scratch copy of the interleaved section, deleted once split
+        raw = memmap(".cells_raw", np.int64, (size,))
+        stream.numbers(size, raw)
+        offsets = arrays["offsets"] = memmap("offsets", np.int64, (n + 1,))
+        connectivity = arrays["connectivity"] = memmap("connectivity", np.int64, (size - n,))
+
+        offsets[0] = 0
+        cell, pos = 0, 0
+        while cell < n:
+            nodes = int(raw[pos])
+            stride = nodes + 1
+            block = np.asarray(raw[pos:pos + max(self.chunk_items, stride) // stride * stride])
+            k = min(len(block) // stride, n - cell)
+            mismatch = np.flatnonzero(block[:k * stride:stride] != nodes)
+            k = int(mismatch[0]) if len(mismatch) else k
+
+            start = int(offsets[cell])
+            connectivity[start:start + k * nodes] = block[:k * stride].reshape(k, stride)[:, 1:].ravel()
+            offsets[cell + 1:cell + k + 1] = start + nodes * np.arange(1, k + 1)
+            cell, pos = cell + k, pos + k * stride
+        raw_path = raw.filename
+        del raw
+        os.remove(raw_path)
+
+    def _grid_points(self, axes: List[np.ndarray], memmap: Callable) -> np.ndarray:
+        """
+        Points of a tensor-product grid (x fastest), written one z plane at a time
+        """
+        nx, ny, nz = (len(axis) for axis in axes)
+        coordinates = memmap("coordinates", np.float64, (nx * ny * nz, 3))
+        Y, X = np.meshgrid(axes[1], axes[0], indexing="ij")
+        for k, z in enumerate(axes[2]):
+            plane = coordinates[k * nx * ny:(k + 1) * nx * ny]
+            plane[:, 0], plane[:, 1], plane[:, 2] = X.ravel(), Y.ravel(), z
+        return coordinates
+
+    def _structured_cells(self, dims: List[int], memmap: Callable, arrays: Dict[str, np.ndarray]):
+        """
+        Structured grid cells written in slabs along the outermost axis with more than one point
+        """
+        live = [axis for axis in range(3) if dims[axis] > 1]
+        if not live:
+            arrays["offsets"], arrays["connectivity"], arrays["cell_types"] = MeshData.structured_cells(dims)
+            return
+        last = live[-1]
+        stride = int(np.prod(dims[:last]))
+        layer_cells = int(np.prod([dims[axis] - 1 for axis in live[:-1]]))
+        n_cells, nodes = layer_cells * (dims[last] - 1), 2 ** len(live)
+
+        offsets = arrays["offsets"] = memmap("offsets", np.int64, (n_cells + 1,))
+        connectivity = arrays["connectivity"] = memmap("connectivity", np.int64, (n_cells * nodes,))
+        cell_types = arrays["cell_types"] = memmap("cell_types", np.uint8, (n_cells,))
+        offsets[0] = 0
+        step = max(1, self.chunk_items // (layer_cells * nodes))
+        for j0 in range(0, dims[last] - 1, step):
+            sub = list(dims)
+            sub[last] = min(step, dims[last] - 1 - j0) + 1
+            slab_offsets, slab_connectivity, slab_types = MeshData.structured_cells(sub)
+            first = j0 * layer_cells
+            connectivity[first * nodes:(first + len(slab_types)) * nodes] = slab_connectivity + j0 * stride
+            offsets[first + 1:first + len(slab_types) + 1] = slab_offsets[1:] + first * nodes
+            cell_types[first:first + len(slab_types)] = slab_types
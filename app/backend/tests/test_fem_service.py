@@ -0,0 +1,116 @@
+import numpy as np
+from schemas.mesh_data import MeshData
+from services.analytical_service import AnalyticalService
+from services.fem_service import FEMService
+
+def unit_square_quads(n):
+    """
+    Structured n x n vertex grid on the unit square with VTK-ordered quadrilaterals
+    """
+    x = np.linspace(0.0, 1.0, n)
+    X, Y = np.meshgrid(x, x)
+    i, j = np.meshgrid(np.arange(n - 1), np.arange(n - 1))
+    a = (j * n + i).ravel()
+    return x, np.c_[X.ravel(), Y.ravel(), np.zeros(n * n)], np.c_[a, a + 1, a + n + 1, a + n]
+
+def test_p1_assembly_is_consistent():
+    """
+    The stiffness matrix is symmetric with zero row sums and the load vector sums to the area
+    """
+    x, points, quads = unit_square_quads(5)
+    fem_service = FEMService()
+    K, load, fixed = fem_service.assemble(points, fem_service.simplices(quads, "quadrilateral"))
+    assert np.allclose((K - K.T).toarray(), 0)
+    assert np.allclose(K @ np.ones(len(points)), 0)
+    assert np.isclose(load.sum(), 1.0)
+    assert fixed.sum() == 16  # the 4 x 4 boundary ring of a 5 x 5 grid
+
+def test_p1_solution_converges_to_analytical():
+    """
+    Batched P1 solves on split quads and hexes approach the Fourier-series solution
+    """
+    fem_service = FEMService()
+    errors = []
+    for n in (11, 21):
+        x, points, quads = unit_square_quads(n)
+        U, info = fem_service.solve({"coordinates": points, "connectivity": quads.tolist()},
+                                    source=[1.0, 2.0], boundary_value=[0.0, 1.0])
+        exact, _ = AnalyticalService().steady((x, x), source=1.0)
+        assert U.shape == (n * n, 2) and info["engine"] == "scipy_p1"
+        assert np.allclose(U[:, 1], 1.0 + 2.0 * U[:, 0])
+        errors.append(np.max(np.abs(U[:, 0] - exact.ravel())))
+    assert errors[1] < errors[0] / 3
+
+    n = 9
+    x = np.linspace(0.0, 1.0, n)
+    Z, Y, X = np.meshgrid(x, x, x, indexing="ij")
+    k, j, i = np.meshgrid(np.arange(n - 1), np.arange(n - 1), np.arange(n - 1), indexing="ij")
+    a = (k * n * n + j * n + i).ravel()
+    hexes = np.c_[a, a + 1, a + n + 1, a + n, a + n * n, a + n * n + 1, a + n * n + n + 1, a + n * n + n]
+    mesh_data = {"coordinates": np.c_[X.ravel(), Y.ravel(), Z.ravel()], "connectivity": hexes,
+                 "cell_types": np.full(len(hexes), 12)}
+    U, info = fem_service.solve(mesh_data, solver="sparse_iterative", preconditioner="jacobi")
+    exact, _ = AnalyticalService().steady((x, x, x), source=1.0)
+    assert info["converged"] and info["num_elements"] == 6 * len(hexes)
+    assert np.max(np.abs(U[:, 0] - exact.ravel())) < 5e-3
+
+def test_domain_decomposition_splits_the_mesh():
+    """
+    Schwarz-preconditioned CG over slabs of the mesh matches the direct solve for a batch
+    """
+    x, points, quads = unit_square_quads(21)
+    mesh_data = {"coordinates": points, "connectivity": quads}
+    fem_service = FEMService()
+    U_direct, _ = fem_service.solve(mesh_data, source=[1.0, 2.0], boundary_value=[0.0, 1.0])
+    U_dd, info = fem_service.solve(mesh_data, source=[1.0, 2.0], boundary_value=[0.0, 1.0],
+                                   solver="domain_decomposition", subdomains=2)
+    assert info["batch_size"] == 2 and all(run["converged"] and run["subdomains"] == 2 for run in info["runs"])
+    assert np.allclose(U_dd, U_direct, rtol=1e-7, atol=1e-7)
+
+def test_adaptive_refinement_is_conforming_and_cheaper():
+    """
+    Refinement of an L-shaped domain keeps the mesh conforming and reaches the target
+    error estimate with fewer unknowns than uniform refinement of the same mesh
+    """
+    x, points, quads = unit_square_quads(9)
+    centres = points[quads].mean(axis=1)
+    quads = quads[~((centres[:, 0] > 0.5) & (centres[:, 1] > 0.5))]
+    fem_service = FEMService()
+    points, cells, u, levels = fem_service.adapt({"coordinates": points, "connectivity": quads}, target_error=0.1)
+
+    assert levels[-1]["estimated_error"] <= 0.1 < levels[0]["estimated_error"]
+    assert [level["cells"] for level in levels] == sorted(level["cells"] for level in levels)
+    edges, _ = fem_service._cell_edges(cells, len(points))
+    _, counts = np.unique(edges, return_counts=True)
+    assert counts.max() == 2  # no hanging nodes
+    area = np.cross(points[cells[:, 1]] - points[cells[:, 0]], points[cells[:, 2]] - points[cells[:, 0]])[:, 2]
+    assert np.isclose(np.abs(area).sum() / 2, 0.75)
+
+    # Uniform bisection needs more cells for the same estimated error
+    adaptive_error = np.sqrt(fem_service.error_indicators(points, cells, u, 1.0).sum())
+    uniform_points, uniform = unit_square_quads(9)[1], fem_service.simplices(quads, "quadrilateral")
+    while True:
+        U, _ = fem_service.solve_arrays(uniform_points, uniform)
+        if np.sqrt(fem_service.error_indicators(uniform_points, uniform, U[:, 0], 1.0).sum()) <= adaptive_error:
+            break
+        uniform_points, uniform = fem_service.refine(uniform_points, uniform, np.ones(len(uniform), dtype=bool))
+    assert len(uniform) > 1.25 * len(cells)
+
+def test_mesh_data_matches_dict_input():
+    """
+    MeshData arrays give the same cells as the JSON dictionary they convert to
+    """
+    x, points, quads = unit_square_quads(4)
+    lines = np.array([[0, 1], [1, 2]])
+    connectivity = np.concatenate([lines.ravel(), quads.ravel()])
+    offsets = np.concatenate([[0, 2, 4], 4 + 4 * np.arange(1, len(quads) + 1)])
+    mesh_data = MeshData(points, offsets, connectivity, np.r_[[3, 3], np.full(len(quads), 9)],
+                         {"temperature": points[:, 0], "flux": points[:, :2]})
+
+    as_dict = mesh_data.to_dict()
+    assert as_dict["num_cells"] == len(quads) + 2 and as_dict["connectivity"][0] == [0, 1]
+    assert np.shape(as_dict["point_data"]["flux"]) == (16, 2)
+    fem_service = FEMService()
+    for source in (mesh_data, as_dict):
+        arrays, cells, cell_type = fem_service.mesh_arrays(source)
+        assert cell_type == "quadrilateral" and np.array_equal(cells, quads)
@@ -0,0 +1,101 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("langchain")
+from tools import fenics_tool
+from tools.fenics_mpi_runner import write_results
+from tools.fenics_tool import FenicsTool
+
+POINTS = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]])
+CELLS = np.array([[0, 1, 2], [0, 2, 3]])
+
+@pytest.fixture
+def mpi(tmp_path, monkeypatch):
+    """
+    Stand-ins for meshio and mpirun: the XDMF write is recorded and every launch is passed
+    to a handler the test installs as mpi.handler(command, cwd, work_dir)
+    """
+    monkeypatch.chdir(tmp_path)  # plots go to outputs/ under the working directory
+    monkeypatch.setattr(fenics_tool.shutil, "which", lambda name: f"/usr/bin/{name}")
+    state = SimpleNamespace(written=[], launches=[], handler=None)
+
+    def write(path, mesh):
+        state.written.append((path, mesh))
+        Path(path).write_text("<Xdmf/>")
+
+    monkeypatch.setattr(fenics_tool, "meshio", SimpleNamespace(Mesh=lambda points, cells: (points, cells), write=write))
+
+    def run(command, cwd, capture_output, text):
+        work_dir = Path(command[command.index("tools.fenics_mpi_runner") + 1])
+        state.launches.append((command, cwd, work_dir))
+        return state.handler(command, cwd, work_dir)
+
+    monkeypatch.setattr(fenics_tool.subprocess, "run", run)
+    return state
+
+def solve(**options):
+    arguments = dict(source=[1.0, 2.0], boundary_value=0.5, solver="cg", preconditioner="jacobi",
+                     tolerance=1e-9, max_iterations=50, degree=1, processes=3)
+    arguments.update(options)
+    return FenicsTool()._solve_mpi(POINTS, CELLS, "triangle", **arguments)
+
+def test_mpi_solve_hands_mesh_and_cases_to_the_ranks(mpi):
+    """
+    The launch command carries the solver settings, the scratch directory holds the mesh and
+    the cases, and rank 0's gathered output comes back as the result
+    """
+    def handler(command, cwd, work_dir):
+        cases = np.load(work_dir / "cases.npy")
+        assert np.array_equal(cases, [[1.0, 0.5], [2.0, 0.5]])
+        assert (work_dir / "mesh.xdmf").exists()
+        parts = [(np.array([0, 1, 2]), np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]), 1),
+                 (np.array([0, 2, 3]), np.array([[1.0, 2.0], [5.0, 6.0], [7.0, 8.0]]), 1)]
+        write_results(work_dir, parts, len(POINTS))
+        return SimpleNamespace(returncode=0, stderr="")
+
+    mpi.handler = handler
+    result = solve()
+    command, cwd, work_dir = mpi.launches[0]
+    assert command[:5] == [fenics_tool.MPIRUN, "-n", "3", sys.executable, "-m"]
+    assert command[command.index("--solver") + 1] == "cg"
+    assert command[command.index("--preconditioner") + 1] == "jacobi"
+    assert float(command[command.index("--tolerance") + 1]) == 1e-9
+    assert command[command.index("--max-iterations") + 1] == "50"
+    assert cwd == fenics_tool.BACKEND_DIR
+    assert not work_dir.exists()  # the scratch directory is removed afterwards
+
+    path, (points, [(cell_name, cells)]) = mpi.written[0]
+    assert Path(path).name == "mesh.xdmf" and cell_name == "triangle"
+    assert points.shape == (4, 2) and np.array_equal(cells, CELLS)  # flat meshes are written in 2D
+    assert result["solution"] == [1.0, 3.0, 5.0, 7.0]
+    assert result["solutions"] == [[1.0, 3.0, 5.0, 7.0], [2.0, 4.0, 6.0, 8.0]]
+    assert result["solver_info"]["mpi_processes"] == 3 and result["solver_info"]["cells_per_process"] == [1, 1]
+
+def test_failed_mpi_run_raises_with_its_stderr(mpi):
+    mpi.handler = lambda command, cwd, work_dir: SimpleNamespace(returncode=134, stderr="PETSc error: out of memory\n")
+    with pytest.raises(RuntimeError, match="exit code 134: PETSc error: out of memory"):
+        solve()
+    mpi.handler = lambda command, cwd, work_dir: SimpleNamespace(returncode=0, stderr="")
+    with pytest.raises(RuntimeError, match="without writing a solution"):
+        solve()
+
+def test_mpi_solve_needs_the_launcher(mpi, monkeypatch):
+    monkeypatch.setattr(fenics_tool.shutil, "which", lambda name: None)
+    with pytest.raises(ValueError, match="not found"):
+        solve()
+    assert not mpi.launches
+
+def test_write_results_scatters_partitions_into_input_order(tmp_path):
+    """
+    Rank 0 places every rank's vertex values at their global indices and rejects gaps
+    """
+    parts = [(np.array([2, 0]), np.array([[3.0], [1.0]]), 4), (np.array([1, 2]), np.array([[2.0], [3.0]]), 5)]
+    write_results(tmp_path, parts, 3)
+    assert np.load(tmp_path / "solution.npy").ravel().tolist() == [1.0, 2.0, 3.0]
+    assert json.loads((tmp_path / "partition.json").read_text()) == {"cells_per_rank": [4, 5]}
+    with pytest.raises(RuntimeError, match="1 vertices were not covered"):
+        write_results(tmp_path, parts, 4)
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+df = pytest.importorskip("dolfin")
+pytest.importorskip("meshio")
+pytest.importorskip("langchain")
+from schemas.mesh_data import MeshData
+from tools.fenics_tool import FenicsTool
+
+def grid_mesh(dims):
+    """
+    Unit square or cube grid with cells in VTK vertex order, as parse_vtk_file returns it
+    """
+    axes = [np.linspace(0.0, 1.0, n) for n in dims]
+    Z, Y, X = np.meshgrid(axes[2], axes[1], axes[0], indexing="ij")
+    offsets, connectivity, cell_types = MeshData.structured_cells(dims)
+    return {
+        "coordinates": np.column_stack([X.ravel(), Y.ravel(), Z.ravel()]),
+        "connectivity": connectivity.reshape(len(cell_types), -1),
+        "cell_types": cell_types
+    }
+
+@pytest.mark.parametrize("dims", [(4, 3, 1), (3, 3, 3)])
+def test_build_mesh_keeps_tensor_cells_untwisted(dims):
+    """
+    Quads and hexes built in bulk come out in DOLFIN's tensor-product vertex order
+    """
+    mesh = FenicsTool().build_mesh(grid_mesh(dims))
+    n_cells = int(np.prod([n - 1 for n in dims if n > 1]))
+    assert mesh.num_cells() == n_cells
+    assert np.isclose(df.assemble(df.Constant(1.0)*df.dx(domain=mesh)), 1.0)
+
+    # Tensor order puts opposite corners at v0 + (v1 - v0) + (v2 - v0) in every layer
+    x = mesh.coordinates()[mesh.cells()]
+    assert np.allclose(x[:, 3], x[:, 1] + x[:, 2] - x[:, 0])
+    if x.shape[1] == 8:
+        assert np.allclose(x[:, 7], x[:, 5] + x[:, 6] - x[:, 4])
+    assert all(cell.volume() > 0 for cell in df.cells(mesh))
+
+def test_build_mesh_simplices_and_solve():
+    """
+    A split cube builds as tetrahedra and FEniCS matches the SciPy engine on it
+    """
+    mesh_data = grid_mesh((4, 4, 4))
+    tool = FenicsTool()
+    points, cells, cell_type = tool.fem_service.mesh_arrays(mesh_data)
+    cells = tool.fem_service.simplices(cells, cell_type)
+    simplices = {"coordinates": points, "connectivity": cells}
+    mesh = tool.build_mesh(simplices)
+    assert mesh.num_cells() == len(cells) and mesh.num_vertices() == len(points)
+    assert np.isclose(df.assemble(df.Constant(1.0)*df.dx(domain=mesh)), 1.0)
+
+    fenics = tool.solve_heat_equation(simplices, source=1.0, engine="fenics")
+    scipy = tool.solve_heat_equation(simplices, source=1.0, engine="scipy")
+    assert np.isclose(max(fenics["solution"]), max(scipy["solution"]), rtol=1e-6)
+
+def test_shared_system_solves_concurrently():
+    """
+    Threads solving different cases on one cached system each get their own source and
+    boundary value back (the solution is affine in both)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from tools.fenics_tool import FenicsSystem
+
+    system = FenicsSystem(df.UnitSquareMesh(16, 16), solver="cg", preconditioner="jacobi")
+    base, offset = system.solve(1.0, 0.0), system.solve(0.0, 1.0)
+    cases = [(float(k), float(k % 3)) for k in range(1, 25)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        solutions = list(executor.map(lambda case: system.solve(*case), cases))
+    for (source, boundary_value), solution in zip(cases, solutions):
+        assert np.allclose(solution, source * base + boundary_value * offset, atol=1e-6)
+
+def test_adaptive_refinement_marks_and_refines_cells():
+    """
+    Every FEniCS refinement level adds cells and the error estimate falls
+    """
+    mesh_data = grid_mesh((5, 5, 1))
+    tool = FenicsTool()
+    points, cells, cell_type = tool.fem_service.mesh_arrays(mesh_data)
+    triangles = {"coordinates": points, "connectivity": tool.fem_service.simplices(cells, cell_type)}
+    result = tool.solve_heat_equation(triangles, source=1.0, engine="fenics", adaptive=True,
+                                      target_error=0.5, max_cells=5000)
+    levels = result["refinement_levels"]
+    assert len(levels) > 2
+    assert all(fine["cells"] > coarse["cells"] for coarse, fine in zip(levels, levels[1:]))
+    assert levels[-1]["estimated_error"] < levels[0]["estimated_error"]
+    assert len(result["connectivity"]) == levels[-1]["cells"]
+
+def test_adaptive_refinement_stops_at_the_level_cap(monkeypatch):
+    """
+    Running out of levels returns the last solved mesh with values on its own vertices
+    """
+    from tools import fenics_tool
+    monkeypatch.setattr(fenics_tool, "MAX_REFINEMENT_LEVELS", 2)
+    mesh_data = grid_mesh((5, 5, 1))
+    tool = FenicsTool()
+    points, cells, cell_type = tool.fem_service.mesh_arrays(mesh_data)
+    triangles = {"coordinates": points, "connectivity": tool.fem_service.simplices(cells, cell_type)}
+    result = tool.solve_heat_equation(triangles, source=1.0, engine="fenics", adaptive=True,
+                                      target_error=1e-6, max_cells=10**6)
+    levels = result["refinement_levels"]
+    assert len(levels) == 3 and not result["target_reached"]
+    assert len(result["connectivity"]) == levels[-1]["cells"]
+    assert len(result["solution"]) == len(result["coordinates"])
+
+def test_cell_values_follow_cell_order():
+    """
+    A DG0-assembled cell quantity comes back in cell order whatever the dof numbering
+    """
+    mesh = df.UnitSquareMesh(6, 4, "crossed")
+    space = df.FunctionSpace(mesh, "DG", 0)
+    volumes = FenicsTool()._cell_values(space, df.assemble(df.TestFunction(space)*df.dx))
+    x = df.SpatialCoordinate(mesh)
+    centroids = FenicsTool()._cell_values(space, df.assemble(x[0]*df.TestFunction(space)*df.dx)) / volumes
+    assert np.allclose(volumes, [cell.volume() for cell in df.cells(mesh)])
+    assert np.allclose(centroids, [cell.midpoint().x() for cell in df.cells(mesh)])
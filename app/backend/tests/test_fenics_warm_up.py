@@ -0,0 +1,80 @@
+import os
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("langchain")
+from tools import fenics_tool
+from tools.fenics_tool import FenicsTool, WARM_UP_REPORT
+
+@pytest.fixture
+def fresh_report():
+    """
+    Empty the process-wide warm-up report for one test and restore it afterwards
+    """
+    saved = dict(WARM_UP_REPORT)
+    WARM_UP_REPORT.clear()
+    yield WARM_UP_REPORT
+    WARM_UP_REPORT.clear()
+    WARM_UP_REPORT.update(saved)
+
+def test_warm_up_without_fenics_is_skipped(fresh_report, monkeypatch):
+    monkeypatch.setattr(fenics_tool, "df", None)
+    report = FenicsTool().warm_up()
+    assert report["skipped"] == "FEniCS is not installed" and report["forms"] == {}
+    assert FenicsTool().warm_up() is report
+
+def test_warm_up_builds_every_form_once(fresh_report, monkeypatch):
+    """
+    Each degree and cell type is built and solved once per process; later calls return the report
+    """
+    built = []
+
+    class System:
+        def __init__(self, mesh, degree=1):
+            built.append((mesh, degree))
+
+        def solve(self, source, boundary_value):
+            return None
+
+    meshes = SimpleNamespace(UnitSquareMesh=lambda *n: "triangle", UnitCubeMesh=lambda *n: "tetrahedron")
+    monkeypatch.setattr(fenics_tool, "df", meshes)
+    monkeypatch.setattr(fenics_tool, "FenicsSystem", System)
+    report = FenicsTool().warm_up()
+    assert built == [(cell_type, degree) for cell_type in ("triangle", "tetrahedron") for degree in (1, 2)]
+    assert sorted(report["forms"]) == ["P1_tetrahedron", "P1_triangle", "P2_tetrahedron", "P2_triangle"]
+    assert report["cache_dir"] == os.environ["DIJITSO_CACHE_DIR"] and "skipped" not in report
+    FenicsTool().warm_up()
+    assert len(built) == 4
+
+def test_startup_fills_the_warm_up_status(fresh_report, monkeypatch, caplog):
+    """
+    The lifespan handler runs the warm-up, logs its outcome and the status endpoint reports it
+    """
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    pytest.importorskip("crewai")
+    from fastapi.testclient import TestClient
+    from app.backend.main import app
+
+    monkeypatch.setattr(fenics_tool, "df", None)
+    with caplog.at_level("INFO"), TestClient(app) as client:
+        status = client.get("/status/warm-up").json()
+    assert status["completed"] and status["skipped"] == "FEniCS is not installed"
+    assert "FEniCS JIT warm-up skipped: FEniCS is not installed" in caplog.messages
+
+def test_failed_warm_up_is_logged_and_startup_continues(fresh_report, monkeypatch, caplog):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    pytest.importorskip("crewai")
+    from fastapi.testclient import TestClient
+    from app.backend.main import app
+
+    def fail(self):
+        raise RuntimeError("compiler missing")
+
+    monkeypatch.setattr(FenicsTool, "warm_up", fail)
+    with TestClient(app) as client:
+        status = client.get("/status/warm-up").json()
+    assert status == {"completed": False}
+    [record] = [record for record in caplog.records if record.getMessage() == "FEniCS JIT warm-up failed"]
+    assert record.levelname == "ERROR" and "compiler missing" in str(record.exc_info[1])
@@ -0,0 +1,318 @@
+import numpy as np
+from services.analytical_service import AnalyticalService
+from services.domain_decomposition_service import DomainDecompositionService
+from services.fast_poisson_service import FastPoissonService
+from services.finite_difference_service import FiniteDifferenceService
+from services.linear_solver_service import LinearSolverService
+from services.multigrid_service import MultigridService
+from services.operator_cache_service import OperatorCacheService
+from services.sweep_service import SweepService
+from services.transient_service import TransientHeatService
+
+def build_problem(nx=41, ny=31, boundary_values=None):
+    """
+    Assemble a small Poisson problem on a 2 x 1 rectangle
+    """
+    fd_service = FiniteDifferenceService()
+    x, y, dx, dy = fd_service.create_grid(nx, ny, lx=2.0, ly=1.0)
+    A = fd_service.assemble_laplacian(nx, ny, dx, dy)
+    b = fd_service.assemble_rhs(nx, ny, dx, dy, source=1.0, boundary_values=boundary_values)
+    return A, b, dx, dy
+
+def test_sparse_laplacian_matches_stencil():
+    """
+    The assembled operator has the 5-point stencil with spacing-scaled weights
+    """
+    A, b, dx, dy = build_problem(nx=5, ny=4)
+    assert A.shape == (6, 6)
+    assert np.allclose(A.diagonal(), 2 / dx**2 + 2 / dy**2)
+    assert np.allclose((A - A.T).toarray(), 0)
+
+def test_laplacian_converges_to_manufactured_solution():
+    """
+    Solving with the operator and the continuous source -laplacian(u) of a known u on the
+    2 x 1 rectangle recovers u itself (not a multiple of it) with second-order error
+    """
+    fd_service = FiniteDifferenceService()
+    errors = []
+    for m in (10, 20, 40):
+        x, y, dx, dy = fd_service.create_grid(2 * m + 1, m + 1, lx=2.0, ly=1.0)
+        X, Y = np.meshgrid(x[1:-1], y[1:-1])
+        g = np.exp(X) * np.sin(np.pi * X / 2)
+        g_xx = np.exp(X) * ((1 - np.pi**2 / 4) * np.sin(np.pi * X / 2) + np.pi * np.cos(np.pi * X / 2))
+        exact = g * np.sin(np.pi * Y)
+        source = (np.pi**2 * g - g_xx) * np.sin(np.pi * Y)
+
+        A = fd_service.assemble_laplacian(2 * m + 1, m + 1, dx, dy)
+        u, _ = LinearSolverService().solve_direct(A, source.ravel())
+        errors.append(np.max(np.abs(u - exact.ravel())))
+    assert errors[-1] < 1e-3 * np.max(np.abs(exact))
+    assert all(3.5 < coarse / fine < 4.5 for coarse, fine in zip(errors, errors[1:]))
+
+def single_mode(n=21):
+    """
+    Operator of the unit square with its lowest eigenvector sin(pi x) sin(pi y) and eigenvalue
+    """
+    fd_service = FiniteDifferenceService()
+    x, y, dx, dy = fd_service.create_grid(n, n)
+    A = fd_service.assemble_laplacian(n, n, dx, dy)
+    mode = np.outer(np.sin(np.pi * y[1:-1]), np.sin(np.pi * x[1:-1])).ravel()
+    eigenvalue = float(mode @ (A @ mode) / (mode @ mode))
+    assert np.allclose(A @ mode, eigenvalue * mode)
+    return A, mode, eigenvalue
+
+def test_time_schemes_match_single_mode_decay():
+    """
+    Each fixed-step scheme multiplies a single mode by its amplification factor per step
+    and tracks the exact decay exp(-lambda t)
+    """
+    A, mode, eigenvalue = single_mode()
+    dt, n_steps = 2e-4, 50
+    amplification = {
+        "explicit": 1 - dt * eigenvalue,
+        "implicit_euler": 1 / (1 + dt * eigenvalue),
+        "crank_nicolson": (1 - dt * eigenvalue / 2) / (1 + dt * eigenvalue / 2)
+    }
+    for scheme, factor in amplification.items():
+        step, t, u = list(TransientHeatService().integrate(A, mode, dt, n_steps, scheme=scheme))[-1]
+        assert step == n_steps and np.isclose(t, n_steps * dt)
+        assert np.allclose(u, factor**n_steps * mode, rtol=1e-9, atol=1e-12)
+        assert np.allclose(u, np.exp(-eigenvalue * t) * mode, rtol=1e-3, atol=1e-6)
+
+def test_time_snapshots_stream_and_end_at_t_end():
+    """
+    Snapshots come every snapshot_every steps plus the final state, as independent copies,
+    and a dt that does not divide t_end shortens the last step instead of overshooting
+    """
+    A, mode, eigenvalue = single_mode()
+    transient_service = TransientHeatService()
+    snapshots = list(transient_service.integrate(A, mode, 1e-3, 25, snapshot_every=10, scheme="implicit_euler"))
+    assert [step for step, _, _ in snapshots] == [0, 10, 20, 25]
+    snapshots[0][2][:] = 0.0
+    assert np.allclose(snapshots[1][2], mode / (1 + 1e-3 * eigenvalue)**10)
+
+    steps = list(transient_service.integrate(A, mode, 0.03, scheme="implicit_euler", t_end=0.1))
+    assert [t for _, t, _ in steps][-1] == 0.1 and steps[-1][0] == 4
+    expected = mode / ((1 + 0.03 * eigenvalue)**3 * (1 + 0.01 * eigenvalue))
+    assert np.allclose(steps[-1][2], expected, rtol=1e-9)
+
+def test_fast_poisson_matches_direct():
+    """
+    The sine-transform solver reproduces the sparse direct solve, including edge temperatures
+    """
+    nx, ny = 41, 31
+    A, b, dx, dy = build_problem(nx, ny, boundary_values={"left": 100.0, "top": 20.0})
+    u_direct, _ = LinearSolverService().solve_direct(A, b)
+    u_fft = FastPoissonService().solve(b.reshape(ny - 2, nx - 2), (dy, dx)).ravel()
+    assert np.allclose(u_fft, u_direct, atol=1e-10)
+
+def test_multigrid_matches_direct():
+    """
+    Multigrid V- and W-cycles converge to the direct solution with a small convergence factor
+    """
+    nx, ny = 41, 31
+    A, b, dx, dy = build_problem(nx, ny)
+    u_direct, _ = LinearSolverService().solve_direct(A, b)
+    for cycle in ("V", "W"):
+        u_mg, info = MultigridService(coarsest_size=16).solve(A, b, (ny - 2, nx - 2), cycle=cycle, tolerance=1e-10)
+        assert info["converged"]
+        assert info["levels"] > 2
+        assert info["average_convergence_factor"] < 0.3
+        assert np.allclose(u_mg, u_direct, atol=1e-8)
+
+def test_operator_cache_reuses_factorization_and_evicts_lru():
+    """
+    Repeated lookups hit the cache and the least recently used entry is evicted first
+    """
+    A, b, dx, dy = build_problem()
+    cache = OperatorCacheService(max_bytes=64 * 1024**2)
+    lu = cache.get_factorization(("poisson",), A)
+    assert cache.get_factorization(("poisson",), A) is lu
+    assert np.allclose(A @ lu.solve(b), b)
+
+    cache.clear()
+    cache.max_bytes = 3 * 8 * 10
+    for key in ("a", "b", "c"):
+        cache.get_or_create(key, lambda: np.zeros(10))
+    cache.get_or_create("a", lambda: np.zeros(10))
+    cache.get_or_create("d", lambda: np.zeros(10))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 4, 1, 3)
+    assert cache.get_or_create("b", lambda: None) is None
+
+def test_batched_right_hand_sides_match_single_solves():
+    """
+    A batch of sources and edge temperatures solved at once matches case-by-case solves
+    """
+    nx, ny = 41, 31
+    fd_service = FiniteDifferenceService()
+    x, y, dx, dy = fd_service.create_grid(nx, ny)
+    A = fd_service.assemble_laplacian(nx, ny, dx, dy)
+    sources, cases = fd_service.batch_cases([0.0, 1.0, 2.0], {"left": 10.0})
+    assert len(cases) == 3
+    B = fd_service.assemble_rhs_batch(nx, ny, dx, dy, sources, cases)
+
+    U_direct, _ = LinearSolverService().solve_direct(A, B)
+    U_fft = FastPoissonService().solve(B.T.reshape(3, ny - 2, nx - 2), (dy, dx)).reshape(3, -1).T
+    for j, source in enumerate(sources):
+        b = fd_service.assemble_rhs(nx, ny, dx, dy, source=source, boundary_values={"left": 10.0})
+        u, _ = LinearSolverService().solve_direct(A, b)
+        assert np.allclose(U_direct[:, j], u)
+        assert np.allclose(U_fft[:, j], u)
+
+def test_parameter_sweep_table(monkeypatch):
+    """
+    Every parameter combination gets a row from spawned workers, and the peak scales with
+    source over diffusivity
+    """
+    from services import sweep_service
+    start_methods = []
+
+    class RecordingPool(sweep_service.ProcessPoolExecutor):
+        def __init__(self, *args, mp_context=None, **kwargs):
+            start_methods.append(mp_context.get_start_method() if mp_context else None)
+            super().__init__(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(sweep_service, "ProcessPoolExecutor", RecordingPool)
+    table = SweepService().run(grid_sizes=[21, (31, 21)], diffusivities=[1.0, 2.0], sources=[1.0, 4.0], max_workers=2)
+    assert start_methods == ["spawn"]
+    assert len(table) == 8
+    assert set(zip(table["nx"], table["ny"])) == {(21, 21), (31, 21)}
+    square = table[(table["nx"] == 21) & (table["diffusivity"] == 1.0) & (table["source"] == 1.0)][0]
+    scaled = table[(table["nx"] == 21) & (table["diffusivity"] == 2.0) & (table["source"] == 4.0)][0]
+    assert np.isclose(scaled["max_temperature"], 2 * square["max_temperature"])
+    assert np.isclose(square["max_x"], 0.5) and np.isclose(square["max_y"], 0.5)
+
+def test_matrix_free_3d_matches_fft():
+    """
+    The matrix-free 7-point operator with CG and multigrid on the assembled one agree with
+    the 3D sine-transform solve
+    """
+    nx, ny, nz = 17, 13, 11
+    fd_service = FiniteDifferenceService()
+    x, y, z, dx, dy, dz = fd_service.create_grid_3d(nx, ny, nz)
+    A = fd_service.laplacian_operator_3d(nx, ny, nz, dx, dy, dz)
+    b = fd_service.assemble_rhs_3d(nx, ny, nz, dx, dy, dz, source=1.0, boundary_values={"back": 5.0})
+
+    u_cg, info = LinearSolverService().solve_iterative(A, b, method="cg", preconditioner="none", tolerance=1e-12)
+    u_fft = FastPoissonService().solve(b.reshape(nz - 2, ny - 2, nx - 2), (dz, dy, dx)).ravel()
+    assert info["converged"]
+    assert np.allclose(u_cg, u_fft, atol=1e-9)
+
+    # The assembled operator is the same stencil
+    A_sparse = fd_service.assemble_laplacian_3d(nx, ny, nz, dx, dy, dz)
+    v = np.random.default_rng(0).random(A_sparse.shape[0])
+    assert np.allclose(A_sparse @ v, A @ v)
+
+    # Multigrid on it coarsens all three axes of a cube grid
+    n = 17
+    _, _, _, h, _, _ = fd_service.create_grid_3d(n, n, n)
+    A_cube = fd_service.assemble_laplacian_3d(n, n, n, h, h, h)
+    b_cube = fd_service.assemble_rhs_3d(n, n, n, h, h, h, source=1.0, boundary_values={"back": 5.0})
+    u_fft = FastPoissonService().solve(b_cube.reshape(n - 2, n - 2, n - 2), (h, h, h)).ravel()
+    for cycle in ("V", "W"):
+        u_mg, info = MultigridService(coarsest_size=16).solve(A_cube, b_cube, (n - 2, n - 2, n - 2), cycle=cycle,
+                                                             tolerance=1e-10)
+        assert info["converged"] and info["levels"] > 2
+        assert info["average_convergence_factor"] < 0.3
+        assert np.allclose(u_mg, u_fft, atol=1e-8)
+
+    u_3d = fd_service.embed_interior_3d(u_cg, nx, ny, nz, {"back": 5.0})
+    assert u_3d.shape == (nz, ny, nx)
+    assert np.all(u_3d[-1, 1:-1, 1:-1] == 5.0)
+
+def test_mixed_precision_refines_to_double_accuracy():
+    """
+    Single-precision factors plus iterative refinement reach the double-precision residual
+    """
+    A, b, dx, dy = build_problem(boundary_values={"left": 100.0})
+    solver_service = LinearSolverService()
+    u_direct, _ = solver_service.solve_direct(A, b)
+    for inner in ("direct_sparse", "sparse_iterative"):
+        u_mixed, info = solver_service.solve_mixed_precision(A, b, inner=inner, preconditioner="ilu", tolerance=1e-11)
+        assert info["converged"]
+        assert info["residual_history"][0] > 1e-9
+        assert info["final_residual"] <= 1e-11
+        assert np.allclose(u_mixed, u_direct, rtol=1e-8, atol=1e-8)
+
+def test_domain_decomposition_matches_direct():
+    """
+    Schwarz-preconditioned CG over worker processes converges to the direct solution,
+    both for a steady solve and inside implicit time steps
+    """
+    A, b, dx, dy = build_problem(boundary_values={"left": 100.0})
+    u_direct, _ = LinearSolverService().solve_direct(A, b)
+    u_dd, info = DomainDecompositionService().solve(A, b, n_subdomains=2, tolerance=1e-10)
+    assert info["converged"] and info["subdomains"] == 2
+    assert sum(info["subdomain_sizes"]) > A.shape[0]  # the subdomains overlap
+    assert np.allclose(u_dd, u_direct, rtol=1e-7, atol=1e-7)
+
+    # A batch shares one set of workers; coordinates split the 2 x 1 grid across x
+    fd_service = FiniteDifferenceService()
+    x, y, _, _ = fd_service.create_grid(41, 31, lx=2.0, ly=1.0)
+    coordinates = fd_service.interior_coordinates(x, y)
+    parts = DomainDecompositionService().partition(A, 2, overlap=0, coordinates=coordinates)
+    assert coordinates[parts[0], 0].max() <= coordinates[parts[1], 0].min()
+    B = np.column_stack([b, 2.0 * b, np.ones_like(b)])
+    U_dd, infos = DomainDecompositionService().solve_batch(A, B, n_subdomains=2, coordinates=coordinates,
+                                                           tolerance=1e-10)
+    U_direct, _ = LinearSolverService().solve_direct(A, B)
+    assert len(infos) == 3 and all(info["converged"] for info in infos)
+    assert np.allclose(U_dd, U_direct, rtol=1e-7, atol=1e-7)
+
+    transient_service = TransientHeatService()
+    u0 = np.zeros(A.shape[0])
+    runs = [
+        list(transient_service.integrate(A, u0, 1e-3, 5, forcing=b, snapshot_every=5, **options))[-1][2]
+        for options in ({}, {"step_solver": "domain_decomposition", "subdomains": 2, "coordinates": coordinates,
+                             "solver_tolerance": 1e-12, "max_iterations": 200})
+    ]
+    assert np.allclose(runs[0], runs[1], rtol=1e-8, atol=1e-8)
+
+def test_adaptive_time_stepping_reaches_steady_state():
+    """
+    Error-controlled steps track the fixed-step solution and stop at the steady state
+    """
+    A, b, dx, dy = build_problem(boundary_values={"left": 100.0})
+    transient_service = TransientHeatService()
+    u0 = np.zeros(A.shape[0])
+
+    fixed = list(transient_service.integrate(A, u0, 1e-4, 200, forcing=b, snapshot_every=200))[-1][2]
+    adaptive = list(transient_service.integrate_adaptive(A, u0, 0.02, 1e-4, forcing=b, tolerance=1e-3,
+                                                         steady_tolerance=None))[-1]
+    assert adaptive[1] == 0.02
+    assert np.max(np.abs(adaptive[2] - fixed)) < 1e-2
+
+    history = []
+    step, t, u = list(transient_service.integrate_adaptive(A, u0, 100.0, 1e-4, forcing=b, history=history))[-1]
+    u_steady, _ = LinearSolverService().solve_direct(A, b)
+    assert t < 100.0 and step < 1000
+    assert max(entry["dt"] for entry in history) > 100 * 1e-4
+    assert np.allclose(u, u_steady, atol=1e-3)
+
+def test_analytical_solutions_match_finite_differences():
+    """
+    Fourier-series solutions reproduce closed forms and the second-order convergence of the stencil
+    """
+    analytical_service = AnalyticalService()
+    x = np.linspace(0.0, 1.0, 21)
+    u, info = analytical_service.steady((x,), source=2.0, boundary_values={"left": 1.0, "right": 3.0})
+    assert info["converged"] and np.allclose(u, 1 + 2 * x + x * (1 - x))
+    u, _ = analytical_service.steady((x,), source=1.0, boundary_types={"right": "neumann"})
+    assert np.allclose(u, x * (2 - x) / 2)
+
+    errors = []
+    for n in (21, 41):
+        A, b, dx, dy = build_problem(nx=2 * n - 1, ny=n, boundary_values={"left": 100.0, "top": 30.0})
+        u_fd, _ = LinearSolverService().solve_direct(A, b)
+        x, y, _, _ = FiniteDifferenceService().create_grid(2 * n - 1, n, lx=2.0, ly=1.0)
+        u, info = analytical_service.steady((x, y), source=1.0, boundary_values={"left": 100.0, "top": 30.0})
+        assert info["converged"] and u.shape == (n, 2 * n - 1)
+        errors.append(abs(u[n // 2, n - 1] - u_fd.reshape(n - 2, 2 * n - 3)[n // 2 - 1, n - 2]))  # x = 1, y = 0.5
+    assert errors[1] < errors[0] / 3
+
+    times = [0.0, 0.01, 0.05]
+    u, info = analytical_service.transient((x, y), times, lengths=(2.0, 1.0), initial_temperature=3.0,
+                                           source=2.0, boundary_values=dict.fromkeys(("left", "right", "bottom", "top"), 1.0))
+    assert u.shape == (3, 41, 81) and np.all(u[0, 1:-1, 1:-1] == 3.0)
+    assert np.all(u[-1] >= 1.0) and np.all(u[:, 0, :] == 1.0)
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from services.finite_difference_service import FiniteDifferenceService
+from services.linear_solver_service import LinearSolverService
+
+@pytest.mark.parametrize("method, preconditioner", [("cg", "ilu"), ("cg", "jacobi"), ("gmres", "ilu")])
+def test_iterative_solver_matches_direct(method, preconditioner):
+    """
+    Preconditioned Krylov methods converge to the direct solution and record their residuals
+    """
+    fd_service = FiniteDifferenceService()
+    x, y, dx, dy = fd_service.create_grid(41, 31, lx=2.0, ly=1.0)
+    A = fd_service.assemble_laplacian(41, 31, dx, dy)
+    b = fd_service.assemble_rhs(41, 31, dx, dy, source=1.0)
+    solver_service = LinearSolverService()
+    u_direct, _ = solver_service.solve_direct(A, b)
+    u_iterative, info = solver_service.solve_iterative(A, b, method=method, preconditioner=preconditioner,
+                                                       tolerance=1e-10)
+    assert info["converged"]
+    assert info["iterations"] == len(info["residual_history"])
+    assert np.allclose(u_iterative, u_direct, atol=1e-8)
@@ -0,0 +1,26 @@
+import numpy as np
+from schemas.mesh_data import MeshData
+from services.mesh_cache_service import MeshCacheService
+
+def test_mesh_cache_round_trip_and_eviction(tmp_path):
+    """
+    Cached meshes come back memory-mapped and identical, and old entries are evicted
+    """
+    upload = tmp_path / "Case2.vtk"
+    upload.write_bytes(b"# vtk DataFile Version 5.1\n")
+    mesh_data = MeshData(np.random.rand(4, 3), np.array([0, 3, 6]), np.array([0, 1, 2, 1, 3, 2]),
+                         np.array([5, 5], dtype=np.uint8), {"temperature": np.arange(4.0), "flux": np.ones((4, 3))},
+                         dimensions=None, is_structured=False)
+
+    cache = MeshCacheService(tmp_path / "cache", max_bytes=10**6)
+    key = cache.digest(str(upload))
+    assert cache.get(key) is None
+    cache.put(key, mesh_data)
+    cached = cache.get(key)
+    assert not cached.coordinates.flags.writeable  # read-only memory map
+    assert cached.to_dict() == mesh_data.to_dict()
+
+    # Room for one entry: storing a second mesh evicts the first
+    cache.max_bytes = cache.stats()["bytes"]
+    cache.put("other", mesh_data)
+    assert cache.get(key) is None and cache.get("other") is not None
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from schemas.mesh_data import MeshData
+
+@pytest.mark.parametrize("dims, cell_type, corners", [
+    ((1, 1, 1), 1, [(0, 0, 0)]),
+    ((4, 1, 1), 3, [(0, 0, 0), (1, 0, 0)]),
+    ((3, 4, 1), 9, [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]),
+    ((3, 1, 3), 9, [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)]),
+    ((3, 4, 2), 12, [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)])
+])
+def test_structured_cells_follow_vtk_vertex_order(dims, cell_type, corners):
+    """
+    Every cell of a structured grid starts at its lowest corner and visits the corners in
+    VTK order, with cells numbered like points (i fastest)
+    """
+    offsets, connectivity, cell_types = MeshData.structured_cells(dims)
+    cell_counts = [max(n - 1, 1) for n in dims]
+    assert len(cell_types) == int(np.prod(cell_counts)) and np.all(cell_types == cell_type)
+    assert np.array_equal(offsets, np.arange(len(cell_types) + 1) * len(corners))
+
+    # Point index -> (i, j, k) grid position
+    positions = np.stack(np.unravel_index(connectivity, dims[::-1])[::-1], axis=1).reshape(len(cell_types), len(corners), 3)
+    first = np.stack(np.unravel_index(np.arange(len(cell_types)), cell_counts[::-1])[::-1], axis=1)
+    assert np.array_equal(positions[:, 0], first)
+    assert np.array_equal(positions - positions[:, :1], np.broadcast_to(corners, positions.shape))
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("langchain")
+from tools.numerical_tool import NumericalTool
+
+def test_3d_result_summarizes_instead_of_returning_the_field(tmp_path, monkeypatch):
+    """
+    The 3D tool returns statistics, the hottest point and the mid-plane slice; the full field
+    is only written to a .npy file on request
+    """
+    monkeypatch.chdir(tmp_path)  # plots and saved fields go to outputs/
+    nx, ny, nz = 17, 13, 11
+    tool = NumericalTool()
+    result = tool.solve_finite_difference_3d(nx, ny, nz, boundary_values={"back": 5.0})
+    assert "error" not in result and "solution" not in result and "solution_path" not in result
+    assert np.shape(result["mid_plane"]["values"]) == (ny, nx) and np.isclose(result["mid_plane"]["z"], 0.5)
+
+    saved = tool.solve_finite_difference_3d(nx, ny, nz, boundary_values={"back": 5.0}, mid_plane=False,
+                                            save_solution=True)
+    assert "mid_plane" not in saved
+    u = np.load(tmp_path / saved["solution_path"])
+    assert u.shape == (nz, ny, nx)
+    assert np.allclose(result["mid_plane"]["values"], u[nz // 2])
+
+    statistics = result["temperature_statistics"]
+    assert statistics["count"] == u.size and statistics["max"] == u.max() == 5.0
+    assert np.isclose(statistics["mean"], u.mean()) and np.isclose(statistics["std_dev"], u.std())
+    hottest = np.unravel_index(np.argmax(u), u.shape)
+    assert result["max_temperature"]["value"] == 5.0
+    assert np.allclose(result["max_temperature"]["coordinates"],
+                       [hottest[2] / (nx - 1), hottest[1] / (ny - 1), hottest[0] / (nz - 1)])
@@ -0,0 +1,37 @@
+import numpy as np
+from services.statistics_service import SKETCH_SIZE, StatisticsService
+
+def test_fused_statistics_match_numpy():
+    """
+    Chunked, threaded statistics agree with NumPy; the sketch quantiles are close and the
+    exact median is exact
+    """
+    values = np.random.default_rng(0).normal(300.0, 25.0, 100_001)
+    statistics = StatisticsService(chunk_items=4096, max_workers=4)
+    summary = statistics.summarize(values, quantiles=(0.1, 0.5, 0.9), exact_median=True)
+
+    assert summary["count"] == len(values)
+    assert summary["min"] == values.min() and summary["argmin"] == np.argmin(values)
+    assert summary["max"] == values.max() and summary["argmax"] == np.argmax(values)
+    assert np.isclose(summary["mean"], values.mean()) and np.isclose(summary["std_dev"], values.std())
+    assert summary["median"] == np.median(values)
+    for q, estimate in summary["quantiles"].items():
+        assert abs(np.mean(values <= estimate) - float(q)) < 0.01
+
+    # Fully sampled chunks make the sketch exact
+    small = values[:1000]
+    assert np.isclose(statistics.summarize(small)["median"], np.median(small))
+
+def test_sketch_size_is_independent_of_field_size():
+    """
+    Merging more chunks keeps the quantile sketch at SKETCH_SIZE points with accurate quartiles
+    """
+    rng = np.random.default_rng(1)
+    statistics = StatisticsService(chunk_items=SKETCH_SIZE, max_workers=2)
+    for chunks in (4, 16, 64):
+        values = rng.exponential(2.0, chunks * SKETCH_SIZE)
+        stats = statistics.reduce(values)
+        assert len(stats.samples) == len(stats.weights) == SKETCH_SIZE
+        assert np.isclose(stats.weights.sum(), len(values))
+        for q in (0.25, 0.5, 0.75):
+            assert abs(np.mean(values <= stats.quantile(q)) - q) < 0.005
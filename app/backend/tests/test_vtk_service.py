@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+vtk = pytest.importorskip("vtk")
+from vtk.util import numpy_support
+from services.vtk_service import VTKService
+
+def write(writer_name, dataset, path, binary=False):
+    """
+    Write dataset with the named VTK writer and return the path as a string
+    """
+    writer = getattr(vtk, writer_name)()
+    writer.SetFileName(str(path))
+    writer.SetInputData(dataset)
+    if binary:
+        writer.SetFileTypeToBinary()
+    writer.Write()
+    return str(path)
+
+def cell_array(cells):
+    array = vtk.vtkCellArray()
+    for cell in cells:
+        ids = vtk.vtkIdList()
+        for point in cell:
+            ids.InsertNextId(point)
+        array.InsertNextCell(ids)
+    return array
+
+def add_field(dataset, name, values):
+    array = numpy_support.numpy_to_vtk(np.ascontiguousarray(values, dtype=np.float64), deep=True)
+    array.SetName(name)
+    dataset.GetPointData().AddArray(array)
+
+def test_reader_is_picked_from_the_header(tmp_path):
+    """
+    Legacy DATASET lines and XML VTKFile types select their readers whatever the file suffix
+    """
+    image = vtk.vtkImageData()
+    image.SetDimensions(2, 2, 1)
+    paths = {
+        "vtkStructuredPointsReader": write("vtkStructuredPointsWriter", image, tmp_path / "legacy.dat"),
+        "vtkXMLImageDataReader": write("vtkXMLImageDataWriter", image, tmp_path / "image.xml")
+    }
+    service = VTKService(cache=None)
+    for reader_name, path in paths.items():
+        assert service._reader_for(path).GetClassName() == reader_name
+
+    (tmp_path / "notes.txt").write_text("temperature 300\n")
+    with pytest.raises(ValueError, match="Not a VTK file"):
+        service._reader_for(str(tmp_path / "notes.txt"))
+    (tmp_path / "graph.vtk").write_text("# vtk DataFile Version 3.0\ngraph\nASCII\nDATASET GRAPH\n")
+    with pytest.raises(ValueError, match="Unsupported VTK dataset type 'GRAPH'"):
+        service._reader_for(str(tmp_path / "graph.vtk"))
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_poly_data_cells_keep_cell_id_order(tmp_path, binary):
+    """
+    Lines come before polygons, and polygon types follow their node counts
+    """
+    points = vtk.vtkPoints()
+    for point in [(0, 0, 0), (1, 0, 0), (0, 1, 0), (2, 0, 0), (2, 1, 0)]:
+        points.InsertNextPoint(point)
+    poly = vtk.vtkPolyData()
+    poly.SetPoints(points)
+    poly.SetLines(cell_array([[0, 1]]))
+    poly.SetPolys(cell_array([[0, 1, 2], [1, 3, 4, 2]]))
+    add_field(poly, "temperature", [300.0, 310.0, 320.0, 330.0, 340.0])
+
+    mesh_data = VTKService(cache=None).parse_vtk_file(write("vtkPolyDataWriter", poly, tmp_path / "poly.vtk", binary))
+    assert np.allclose(mesh_data.coordinates, [(0, 0, 0), (1, 0, 0), (0, 1, 0), (2, 0, 0), (2, 1, 0)])
+    assert mesh_data.cell_lists() == [[0, 1], [0, 1, 2], [1, 3, 4, 2]]
+    assert mesh_data.cell_types.tolist() == [3, 5, 9]
+    assert not mesh_data.is_structured
+    assert np.allclose(mesh_data.point_data["temperature"], [300.0, 310.0, 320.0, 330.0, 340.0])
+
+def test_image_data_honours_the_extent(tmp_path):
+    """
+    Image points sit at origin + spacing * index for indices running over the extent
+    """
+    image = vtk.vtkImageData()
+    image.SetExtent(2, 4, 1, 2, 0, 0)
+    image.SetOrigin(1.0, -1.0, 0.0)
+    image.SetSpacing(0.5, 2.0, 1.0)
+    add_field(image, "temperature", np.arange(6.0))
+
+    mesh_data = VTKService(cache=None).parse_vtk_file(write("vtkXMLImageDataWriter", image, tmp_path / "image.vti"))
+    x = 1.0 + 0.5 * np.arange(2, 5)
+    y = -1.0 + 2.0 * np.arange(1, 3)
+    assert np.allclose(mesh_data.coordinates[:, 0], np.tile(x, 2))
+    assert np.allclose(mesh_data.coordinates[:, 1], np.repeat(y, 3))
+    assert mesh_data.is_structured and mesh_data.dimensions == [3, 2, 1]
+    assert mesh_data.cell_lists() == [[0, 1, 4, 3], [1, 2, 5, 4]]
+    assert np.allclose(mesh_data.point_data["temperature"], np.arange(6.0))
+
+def test_rectilinear_grid_uses_its_axis_coordinates(tmp_path):
+    """
+    Rectilinear points are the tensor product of the (non-uniform) axis coordinates
+    """
+    x, y, z = np.array([0.0, 0.1, 1.0]), np.array([0.0, 2.0]), np.array([0.0, 0.5])
+    grid = vtk.vtkRectilinearGrid()
+    grid.SetDimensions(len(x), len(y), len(z))
+    grid.SetXCoordinates(numpy_support.numpy_to_vtk(x, deep=True))
+    grid.SetYCoordinates(numpy_support.numpy_to_vtk(y, deep=True))
+    grid.SetZCoordinates(numpy_support.numpy_to_vtk(z, deep=True))
+
+    mesh_data = VTKService(cache=None).parse_vtk_file(write("vtkXMLRectilinearGridWriter", grid, tmp_path / "grid.vtr"))
+    Z, Y, X = np.meshgrid(z, y, x, indexing="ij")
+    assert np.allclose(mesh_data.coordinates, np.column_stack([X.ravel(), Y.ravel(), Z.ravel()]))
+    assert mesh_data.num_cells == 2 and mesh_data.cell_types.tolist() == [12, 12]
+    assert mesh_data.cell_lists()[0] == [0, 1, 4, 3, 6, 7, 10, 9]
+
+def test_unstructured_arrays_are_views_of_the_reader_buffers(tmp_path):
+    """
+    Mixed cells come back as CSR arrays and point fields keep their components, all without copies
+    """
+    points = np.random.default_rng(0).random((6, 3))
+    cells = [(vtk.VTK_TRIANGLE, [0, 1, 2]), (vtk.VTK_QUAD, [1, 3, 4, 2]), (vtk.VTK_LINE, [4, 5])]
+    vtk_points = vtk.vtkPoints()
+    vtk_points.SetData(numpy_support.numpy_to_vtk(points, deep=True))
+    grid = vtk.vtkUnstructuredGrid()
+    grid.SetPoints(vtk_points)
+    grid.Allocate(len(cells))
+    for cell_type, ids in cells:
+        id_list = vtk.vtkIdList()
+        for point in ids:
+            id_list.InsertNextId(point)
+        grid.InsertNextCell(cell_type, id_list)
+    add_field(grid, "temperature", points[:, 0] * 100)
+    add_field(grid, "flux", points)
+
+    mesh_data = VTKService(cache=None).parse_vtk_file(write("vtkXMLUnstructuredGridWriter", grid, tmp_path / "mixed.vtu"))
+    assert mesh_data.offsets.tolist() == [0, 3, 7, 9]
+    assert mesh_data.connectivity.tolist() == [0, 1, 2, 1, 3, 4, 2, 4, 5]
+    assert mesh_data.cell_types.tolist() == [5, 9, 3]
+    assert np.allclose(mesh_data.coordinates, points)
+    assert np.allclose(mesh_data.point_data["temperature"], points[:, 0] * 100)
+    assert mesh_data.point_data["flux"].shape == (6, 3)
+    for array in (mesh_data.coordinates, mesh_data.offsets, mesh_data.connectivity, mesh_data.cell_types,
+                  *mesh_data.point_data.values()):
+        assert not array.flags.owndata
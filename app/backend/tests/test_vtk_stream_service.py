@@ -0,0 +1,96 @@
+import numpy as np
+from services.mesh_cache_service import MeshCacheService
+from services.vtk_stream_service import VTKStreamService
+
+def numbers(values):
+    return " ".join(map(repr, np.asarray(values, dtype=float).tolist()))
+
+def write_lines(path, header, values, per_line):
+    lines = [" ".join(map(str, values[i:i + per_line])) for i in range(0, len(values), per_line)]
+    path.write_text("\n".join(header + lines) + "\n")
+
+def test_stream_unstructured_grid_into_cache(tmp_path):
+    """
+    Mixed legacy cells and point fields parsed in tiny chunks match the file contents
+    """
+    points = np.random.rand(6, 3)
+    cells = [[0, 1, 2], [1, 3, 4, 2], [4, 5]]
+    temperature = np.random.rand(6) * 100
+    text = ["# vtk DataFile Version 3.0", "mixed cells", "ASCII", "DATASET UNSTRUCTURED_GRID",
+            "POINTS 6 double", *(numbers(p) for p in points),
+            "CELLS 3 12", *(" ".join(map(str, [len(c), *c])) for c in cells),
+            "CELL_TYPES 3", "5", "9", "3",
+            "CELL_DATA 3", "SCALARS material int 1", "LOOKUP_TABLE default", "1 2 3",
+            "POINT_DATA 6", "SCALARS temperature double 1", "LOOKUP_TABLE default",
+            numbers(temperature[:4]), numbers(temperature[4:]),
+            "VECTORS flux float", *(numbers(p) for p in points)]
+    upload = tmp_path / "mixed.vtk"
+    upload.write_text("\n".join(text) + "\n")
+
+    stream = VTKStreamService(chunk_bytes=32, chunk_items=2)
+    assert stream.can_stream(str(upload))
+    cache = MeshCacheService(tmp_path / "cache")
+    cache.store("mixed", lambda directory: stream.read(str(upload), directory)[0])
+    mesh_data = cache.get("mixed")
+
+    assert np.allclose(mesh_data.coordinates, points)
+    assert mesh_data.cell_lists() == cells
+    assert mesh_data.cell_types.tolist() == [5, 9, 3]
+    assert list(mesh_data.point_data) == ["temperature", "flux"]
+    assert np.allclose(mesh_data.point_data["flux"], points)
+
+    metrics = stream.field_metrics(mesh_data, "temperature")
+    assert np.isclose(metrics["temperature_statistics"]["median"], np.median(temperature))
+    assert np.isclose(metrics["temperature_statistics"]["std_dev"], np.std(temperature))
+    assert np.allclose(metrics["maximum_temperature"]["coordinates"], points[np.argmax(temperature)])
+
+def test_stream_structured_points_metrics(tmp_path):
+    """
+    Metrics gathered while streaming match the in-memory ones, including the slab-wise gradient
+    """
+    nx, ny, nz = 7, 5, 1
+    temperature = np.random.rand(nx * ny * nz) * 300
+    upload = tmp_path / "grid.vtk"
+    write_lines(upload, ["# vtk DataFile Version 3.0", "grid", "ASCII", "DATASET STRUCTURED_POINTS",
+                         f"DIMENSIONS {nx} {ny} {nz}", "ORIGIN 0 0 0", "SPACING 0.5 0.5 1",
+                         f"POINT_DATA {nx * ny}", "SCALARS Temperature float", "LOOKUP_TABLE default"],
+                np.float32(temperature).tolist(), 3)
+    temperature = temperature.astype(np.float32).astype(float)
+
+    stream = VTKStreamService(chunk_bytes=64, chunk_items=8)
+    metrics = stream.temperature_metrics(str(upload), tmp_path)
+    statistics = metrics["temperature_statistics"]
+    assert np.isclose(statistics["max"], temperature.max()) and np.isclose(statistics["min"], temperature.min())
+    assert np.isclose(statistics["mean"], temperature.mean())
+    assert np.isclose(statistics["median"], np.median(temperature))
+
+    i = int(np.argmax(temperature))
+    assert np.allclose(metrics["maximum_temperature"]["coordinates"], [0.5 * (i % nx), 0.5 * (i // nx), 0])
+    magnitude = np.sqrt(sum(g * g for g in np.gradient(temperature.reshape(ny, nx))))
+    assert np.isclose(metrics["gradient_info"]["max_gradient"], magnitude.max())
+    assert metrics["gradient_info"]["max_gradient_location"] == (0, *np.unravel_index(np.argmax(magnitude), magnitude.shape))
+
+def test_streamed_statistics_survive_the_cache(tmp_path, monkeypatch):
+    """
+    Statistics gathered while streaming are stored with the cache entry and reused by the
+    metrics, so only the gradient reads the field again
+    """
+    nx, ny = 6, 4
+    temperature = np.random.rand(nx * ny) * 50
+    upload = tmp_path / "grid.vtk"
+    write_lines(upload, ["# vtk DataFile Version 3.0", "grid", "ASCII", "DATASET STRUCTURED_POINTS",
+                         f"DIMENSIONS {nx} {ny} 1", f"POINT_DATA {nx * ny}", "SCALARS temperature double",
+                         "LOOKUP_TABLE default"], temperature.tolist(), 4)
+
+    stream = VTKStreamService(chunk_bytes=48)
+    cache = MeshCacheService(tmp_path / "cache")
+    cache.store("grid", lambda directory: stream.read(str(upload), directory)[0])
+    mesh_data = cache.get("grid")
+    assert mesh_data.statistics["temperature"].count == nx * ny
+
+    def reduce(values):
+        raise AssertionError("field read again")
+    monkeypatch.setattr(stream.statistics, "reduce", reduce)
+    statistics = stream.field_metrics(mesh_data, "temperature")["temperature_statistics"]
+    assert np.isclose(statistics["mean"], temperature.mean()) and np.isclose(statistics["std_dev"], temperature.std())
+    assert np.isclose(statistics["median"], np.median(temperature))
@@ -0,0 +1,61 @@
+"""
+MPI entry point for FenicsTool parallel solves, launched from app/backend as
+
+    mpirun -n K python -m tools.fenics_mpi_runner WORK_DIR [--solver lu] [--degree 1] ...
+
+Every rank reads its partition of WORK_DIR/mesh.xdmf, solves each (source, boundary value)
+row of WORK_DIR/cases.npy, and rank 0 gathers the vertex temperatures into
+WORK_DIR/solution.npy (one column per case, in the input vertex order) plus the number of
+cells per rank into WORK_DIR/partition.json.
+"""
+import argparse
+import json
+import numpy as np
+from pathlib import Path
+from tools.fenics_tool import FENICS_PRECONDITIONERS, FENICS_SOLVERS, FenicsSystem, df
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve the steady heat equation with FEniCS under MPI")
+    parser.add_argument("work_dir", type=Path)
+    parser.add_argument("--solver", default="lu", choices=FENICS_SOLVERS)
+    parser.add_argument("--preconditioner", default="hypre_amg", choices=FENICS_PRECONDITIONERS)
+    parser.add_argument("--degree", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=1e-10)
+    parser.add_argument("--max-iterations", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    # Reading through the world communicator partitions the mesh across the ranks
+    comm = df.MPI.comm_world
+    mesh = df.Mesh(comm)
+    with df.XDMFFile(comm, str(args.work_dir / "mesh.xdmf")) as xdmf:
+        xdmf.read(mesh)
+
+    system = FenicsSystem(mesh, args.solver, args.preconditioner, args.degree)
+    u = df.Function(system.V)
+    values = []
+    for source, boundary_value in np.load(args.work_dir / "cases.npy"):
+        u.vector().set_local(system.solve(source, boundary_value, args.tolerance, args.max_iterations))
+        u.vector().apply("insert")
+        values.append(u.compute_vertex_values(mesh))
+
+    # Global vertex indices follow the input file, so rank 0 can scatter every partition into place
+    parts = comm.gather((mesh.topology().global_indices(0), np.column_stack(values), mesh.num_cells()), root=0)
+    if comm.rank == 0:
+        write_results(args.work_dir, parts, mesh.num_entities_global(0))
+
+def write_results(work_dir: Path, parts, num_vertices: int):
+    """
+    Scatter the gathered (global vertex indices, vertex values, cell count) of every rank into
+    work_dir/solution.npy in input vertex order, and the cells per rank into partition.json.
+    Vertices on partition boundaries come from several ranks with the same values.
+    """
+    solution = np.full((num_vertices, parts[0][1].shape[1]), np.nan)
+    for indices, local_values, _ in parts:
+        solution[indices] = local_values
+    if np.isnan(solution).any():
+        raise RuntimeError(f"{int(np.isnan(solution[:, 0]).sum())} vertices were not covered by any rank")
+    np.save(work_dir / "solution.npy", solution)
+    (work_dir / "partition.json").write_text(json.dumps({"cells_per_rank": [int(part[2]) for part in parts]}))
+
+if __name__ == "__main__":
+    main()
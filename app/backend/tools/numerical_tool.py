@@ -1,60 +1,148 @@
 from langchain.tools import Tool
 import numpy as np
-from scipy.sparse import csr_matrix
-from scipy.sparse.linalg import spsolve
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 import matplotlib.pyplot as plt
 from pathlib import Path
+from services.analytical_service import AnalyticalService
+from services.domain_decomposition_service import DomainDecompositionService
+from services.fast_poisson_service import FastPoissonService
+from services.finite_difference_service import FiniteDifferenceService
+from services.linear_solver_service import LinearSolverService
+from services.multigrid_service import MultigridService
+from services.operator_cache_service import OPERATOR_CACHE
+from services.statistics_service import StatisticsService
+from services.sweep_service import SweepService
+from services.transient_service import TransientHeatService
 
 class NumericalTool:
-    def solve_finite_difference(self, nx: int = 50, ny: int = 50) -> Dict[str, Any]:
+    def __init__(self):
+        self.analytical_service = AnalyticalService()
+        self.dd_service = DomainDecompositionService()
+        self.fd_service = FiniteDifferenceService()
+        self.fast_poisson_service = FastPoissonService()
+        self.linear_solver_service = LinearSolverService()
+        self.multigrid_service = MultigridService()
+        self.sweep_service = SweepService()
+        self.transient_service = TransientHeatService()
+        self.statistics_service = StatisticsService()
+    
+    def solve_finite_difference(self, nx: int = 50, ny: int = 50, solver: str = "auto",
+                                method: str = "cg", preconditioner: str = "jacobi",
+                                tolerance: float = 1e-6, max_iterations: int = 1000,
+                                boundary_values: Optional[Union[Dict[str, float], List[Dict[str, float]]]] = None,
+                                cycle: str = "V", source: Union[float, List[float]] = 1.0,
+                                precision: str = "double", subdomains: Optional[int] = None,
+                                validate: bool = False) -> Dict[str, Any]:
         """
-        Solve 2D steady-state heat equation using finite difference method
+        Solve 2D steady-state heat equation using finite difference method.
+        solver is "auto", "fft", "direct_sparse", "sparse_iterative", "multigrid",
+        "domain_decomposition" or "analytical" (Fourier series, uniform sources only); "auto" picks the fast sine-transform solver whenever the grid
+        and boundary conditions allow it. The iterative solver uses the given Krylov method,
+        preconditioner, tolerance and iteration limit, multigrid runs V- or W-cycles to the same
+        tolerance, and domain decomposition runs CG with an overlapping Schwarz preconditioner
+        whose subdomain solves run in parallel worker processes (default one per core).
+        boundary_values sets fixed edge temperatures (default 0). Passing a list of sources
+        and/or boundary_values solves the whole batch against one operator and returns the
+        stacked "solutions". precision="mixed" factorizes or iterates in single precision and
+        refines the result to double-precision accuracy (direct and iterative solvers only).
+        validate=True compares the result against the analytical solution on the same grid.
         """
         try:
-            # Create grid
-            x = np.linspace(0, 1, nx)
-            y = np.linspace(0, 1, ny)
-            dx = x[1] - x[0]
-            dy = y[1] - y[0]
-            
-            # Initialize matrices
-            N = nx * ny
-            A = np.zeros((N, N))
-            b = np.zeros(N)
-            
-            # Fill matrices using 5-point stencil
-            for i in range(nx):
-                for j in range(ny):
-                    k = i + j*nx
-                    
-                    if i == 0 or i == nx-1 or j == 0 or j == ny-1:
-                        # Boundary conditions
-                        A[k, k] = 1
-                        b[k] = 0
-                    else:
-                        # Interior points
-                        A[k, k] = -4
-                        A[k, k-1] = 1
-                        A[k, k+1] = 1
-                        A[k, k-nx] = 1
-                        A[k, k+nx] = 1
-                        b[k] = -1  # Source term
-            
-            # Convert to sparse matrix
-            A_sparse = csr_matrix(A)
+            # Create grid and one right-hand side column per case
+            x, y, dx, dy = self.fd_service.create_grid(nx, ny)
+            sources, cases = self.fd_service.batch_cases(source, boundary_values)
+            B = self.fd_service.assemble_rhs_batch(nx, ny, dx, dy, sources, cases)
+            n_cases = B.shape[1]
+            solver = self._select_solver(solver, precision)
+            if precision == "mixed" and solver not in ("direct_sparse", "sparse_iterative"):
+                raise ValueError("Mixed precision is available for the direct_sparse and sparse_iterative solvers")
             
             # Solve system
-            u = spsolve(A_sparse, b)
+            if solver == "fft":
+                # Matrix-free: the sine transform diagonalizes the stencil, all cases at once
+                U = self.fast_poisson_service.solve(B.T.reshape(n_cases, ny - 2, nx - 2), (dy, dx))
+                U = U.reshape(n_cases, -1).T
+                solver_info = {"solver": "fft"}
+            elif solver == "analytical":
+                # Exact solution of the continuous problem evaluated at the grid nodes
+                exact, infos = self._analytical_solutions(x, y, sources, cases)
+                U = exact[:, 1:-1, 1:-1].reshape(n_cases, -1).T
+                solver_info = infos[0] if n_cases == 1 else {"solver": solver, "batch_size": n_cases, "runs": infos}
+            else:
+                # Assemble sparse system for the interior nodes (5-point stencil), reusing
+                # cached operators and factorizations for grids we have seen before
+                key = self.fd_service.operator_key(nx, ny, dx, dy)
+                A = OPERATOR_CACHE.get_or_create(key, lambda: self.fd_service.assemble_laplacian(nx, ny, dx, dy))
+                
+                if precision == "mixed":
+                    # Single-precision factorization or iteration with double-precision refinement
+                    if solver == "direct_sparse":
+                        U, solver_info = self.linear_solver_service.solve_mixed_precision(
+                            A, B, inner=solver, cache_key=key
+                        )
+                    else:
+                        runs = [
+                            self.linear_solver_service.solve_mixed_precision(
+                                A, B[:, j], inner=solver, method=method, preconditioner=preconditioner,
+                                max_iterations=max_iterations
+                            )
+                            for j in range(n_cases)
+                        ]
+                        U = np.column_stack([u for u, _ in runs])
+                        if n_cases == 1:
+                            solver_info = runs[0][1]
+                        else:
+                            solver_info = {"solver": solver, "batch_size": n_cases, "runs": [info for _, info in runs]}
+                elif solver == "direct_sparse":
+                    # One factorization, all right-hand sides in a single triangular solve
+                    U, solver_info = self.linear_solver_service.solve_direct(A, B, cache_key=key)
+                elif solver == "domain_decomposition":
+                    # One set of subdomain workers serves every case; the grid splits into
+                    # slabs along its longer side
+                    U, runs = self.dd_service.solve_batch(
+                        A, B, n_subdomains=subdomains, coordinates=self.fd_service.interior_coordinates(x, y),
+                        tolerance=tolerance, max_iterations=max_iterations
+                    )
+                    solver_info = runs[0] if n_cases == 1 else {"solver": solver, "batch_size": n_cases, "runs": runs}
+                elif solver in ("sparse_iterative", "multigrid"):
+                    # Krylov and multigrid iterate one right-hand side at a time
+                    runs = []
+                    for j in range(n_cases):
+                        if solver == "sparse_iterative":
+                            runs.append(self.linear_solver_service.solve_iterative(
+                                A, B[:, j], method=method, preconditioner=preconditioner,
+                                tolerance=tolerance, max_iterations=max_iterations
+                            ))
+                        else:
+                            runs.append(self.multigrid_service.solve(
+                                A, B[:, j], (ny - 2, nx - 2), cycle=cycle,
+                                tolerance=tolerance, max_cycles=max_iterations, cache_key=key
+                            ))
+                    U = np.column_stack([u for u, _ in runs])
+                    if n_cases == 1:
+                        solver_info = runs[0][1]
+                    else:
+                        solver_info = {"solver": solver, "batch_size": n_cases, "runs": [info for _, info in runs]}
+                else:
+                    raise ValueError(
+                        f"Unknown solver '{solver}', expected 'auto', 'fft', 'direct_sparse', "
+                        f"'sparse_iterative', 'multigrid', 'domain_decomposition' or 'analytical'"
+                    )
             
-            # Reshape solution to 2D
-            u_2d = u.reshape((ny, nx))
+            # Reshape solutions to 2D with each case's boundary values applied
+            solutions = np.stack([
+                self.fd_service.embed_interior(U[:, j], nx, ny, cases[j]) for j in range(n_cases)
+            ])
+            u_2d = solutions[0]
             
             # Create visualization
             plt.figure(figsize=(10, 8))
             plt.imshow(u_2d, cmap='hot', origin='lower')
             plt.colorbar(label='Temperature')
-            plt.title("Steady-State Heat Distribution (Finite Difference)")
+            if n_cases == 1:
+                plt.title("Steady-State Heat Distribution (Finite Difference)")
+            else:
+                plt.title(f"Steady-State Heat Distribution (Finite Difference, case 1 of {n_cases})")
             plt.xlabel("x")
             plt.ylabel("y")
             
@@ -65,14 +153,281 @@ class NumericalTool:
             plt.savefig(plot_path)
             plt.close()
             
-            return {
+            result = {
                 "solution": u_2d.tolist(),
-                "plot_path": str(plot_path)
+                "plot_path": str(plot_path),
+                "solver_info": solver_info,
+                "operator_cache": OPERATOR_CACHE.stats()
+            }
+            if n_cases > 1:
+                result["solutions"] = solutions.tolist()
+            if validate:
+                exact, infos = self._analytical_solutions(x, y, sources, cases)
+                errors = solutions - exact
+                result["validation"] = {
+                    "max_error": float(np.max(np.abs(errors))),
+                    "rms_error": float(np.sqrt(np.mean(errors**2))),
+                    "series_terms": max(info["terms"] for info in infos)
+                }
+            
+            # Plot convergence history for iterative solves
+            if solver_info.get("residual_history"):
+                plt.figure(figsize=(10, 6))
+                plt.semilogy(solver_info["residual_history"])
+                if precision == "mixed":
+                    plt.title(f"Iterative Refinement History (mixed precision, {solver})")
+                    plt.xlabel("Refinement step")
+                elif solver == "multigrid":
+                    plt.title(f"Convergence History (multigrid {cycle}-cycle)")
+                    plt.xlabel("Cycle")
+                elif solver == "domain_decomposition":
+                    plt.title(f"Convergence History (CG, {solver_info['subdomains']}-subdomain Schwarz preconditioner)")
+                    plt.xlabel("Iteration")
+                else:
+                    plt.title(f"Convergence History ({method.upper()}, {preconditioner} preconditioner)")
+                    plt.xlabel("Iteration")
+                plt.ylabel("Relative residual")
+                plt.grid(True)
+                history_path = output_dir / "convergence_history_fd.png"
+                plt.savefig(history_path)
+                plt.close()
+                result["convergence_plot_path"] = str(history_path)
+                result["convergence_history"] = solver_info["residual_history"]
+            
+            return result
+            
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def solve_finite_difference_3d(self, nx: int = 32, ny: int = 32, nz: int = 32, solver: str = "auto",
+                                   method: str = "cg", tolerance: float = 1e-6, max_iterations: int = 1000,
+                                   boundary_values: Optional[Dict[str, float]] = None,
+                                   source: float = 1.0, cycle: str = "V", mid_plane: bool = True,
+                                   save_solution: bool = False) -> Dict[str, Any]:
+        """
+        Solve 3D steady-state heat equation on the unit cube with the 7-point stencil.
+        solver is "auto", "fft", "matrix_free", "multigrid" or "analytical"; the matrix-free solver
+        applies the stencil with array slicing inside a Krylov method, so no matrix is ever stored,
+        while multigrid runs V- or W-cycles on the assembled sparse operator.
+        boundary_values sets fixed face temperatures (left/right, bottom/top, front/back).
+        The field itself is not returned, so large grids stay O(N) end to end: the result holds
+        summary statistics, the hottest point and (with mid_plane) the z mid-plane slice;
+        save_solution=True writes the full (nz, ny, nx) field to outputs/ as .npy and returns its path.
+        """
+        try:
+            # Create grid and the interior right-hand side
+            x, y, z, dx, dy, dz = self.fd_service.create_grid_3d(nx, ny, nz)
+            b = self.fd_service.assemble_rhs_3d(nx, ny, nz, dx, dy, dz, source=source, boundary_values=boundary_values)
+            solver = self._select_solver(solver)
+            
+            # Solve system
+            if solver == "fft":
+                u = self.fast_poisson_service.solve(b.reshape(nz - 2, ny - 2, nx - 2), (dz, dy, dx)).ravel()
+                solver_info = {"solver": "fft"}
+            elif solver == "analytical":
+                u_exact, solver_info = self.analytical_service.steady((x, y, z), source=source, boundary_values=boundary_values)
+                u = u_exact[1:-1, 1:-1, 1:-1].ravel()
+            elif solver == "matrix_free":
+                A = self.fd_service.laplacian_operator_3d(nx, ny, nz, dx, dy, dz)
+                u, solver_info = self.linear_solver_service.solve_iterative(
+                    A, b, method=method, preconditioner="none",
+                    tolerance=tolerance, max_iterations=max_iterations
+                )
+            elif solver == "multigrid":
+                key = self.fd_service.operator_key_3d(nx, ny, nz, dx, dy, dz)
+                A = OPERATOR_CACHE.get_or_create(key, lambda: self.fd_service.assemble_laplacian_3d(nx, ny, nz, dx, dy, dz))
+                u, solver_info = self.multigrid_service.solve(
+                    A, b, (nz - 2, ny - 2, nx - 2), cycle=cycle,
+                    tolerance=tolerance, max_cycles=max_iterations, cache_key=key
+                )
+            else:
+                raise ValueError(f"Unknown solver '{solver}', expected 'auto', 'fft', 'matrix_free', 'multigrid' or 'analytical'")
+            
+            # Reshape solution to 3D with the face values applied
+            u_3d = self.fd_service.embed_interior_3d(u, nx, ny, nz, boundary_values)
+            
+            # Create visualization of the mid-plane slice
+            plt.figure(figsize=(10, 8))
+            plt.imshow(u_3d[nz // 2], cmap='hot', origin='lower')
+            plt.colorbar(label='Temperature')
+            plt.title(f"Steady-State Heat Distribution (z = {z[nz // 2]:.3g} slice)")
+            plt.xlabel("x")
+            plt.ylabel("y")
+            
+            # Save plot
+            output_dir = Path("outputs")
+            output_dir.mkdir(exist_ok=True)
+            plot_path = output_dir / "heat_distribution_fd_3d.png"
+            plt.savefig(plot_path)
+            plt.close()
+            
+            # One fused pass gives the summary and the hottest node
+            statistics = self.statistics_service.summarize(u_3d)
+            max_index = np.unravel_index(statistics["argmax"], u_3d.shape)
+            result = {
+                "temperature_statistics": statistics,
+                "max_temperature": {
+                    "value": statistics["max"],
+                    "coordinates": [float(x[max_index[2]]), float(y[max_index[1]]), float(z[max_index[0]])]
+                },
+                "plot_path": str(plot_path),
+                "solver_info": solver_info
             }
+            if mid_plane:
+                result["mid_plane"] = {"z": float(z[nz // 2]), "values": u_3d[nz // 2].tolist()}
+            if save_solution:
+                solution_path = output_dir / "solution_fd_3d.npy"
+                np.save(solution_path, u_3d)
+                result["solution_path"] = str(solution_path)
+            return result
             
         except Exception as e:
             return {"error": str(e)}
     
+    def solve_transient(self, nx: int = 50, ny: int = 50, t_end: float = 0.1, dt: float = 1e-3,
+                        scheme: str = "crank_nicolson", alpha: float = 1.0,
+                        initial_temperature: float = 0.0, source: float = 0.0,
+                        boundary_values: Optional[Dict[str, float]] = None,
+                        snapshot_every: int = 10, solver: str = "direct",
+                        subdomains: Optional[int] = None, adaptive: bool = False,
+                        tolerance: float = 1e-3, steady_tolerance: Optional[float] = 1e-6,
+                        solver_tolerance: float = 1e-10, max_iterations: int = 1000,
+                        validate: bool = False) -> Dict[str, Any]:
+        """
+        Solve 2D transient heat equation dT/dt = alpha * (laplacian(T) + source) with fixed edge temperatures.
+        Snapshots are kept every snapshot_every steps only. Implicit steps use a cached sparse
+        factorization (solver="direct") or parallel domain decomposition (solver="domain_decomposition",
+        iterating to solver_tolerance within max_iterations per step).
+        With adaptive=True, dt is only the initial step: it then grows or shrinks to keep the
+        estimated local error below tolerance, and the run stops early at steady state.
+        validate=True compares the snapshots with the Fourier-series solution, which needs the
+        same temperature on every edge.
+        """
+        try:
+            # Create grid and assemble the spatial operator once (or take it from the cache)
+            x, y, dx, dy = self.fd_service.create_grid(nx, ny)
+            key = self.fd_service.operator_key(nx, ny, dx, dy)
+            A = OPERATOR_CACHE.get_or_create(key, lambda: self.fd_service.assemble_laplacian(nx, ny, dx, dy))
+            f = self.fd_service.assemble_rhs(nx, ny, dx, dy, source=source, boundary_values=boundary_values)
+            u0 = np.full(A.shape[0], float(initial_temperature))
+            
+            # March in time, keeping only the requested snapshots
+            history = []
+            if adaptive:
+                if solver != "direct":
+                    raise ValueError("Adaptive time stepping uses the direct step solver")
+                steps = self.transient_service.integrate_adaptive(
+                    A, u0, t_end, dt, alpha=alpha, forcing=f, tolerance=tolerance,
+                    steady_tolerance=steady_tolerance, snapshot_every=snapshot_every,
+                    cache_key=key, history=history
+                )
+                scheme = "adaptive crank_nicolson"
+            else:
+                # The last step is shortened when dt does not divide t_end
+                steps = self.transient_service.integrate(
+                    A, u0, dt, scheme=scheme, alpha=alpha, forcing=f, t_end=t_end,
+                    snapshot_every=snapshot_every, cache_key=key, step_solver=solver, subdomains=subdomains,
+                    coordinates=self.fd_service.interior_coordinates(x, y),
+                    solver_tolerance=solver_tolerance, max_iterations=max_iterations
+                )
+            times = []
+            snapshots = []
+            for step, t, u in steps:
+                times.append(t)
+                snapshots.append(self.fd_service.embed_interior(u, nx, ny, boundary_values))
+            
+            u_2d = snapshots[-1]
+            
+            # Create visualization of the final state
+            plt.figure(figsize=(10, 8))
+            plt.imshow(u_2d, cmap='hot', origin='lower')
+            plt.colorbar(label='Temperature')
+            plt.title(f"Transient Heat Distribution at t = {times[-1]:.4g} ({scheme})")
+            plt.xlabel("x")
+            plt.ylabel("y")
+            
+            # Save plot
+            output_dir = Path("outputs")
+            output_dir.mkdir(exist_ok=True)
+            plot_path = output_dir / "heat_distribution_transient.png"
+            plt.savefig(plot_path)
+            plt.close()
+            
+            result = {
+                "solution": u_2d.tolist(),
+                "times": times,
+                "snapshots": [snapshot.tolist() for snapshot in snapshots],
+                "plot_path": str(plot_path),
+                "operator_cache": OPERATOR_CACHE.stats()
+            }
+            if validate:
+                exact, info = self.analytical_service.transient(
+                    (x, y), times, alpha=alpha, initial_temperature=initial_temperature,
+                    source=source, boundary_values=boundary_values
+                )
+                errors = np.stack(snapshots) - exact
+                result["validation"] = {
+                    "max_error": float(np.max(np.abs(errors))),
+                    "max_error_per_snapshot": np.max(np.abs(errors), axis=(1, 2)).tolist(),
+                    "series_terms": info["terms"]
+                }
+            if adaptive:
+                accepted = [entry for entry in history if entry["accepted"]]
+                result["time_steps"] = [entry["dt"] for entry in accepted]
+                result["steps"] = len(accepted)
+                result["rejected_steps"] = len(history) - len(accepted)
+                result["steady_state_reached"] = times[-1] < t_end
+            return result
+            
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def run_parameter_sweep(self, grid_sizes: List[int] = (50,), diffusivities: List[float] = (1.0,),
+                            sources: List[float] = (1.0,),
+                            boundary_values: List[Optional[Dict[str, float]]] = (None,),
+                            engine: str = "finite_difference",
+                            max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Solve the steady heat equation for every combination of grid size, diffusivity,
+        source and boundary values in parallel worker processes, returning one summary row per run
+        """
+        try:
+            table = self.sweep_service.run(
+                grid_sizes=grid_sizes, diffusivities=diffusivities, sources=sources,
+                boundary_values=boundary_values, engine=engine, max_workers=max_workers
+            )
+            result = self.sweep_service.to_json(table)
+            result["num_runs"] = len(table)
+            return result
+            
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _analytical_solutions(self, x: np.ndarray, y: np.ndarray, sources: List,
+                              cases: List[Dict[str, float]]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """
+        Fourier-series solutions on the (x, y) grid for each batch case
+        """
+        if any(np.ndim(f) != 0 for f in sources):
+            raise ValueError("Analytical solutions need a uniform (scalar) source")
+        runs = [
+            self.analytical_service.steady((x, y), source=float(f), boundary_values=edges)
+            for f, edges in zip(sources, cases)
+        ]
+        return np.stack([u for u, _ in runs]), [info for _, info in runs]
+    
+    def _select_solver(self, solver: str, precision: str = "double") -> str:
+        """
+        Resolve "auto" to a concrete solver. The grid is a uniform rectangle (or box) with
+        constant coefficients and Dirichlet edges, which is exactly what the sine transform handles;
+        mixed precision needs an operator to refine against, so it uses the direct solver.
+        """
+        if precision not in ("double", "mixed"):
+            raise ValueError(f"Unknown precision '{precision}', expected 'double' or 'mixed'")
+        if solver == "auto":
+            return "direct_sparse" if precision == "mixed" else "fft"
+        return solver
+    
     def get_tool(self) -> Tool:
         """
         Create and return the numerical tool
@@ -81,5 +436,51 @@ class NumericalTool:
             name="numerical_solver",
             func=self.solve_finite_difference,
             description="""Use this tool to solve steady-state heat equations using
-            finite difference methods. Specify grid dimensions as input."""
-        ) 
\ No newline at end of file
+            finite difference methods. Specify grid dimensions as input. The fastest
+            solver is chosen automatically; optionally pass solver="fft", "direct_sparse",
+            "multigrid" (cycle "V" or "W"), "domain_decomposition" (parallel over subdomains),
+            "analytical" (exact Fourier series) or "sparse_iterative" with a Krylov method
+            (cg, gmres), preconditioner (jacobi, ilu, amg), tolerance and max_iterations.
+            validate=True reports the error against the analytical solution.
+            precision="mixed" halves solver memory for large grids while keeping double accuracy."""
+        )
+    
+    def get_transient_tool(self) -> Tool:
+        """
+        Create and return the transient numerical tool
+        """
+        return Tool(
+            name="transient_heat_solver",
+            func=self.solve_transient,
+            description="""Use this tool to solve time-dependent heat equations using
+            finite differences with explicit, implicit Euler or Crank-Nicolson time stepping.
+            Specify grid dimensions, end time and time step as input. adaptive=True
+            controls the step size by error estimation and stops early at steady state."""
+        )
+    
+    def get_sweep_tool(self) -> Tool:
+        """
+        Create and return the parameter sweep tool
+        """
+        return Tool(
+            name="parameter_sweep_solver",
+            func=self.run_parameter_sweep,
+            description="""Use this tool to compare many steady-state heat problems at once.
+            Provide lists of grid sizes, diffusivities, source strengths and boundary
+            temperatures; every combination is solved in parallel and summarized in a table."""
+        )
+    
+    def get_3d_tool(self) -> Tool:
+        """
+        Create and return the 3D numerical tool
+        """
+        return Tool(
+            name="numerical_solver_3d",
+            func=self.solve_finite_difference_3d,
+            description="""Use this tool to solve steady-state heat equations on a 3D box
+            using finite differences. Specify nx, ny, nz and optionally face temperatures;
+            solver="matrix_free" uses an iterative solver without storing a matrix and
+            solver="multigrid" (cycle "V" or "W") converges in a grid-independent number of cycles.
+            Returns temperature statistics, the hottest point and the z mid-plane slice;
+            save_solution=True also writes the full field to a .npy file."""
+        )